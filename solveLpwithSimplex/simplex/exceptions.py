@@ -1,2 +1,17 @@
 class SimplexInitException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class SolverBusyException(Exception):
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SolverTimeoutException(Exception):
+    pass
+
+
+class InvalidPayloadException(Exception):
+    pass
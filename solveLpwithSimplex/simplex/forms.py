@@ -3,7 +3,7 @@ from django import forms
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Fieldset, Div, HTML, Submit, Row, Column
 from .exceptions import SimplexInitException
-from .utils import solver
+from .utils import cache, executor, history, solver
 
 
 class InitForm(forms.Form):
@@ -81,7 +81,13 @@ class SolveForm(forms.Form):
                               const_field_name) in enumerate(self._get_field_names_of_constraints())],
                 ),
 
-                HTML(self.get_info_lower_bounds()),
+                Fieldset(
+                    'Bounds',
+                    HTML('<hr>'),
+                    Row(*self._get_field_names_of_lower_bounds()),
+                    Row(*self._get_field_names_of_upper_bounds()),
+                ),
+
                 HTML('<div style="margin-top:50px;"></div>'),
                 Submit('submit', 'Solve'),
                 Submit('submit', 'Find Dual Lp', css_class='btn-danger'),
@@ -89,18 +95,27 @@ class SolveForm(forms.Form):
             )
         )
 
-    def get_info_lower_bounds(self):
-        bounds = ""
+    def clean(self):
+        cleaned_data = super().clean()
 
-        if self.variables > 3:
-            lower = '1...' + str(self.variables)
-        else:
-            lower = ','.join([str(i) for i in range(1, self.variables + 1)])
+        for x, (lower, upper) in enumerate(self.get_values_of_bounds()):
+            if upper is not None and lower > upper:
+                raise forms.ValidationError('Lower bound of X{} is above its upper bound'.format(x + 1))
 
-        return f'<p>x<sub>{lower}</sub> &ge; 0</p>'
+        return cleaned_data
 
     def solve(self):
-        return solver.lp_solver(self.get_values_of_objective_function_coefficients(), self.get_values_of_constraints())
+        objective = self.get_values_of_objective_function_coefficients()
+        constraints = self.get_values_of_constraints()
+        bounds = self.get_values_of_bounds()
+
+        result = cache.solve(objective, constraints, bounds)
+        history.record(objective, constraints, result, bounds)
+
+        if result['status'] != 'Optimal':
+            return dict(result, sensitivity=None)
+
+        return dict(result, sensitivity=cache.sensitivity(objective, constraints, bounds, result))
 
 
     @staticmethod
@@ -133,6 +148,15 @@ class SolveForm(forms.Form):
             )
             self.fields[const_field_name] = forms.FloatField(label='')
 
+        for x, (lower_field_name, upper_field_name) in enumerate(zip(self._get_field_names_of_lower_bounds(),
+                                                                     self._get_field_names_of_upper_bounds())):
+            self.fields[lower_field_name] = forms.FloatField(
+                initial=0, required=False, label='X{} ≥'.format(x + 1)
+            )
+            self.fields[upper_field_name] = forms.FloatField(
+                required=False, label='X{} ≤'.format(x + 1)
+            )
+
     def get_values_of_objective_function_coefficients(self):
         """
         Gets values of objective function coefficients.
@@ -190,9 +214,18 @@ class SolveForm(forms.Form):
                           self.get_values_of_constraint_operators(),
                           self.get_values_of_constraint_right_hand_sides()))
 
-        print(constraints)
         return constraints
 
+    def get_values_of_bounds(self):
+        """
+        Gets values of variable bounds, empty lower bounds are 0
+        and empty upper bounds are unbounded.
+        :Example: [(0, None), (1, 5)]
+        """
+        return [(self.cleaned_data.get(lower_field_name) or 0, self.cleaned_data.get(upper_field_name))
+                for lower_field_name, upper_field_name in zip(self._get_field_names_of_lower_bounds(),
+                                                              self._get_field_names_of_upper_bounds())]
+
     # Implementation methods - private
 
     def _get_field_names_of_objective_function_coefficients(self):
@@ -229,6 +262,22 @@ class SolveForm(forms.Form):
         """
         return ['constr_const_{}'.format(c) for c in range(1, self.constraints + 1)]
 
+    def _get_field_names_of_lower_bounds(self):
+        """
+        Gets names for the lower bound fields
+        depending on the number of `variables`.
+        :Example: ['lower_bound_1', 'lower_bound_2']
+        """
+        return ['lower_bound_{}'.format(v) for v in range(1, self.variables + 1)]
+
+    def _get_field_names_of_upper_bounds(self):
+        """
+        Gets names for the upper bound fields
+        depending on the number of `variables`.
+        :Example: ['upper_bound_1', 'upper_bound_2']
+        """
+        return ['upper_bound_{}'.format(v) for v in range(1, self.variables + 1)]
+
     def _get_field_names_of_constraints(self):
         """
         Gets names for the constraint fields.
@@ -255,7 +304,7 @@ class TransportationInitForm(forms.Form):
 
         self.helper = FormHelper()
         self.helper.form_method = 'GET'
-        self.helper.form_action = 'simplex:solve'
+        self.helper.form_action = 'simplex:transportation_solve'
         self.helper.form_class = 'form-horizontal'
         self.helper.label_class = 'col-md-4'
         self.helper.field_class = 'col-md-8'
@@ -270,6 +319,141 @@ class TransportationInitForm(forms.Form):
         )
 
 
+class TransportationSolveForm(forms.Form):
+
+    def __init__(self, *args, **kwargs):
+        self.sources, self.destinations = self._process_sources_and_destinations(
+            kwargs.pop('variables', None), kwargs.pop('constraints', None)
+        )
+
+        super().__init__(*args, **kwargs)
+        self._set_transportation_form_fields()
+
+        self.helper = FormHelper()
+        self.helper.form_method = 'POST'
+        self.helper.form_action = 'simplex:transportation_solve'
+        self.helper.form_class = 'form-inline'
+        self.helper.field_template = 'bootstrap4/layout/inline_field.html'
+        self.helper.layout = Layout(
+
+            Column(
+
+                Fieldset(
+                    'Objective',
+                    HTML('<hr>'),
+                    Row('tendency'),
+                    HTML('<div style="margin-top:50px;"></div>'),
+                ),
+
+                Fieldset(
+                    'Costs and supplies',
+                    HTML('<hr>'),
+
+                    *[Div(HTML('<p><strong>S{}:</strong></p>'.format(i + 1)),
+                          Row(*cost_field_names, supply_field_name),
+                          HTML('<div style="margin-top:20px;"></div>'))
+                      for i, (cost_field_names, supply_field_name) in enumerate(
+                          zip(self._get_field_names_of_costs(), self._get_field_names_of_supplies()))],
+                ),
+
+                Fieldset(
+                    'Demands',
+                    HTML('<hr>'),
+                    Row(*self._get_field_names_of_demands()),
+                ),
+
+                HTML('<div style="margin-top:50px;"></div>'),
+                Submit('submit', 'Solve'),
+                HTML('<div style="margin-top:50px;"></div>'),
+            )
+        )
+
+    def solve(self):
+        return executor.submit(solver.transportation_solver,
+                               self.get_values_of_costs(),
+                               self.get_values_of_supplies(),
+                               self.get_values_of_demands(),
+                               self.cleaned_data['tendency'])
+
+    @staticmethod
+    def _process_sources_and_destinations(sources,
+                                          destinations):
+        try:
+            sources, destinations = int(sources), int(destinations)
+        except Exception:
+            raise SimplexInitException('Please define the number of supplies and demands')
+
+        if 1 <= sources <= 10 and 1 <= destinations <= 10:
+            return sources, destinations
+        else:
+            raise SimplexInitException('The number of supplies and demands should be between 1 and 10')
+
+    def _set_transportation_form_fields(self) -> None:
+        self.fields['tendency'] = forms.ChoiceField(
+            initial='min', choices=[('min', 'min cost'), ('max', 'max profit')]
+        )
+
+        for i, (cost_field_names, supply_field_name) in enumerate(zip(self._get_field_names_of_costs(),
+                                                                      self._get_field_names_of_supplies())):
+            for j, cost_field_name in enumerate(cost_field_names):
+                self.fields[cost_field_name] = forms.FloatField(label='D{}'.format(j + 1))
+            self.fields[supply_field_name] = forms.FloatField(min_value=0, label='Supply')
+
+        for j, demand_field_name in enumerate(self._get_field_names_of_demands()):
+            self.fields[demand_field_name] = forms.FloatField(min_value=0, label='D{}'.format(j + 1))
+
+    def get_values_of_costs(self):
+        """
+        Gets values of unit costs, a row per supply.
+        :Example: [[4, 6],
+                   [5, 3]]
+        """
+        return [[self.cleaned_data[cost_field_name] for cost_field_name in cost_field_names]
+                for cost_field_names in self._get_field_names_of_costs()]
+
+    def get_values_of_supplies(self):
+        """
+        Gets values of supplies.
+        :Example: [30, 20]
+        """
+        return [self.cleaned_data[supply_field_name] for supply_field_name in self._get_field_names_of_supplies()]
+
+    def get_values_of_demands(self):
+        """
+        Gets values of demands.
+        :Example: [25, 25]
+        """
+        return [self.cleaned_data[demand_field_name] for demand_field_name in self._get_field_names_of_demands()]
+
+    # Implementation methods - private
+
+    def _get_field_names_of_costs(self):
+        """
+        Gets names for the cost fields
+        depending on the number of supplies and demands.
+        :Example: [['cost_1_1', 'cost_1_2'],
+                   ['cost_2_1', 'cost_2_2']]
+        """
+        return [['cost_{}_{}'.format(i, j) for j in range(1, self.destinations + 1)]
+                for i in range(1, self.sources + 1)]
+
+    def _get_field_names_of_supplies(self):
+        """
+        Gets names for the supply fields
+        depending on the number of supplies.
+        :Example: ['supply_1', 'supply_2']
+        """
+        return ['supply_{}'.format(i) for i in range(1, self.sources + 1)]
+
+    def _get_field_names_of_demands(self):
+        """
+        Gets names for the demand fields
+        depending on the number of demands.
+        :Example: ['demand_1', 'demand_2']
+        """
+        return ['demand_{}'.format(j) for j in range(1, self.destinations + 1)]
+
+
 class AssignmentInitForm(forms.Form):
     variables = forms.ChoiceField(
         initial=3, choices=[(i, i) for i in range(2, 11)],
@@ -285,7 +469,7 @@ class AssignmentInitForm(forms.Form):
 
         self.helper = FormHelper()
         self.helper.form_method = 'GET'
-        self.helper.form_action = 'simplex:solve'
+        self.helper.form_action = 'simplex:assignment_solve'
         self.helper.form_class = 'form-horizontal'
         self.helper.label_class = 'col-md-4'
         self.helper.field_class = 'col-md-8'
@@ -298,3 +482,92 @@ class AssignmentInitForm(forms.Form):
             Submit('submit', 'Next'),
 
         )
+
+
+class AssignmentSolveForm(forms.Form):
+
+    def __init__(self, *args, **kwargs):
+        self.workers, self.jobs = self._process_workers_and_jobs(
+            kwargs.pop('variables', None), kwargs.pop('constraints', None)
+        )
+
+        super().__init__(*args, **kwargs)
+        self._set_assignment_form_fields()
+
+        self.helper = FormHelper()
+        self.helper.form_method = 'POST'
+        self.helper.form_action = 'simplex:assignment_solve'
+        self.helper.form_class = 'form-inline'
+        self.helper.field_template = 'bootstrap4/layout/inline_field.html'
+        self.helper.layout = Layout(
+
+            Column(
+
+                Fieldset(
+                    'Objective',
+                    HTML('<hr>'),
+                    Row('tendency'),
+                    HTML('<div style="margin-top:50px;"></div>'),
+                ),
+
+                Fieldset(
+                    'Costs',
+                    HTML('<hr>'),
+
+                    *[Div(HTML('<p><strong>W{}:</strong></p>'.format(i + 1)),
+                          Row(*cost_field_names),
+                          HTML('<div style="margin-top:20px;"></div>'))
+                      for i, cost_field_names in enumerate(self._get_field_names_of_costs())],
+                ),
+
+                HTML('<div style="margin-top:50px;"></div>'),
+                Submit('submit', 'Solve'),
+                HTML('<div style="margin-top:50px;"></div>'),
+            )
+        )
+
+    def solve(self):
+        return executor.submit(solver.assignment_solver, self.get_values_of_costs(), self.cleaned_data['tendency'])
+
+    @staticmethod
+    def _process_workers_and_jobs(workers,
+                                  jobs):
+        try:
+            workers, jobs = int(workers), int(jobs)
+        except Exception:
+            raise SimplexInitException('Please define the number of workers and jobs')
+
+        if 1 <= workers <= 10 and 1 <= jobs <= 10:
+            return workers, jobs
+        else:
+            raise SimplexInitException('The number of workers and jobs should be between 1 and 10')
+
+    def _set_assignment_form_fields(self) -> None:
+        self.fields['tendency'] = forms.ChoiceField(
+            initial='min', choices=[('min', 'min cost'), ('max', 'max weight')]
+        )
+
+        for cost_field_names in self._get_field_names_of_costs():
+            for j, cost_field_name in enumerate(cost_field_names):
+                self.fields[cost_field_name] = forms.FloatField(label='J{}'.format(j + 1))
+
+    def get_values_of_costs(self):
+        """
+        Gets values of costs, a row per worker.
+        :Example: [[9, 2],
+                   [6, 4]]
+        """
+        return [[self.cleaned_data[cost_field_name] for cost_field_name in cost_field_names]
+                for cost_field_names in self._get_field_names_of_costs()]
+
+    # Implementation methods - private
+
+    def _get_field_names_of_costs(self):
+        """
+        Gets names for the cost fields
+        depending on the number of workers and jobs.
+        :Example: [['cost_1_1', 'cost_1_2'],
+                   ['cost_2_1', 'cost_2_2']]
+        """
+        return [['cost_{}_{}'.format(i, j) for j in range(1, self.jobs + 1)]
+                for i in range(1, self.workers + 1)]
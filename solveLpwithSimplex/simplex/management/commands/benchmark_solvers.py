@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from simplex.utils import benchmark_suite
+
+
+class Command(BaseCommand):
+    help = ('Solves the benchmark corpus with LpProblem and pulp, records wall time, iterations, '
+            'peak memory and objective agreement, and compares against a JSON baseline.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--families', nargs='+', choices=benchmark_suite.FAMILIES,
+                            default=list(benchmark_suite.FAMILIES))
+        parser.add_argument('--repeat', type=int, default=3, help='timed runs, the best one is kept')
+        parser.add_argument('--output', help='writes the results as a JSON baseline')
+        parser.add_argument('--compare', help='JSON baseline to compare against, fails on slowdowns')
+        parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative slowdown')
+        parser.add_argument('--min-seconds', type=float, default=0.005,
+                            help='timings below this are noise and never flagged')
+
+    def handle(self, *args, **options):
+        baseline = None
+
+        if options['compare']:
+            try:
+                baseline = benchmark_suite.load_baseline(options['compare'])
+            except (OSError, ValueError) as error:
+                raise CommandError(error)
+
+        self.stdout.write('{:<20} {:<14} {:>10} {:>10} {:>8} {:<12} {:>16} {:>6}'.format(
+            'problem', 'path', 'seconds', 'peak MB', 'iters', 'status', 'objective', 'agree'))
+
+        def report(name, family, paths, agree):
+            for path, result in paths.items():
+                self.stdout.write('{:<20} {:<14} {:>10.4f} {:>10.2f} {:>8} {:<12} {:>16} {:>6}'.format(
+                    name, path, result['seconds'], result['peak_mb'],
+                    '' if result['iterations'] is None else result['iterations'],
+                    result['status'], '' if result['objective'] is None else '{:.6g}'.format(result['objective']),
+                    'yes' if agree else 'NO'))
+
+        results = benchmark_suite.run_suite(options['families'], options['repeat'], report)
+
+        disagree = [name for name, problem in results['problems'].items() if not problem['agree']]
+
+        if disagree:
+            self.stdout.write(self.style.WARNING('Solver paths disagree on {}'.format(', '.join(disagree))))
+
+        if options['output']:
+            benchmark_suite.save_baseline(results, options['output'])
+            self.stdout.write('Baseline written to {}'.format(options['output']))
+
+        if baseline is not None:
+            flags = benchmark_suite.compare(baseline, results, options['threshold'], options['min_seconds'])
+
+            for flag in flags:
+                self.stdout.write(self.style.ERROR(flag))
+
+            if flags:
+                raise CommandError('{} regressions against {}'.format(len(flags), options['compare']))
+
+            self.stdout.write(self.style.SUCCESS('No regressions against {}'.format(options['compare'])))
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from simplex.utils import jobs
+
+
+class Command(BaseCommand):
+    help = 'Runs queued solve jobs until interrupted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'SIMPLEX_JOB_WORKERS', 0) or 1)
+
+    def handle(self, *args, **options):
+        runner = jobs.make_runner(options['workers'])
+        self.stdout.write('Running solve jobs with {} workers'.format(options['workers']))
+
+        try:
+            runner.run_forever()
+        except KeyboardInterrupt:
+            runner.stop()
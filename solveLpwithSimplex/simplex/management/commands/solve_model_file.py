@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from simplex_engine.readers import read_model
+from simplex.models import SolveJob
+from simplex.utils import solver
+
+
+class Command(BaseCommand):
+    help = 'Solves the LP relaxation of a MPS or CPLEX LP file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='.mps or .lp file, may be gzipped')
+        parser.add_argument('--format', choices=['mps', 'lp'], help='defaults to the file extension')
+        parser.add_argument('--engine', choices=SolveJob.Engine.values, default=SolveJob.Engine.PULP)
+        parser.add_argument('--time-limit', type=float, default=None, help='seconds')
+        parser.add_argument('--show-variables', action='store_true', help='prints the nonzero variables')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        try:
+            model = read_model(options['path'], options['format'])
+        except (OSError, ValueError) as error:
+            raise CommandError(error)
+
+        self.stdout.write('Read {} rows, {} columns, {} nonzeros in {:.2f}s'.format(
+            model.shape[0], model.shape[1], model.nonzeros, time.perf_counter() - start))
+
+        result = solver.model_solver(model, options['engine'], options['time_limit'])
+
+        self.stdout.write('Status: {}'.format(result['status']))
+        self.stdout.write('Objective value: {}'.format(result['objective_value']))
+        self.stdout.write('Solution time: {}s'.format(result['solution_time']))
+
+        if options['show_variables']:
+            for name, value in result['variables_value'].items():
+                if value:
+                    self.stdout.write('{} = {}'.format(name, value))
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from .utils import metrics
+
+
+class MetricsMiddleware:
+    """
+    Times every request by view name and status code. Solver metrics
+    observed while answering it are held back and added to the
+    histograms of /metrics at once, one lock per request.
+
+    Sync and async capable, under ASGI the async views are not pushed
+    through the thread of sync middleware one request at a time.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        # marks the instance as a coroutine function so the handler chain stays async
+        if asyncio.iscoroutinefunction(self.get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        token = metrics.start_request()
+        start = time.perf_counter()
+
+        try:
+            response = self.get_response(request)
+            self.observe(request, response, start)
+        finally:
+            metrics.end_request(token)
+
+        return response
+
+    async def __acall__(self, request):
+        token = metrics.start_request()
+        start = time.perf_counter()
+
+        try:
+            response = await self.get_response(request)
+            self.observe(request, response, start)
+        finally:
+            metrics.end_request(token)
+
+        return response
+
+    @staticmethod
+    def observe(request, response, start):
+        match = request.resolver_match
+
+        metrics.observe('simplex_request_seconds', time.perf_counter() - start,
+                        view=match.view_name if match is not None else 'unmatched',
+                        status=str(response.status_code))
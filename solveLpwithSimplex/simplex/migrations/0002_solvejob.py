@@ -0,0 +1,36 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:36
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('simplex', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolveJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('finished', 'Finished'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], db_index=True, default='queued', max_length=10)),
+                ('engine', models.CharField(choices=[('pulp', 'Pulp'), ('simplex', 'Simplex')], default='simplex', max_length=10)),
+                ('problem', models.JSONField()),
+                ('iteration', models.IntegerField(default=0)),
+                ('objective_value', models.FloatField(blank=True, null=True)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('cancel_requested', models.BooleanField(default=False)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('started', models.DateTimeField(blank=True, null=True)),
+                ('finished', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'SolveJob',
+                'verbose_name_plural': 'SolveJobs',
+                'ordering': ['created'],
+            },
+        ),
+    ]
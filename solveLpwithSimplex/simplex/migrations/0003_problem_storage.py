@@ -0,0 +1,83 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('simplex', '0002_solvejob'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='lpproblem',
+            name='constrains',
+        ),
+        migrations.AddField(
+            model_name='lpproblem',
+            name='key',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='lpproblem',
+            name='sense',
+            field=models.CharField(choices=[('max', 'Max'), ('min', 'Min')], default='max', max_length=3),
+        ),
+        migrations.AddField(
+            model_name='lpproblem',
+            name='bounds',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='lpproblem',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AlterModelOptions(
+            name='equation',
+            options={'ordering': ['position'], 'verbose_name': 'Equation', 'verbose_name_plural': 'Equations'},
+        ),
+        migrations.AddField(
+            model_name='equation',
+            name='problem',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='equations', to='simplex.lpproblem'),
+        ),
+        migrations.AddField(
+            model_name='equation',
+            name='position',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='equation',
+            name='right_hand_side',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='equation',
+            name='coefficients',
+            field=models.BinaryField(),
+        ),
+        migrations.CreateModel(
+            name='Solution',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=20)),
+                ('objective_value', models.FloatField(blank=True, null=True)),
+                ('variables', models.BinaryField()),
+                ('solution_time', models.FloatField()),
+                ('iterations', models.IntegerField(blank=True, null=True)),
+                ('engine', models.CharField(max_length=10)),
+                ('cache_hit', models.BooleanField(default=False)),
+                ('presolve', models.JSONField(blank=True, null=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('problem', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solutions', to='simplex.lpproblem')),
+            ],
+            options={
+                'verbose_name': 'Solution',
+                'verbose_name_plural': 'Solutions',
+                'ordering': ['-created'],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('simplex', '0003_problem_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solvejob',
+            name='heartbeat',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='solvejob',
+            name='attempts',
+            field=models.IntegerField(default=0),
+        ),
+    ]
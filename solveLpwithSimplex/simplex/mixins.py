@@ -1,32 +1,83 @@
+import time
+
 from django.contrib import messages
+from django.http import HttpResponse
 
 from django.shortcuts import redirect, render
 
-from .exceptions import SimplexInitException
+from .exceptions import SimplexInitException, SolverBusyException, SolverTimeoutException
+from .models import LpProblem, SolveJob
+from .utils import metrics
 
 
 class SimplexInitMixin:
+    init_url = 'simplex:init'
 
     def dispatch(self, request, *args, **kwargs):
         try:
             return super().dispatch(request, *args, **kwargs)
         except SimplexInitException as error:
             messages.add_message(request, messages.ERROR, str(error))
-            return redirect('simplex:init')
+            return redirect(self.init_url)
 
 
 class SimplexSolveActionMixin:
     template_name_success = 'simplex/simplex_result.html'
 
+    def post(self, request, *args, **kwargs):
+        """
+        FormView.post, the time the form takes to validate is recorded.
+        """
+        form = self.get_form()
+        start = time.perf_counter()
+        valid = form.is_valid()
+        metrics.record_validation('form', start)
+
+        return self.form_valid(form) if valid else self.form_invalid(form)
+
     def form_valid(self, form):
         """
-        If the form is valid, solve linear programming problem.
+        If the form is valid, solve the problem of the form
+        and show its result. Answers 503 with Retry-After when the solver queue is full.
         """
-        result = form.solve()
+        try:
+            result = form.solve()
+        except SolverBusyException as error:
+            response = HttpResponse(str(error), status=503)
+            response['Retry-After'] = error.retry_after
+            return response
+        except SolverTimeoutException as error:
+            form.add_error(None, str(error))
+            return self.form_invalid(form)
+
+        return render(self.request, self.template_name_success, self.get_result_context(form, result))
 
-        return render(self.request, self.template_name_success, {
+    def get_result_context(self, form, result):
+        """
+        Gets the template context of a form.solve() result.
+        """
+        return {
             'status': result['status'],
             'time': result['solution_time'],
             'objective_value': result['objective_value'],
             'variables': result['variables_value_list'],
-        })
+            'sensitivity': result['sensitivity'],
+        }
+
+
+class JobApiMixin:
+
+    def get_job(self):
+        """
+        Gets the SolveJob of the url, None if there is none.
+        """
+        return SolveJob.objects.filter(pk=self.kwargs['pk']).first()
+
+
+class ProblemApiMixin:
+
+    def get_problem(self):
+        """
+        Gets the LpProblem of the url with its rows, None if there is none.
+        """
+        return LpProblem.objects.with_equations().filter(pk=self.kwargs['pk']).first()
@@ -1,10 +1,78 @@
-from django.db import models
+import math
+import uuid
+
+import numpy as np
+from django.db import models, transaction
+
+
+def pack_vector(values):
+    """
+    Stores a float vector as little endian float64 bytes, None becomes NaN.
+    """
+    return np.array(values, dtype='<f8').tobytes()
+
+
+def unpack_vector(blob):
+    """
+    Reads a pack_vector blob, NaN becomes None.
+    :Example: [2.0, None, 0.5]
+    """
+    return [None if math.isnan(value) else value for value in np.frombuffer(bytes(blob), dtype='<f8').tolist()]
+
+
+class LpProblemQuerySet(models.QuerySet):
+
+    def with_equations(self):
+        """
+        Loads objective and constraint rows with the problems, 2 queries in total.
+        """
+        return self.select_related('objective').prefetch_related('equations')
+
+
+class LpProblemManager(models.Manager.from_queryset(LpProblemQuerySet)):
+
+    @transaction.atomic
+    def create_problem(self, objective, constraints, bounds=None, key='', name=''):
+        """
+        Saves a problem in lp_solver format, constraint rows are
+        written with one bulk insert.
+        :param objective: [[3, 5], ['max']]
+        :param constraints: [([1, 0], '<=', 4), ([3, 2], '==', 18)]
+        :param bounds: [(0, None), (1, 5)]
+        """
+        variable_count = len(objective[0])
+
+        objective_equation = Equation.objects.create(variable_count=variable_count, right_hand_side=0,
+                                                     coefficients=pack_vector(objective[0]),
+                                                     is_objective=True, is_constraint=False)
+
+        problem = self.create(name=name, key=key, sense=objective[1][0], objective=objective_equation,
+                              bounds=[list(bound) for bound in bounds] if bounds is not None else None)
+
+        Equation.objects.bulk_create([
+            Equation(problem=problem, position=i, variable_count=variable_count,
+                     right_hand_side=rhs, equality_type='=' if operator == '==' else operator,
+                     coefficients=pack_vector(coeffs), is_objective=False, is_constraint=True)
+            for i, (coeffs, operator, rhs) in enumerate(constraints)
+        ])
+
+        return problem
+
 
 # Create your models here.
 class LpProblem(models.Model):
+    class Sense(models.TextChoices):
+        MAX = 'max'
+        MIN = 'min'
+
     name = models.CharField(max_length=50, blank=True)
+    key = models.CharField(max_length=64, blank=True, db_index=True)
+    sense = models.CharField(max_length=3, choices=Sense.choices, default=Sense.MAX)
     objective = models.OneToOneField("Equation", blank=True, on_delete=models.CASCADE)
-    constrains = models.ManyToManyField("Equation", blank=True, related_name='lps')
+    bounds = models.JSONField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = LpProblemManager()
 
     class Meta:
         verbose_name = "LpProblem"
@@ -13,6 +81,20 @@ class LpProblem(models.Model):
     def __str__(self):
         return self.name
 
+    def to_problem(self):
+        """
+        Gets the problem in lp_solver format, load with with_equations()
+        to avoid one query per row.
+        :Example: ([[3.0, 5.0], ['max']], [([1.0, 0.0], '<=', 4.0)], None)
+        """
+        constraints = [(equation.values, '==' if equation.equality_type == '=' else equation.equality_type,
+                        equation.right_hand_side)
+                       for equation in self.equations.all()]
+
+        bounds = [tuple(bound) for bound in self.bounds] if self.bounds is not None else None
+
+        return [self.objective.values, [self.sense]], constraints, bounds
+
 
 
 class Equation(models.Model):
@@ -21,11 +103,14 @@ class Equation(models.Model):
         LESS_THAN_EQUAL = '<='
         GREATER_THAN_EQUAL = '>='
 
+    problem = models.ForeignKey(LpProblem, null=True, blank=True, on_delete=models.CASCADE,
+                                related_name='equations')
+    position = models.IntegerField(default=0)
     variable_count = models.IntegerField()
-    right_hand_side = models.IntegerField()
+    right_hand_side = models.FloatField()
     equality_type = models.CharField(max_length=2, 
     choices=EqualityType.choices, default=EqualityType.EQUAL)
-    coefficients = models.CharField(max_length=1024)
+    coefficients = models.BinaryField()
     is_objective = models.BooleanField()
     is_constraint = models.BooleanField()
 
@@ -33,9 +118,73 @@ class Equation(models.Model):
     class Meta:
         verbose_name = "Equation"
         verbose_name_plural = "Equations"
+        ordering = ['position']
 
     def __str__(self):
         if self.is_objective: return "Objective"
         else: return "Constraint"
 
+    @property
+    def values(self):
+        return unpack_vector(self.coefficients)
+
+
+class Solution(models.Model):
+    problem = models.ForeignKey(LpProblem, on_delete=models.CASCADE, related_name='solutions')
+    status = models.CharField(max_length=20)
+    objective_value = models.FloatField(null=True, blank=True)
+    variables = models.BinaryField()
+    solution_time = models.FloatField()
+    iterations = models.IntegerField(null=True, blank=True)
+    engine = models.CharField(max_length=10)
+    cache_hit = models.BooleanField(default=False)
+    presolve = models.JSONField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Solution"
+        verbose_name_plural = "Solutions"
+        ordering = ['-created']
+
+    def __str__(self):
+        return "{} ({})".format(self.problem_id, self.status)
 
+    @property
+    def values(self):
+        return unpack_vector(self.variables)
+
+
+class SolveJob(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = 'queued'
+        RUNNING = 'running'
+        FINISHED = 'finished'
+        FAILED = 'failed'
+        CANCELLED = 'cancelled'
+
+    class Engine(models.TextChoices):
+        PULP = 'pulp'
+        SIMPLEX = 'simplex'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED, db_index=True)
+    engine = models.CharField(max_length=10, choices=Engine.choices, default=Engine.SIMPLEX)
+    problem = models.JSONField()
+    iteration = models.IntegerField(default=0)
+    objective_value = models.FloatField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    cancel_requested = models.BooleanField(default=False)
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(null=True, blank=True)
+    heartbeat = models.DateTimeField(null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "SolveJob"
+        verbose_name_plural = "SolveJobs"
+        ordering = ['created']
+
+    def __str__(self):
+        return "{} ({})".format(self.id, self.status)
@@ -1,3 +1,680 @@
-from django.test import TestCase
+import asyncio
+import itertools
+import json
+import os
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from simplex_engine.readers import read_model
+from .exceptions import InvalidPayloadException, SolverBusyException, SolverTimeoutException
+from .middleware import MetricsMiddleware
+from .models import LpProblem, SolveJob
+from .utils import cache, executor, jobs, metrics, solver
+from .utils.schema import validate_solve_payload
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'simplex_engine', 'corpus')
+
+# Wyndor Glass, max 3x + 5y, optimum 36 at (2, 6), duals (0, 1.5, 1)
+WYNDOR = {
+    'sense': 'max',
+    'objective': [3, 5],
+    'constraints': [
+        {'coefficients': [1, 0], 'operator': '<=', 'rhs': 4},
+        {'coefficients': [0, 2], 'operator': '<=', 'rhs': 12},
+        {'coefficients': [3, 2], 'operator': '<=', 'rhs': 18},
+    ],
+}
+
+# a '>=' row and a non degenerate optimum, max 3x + 2y, 11.5 at (3.5, 0.5), duals (2, 0, -1)
+MIXED = ([[3, 2], ['max']], [[[1, 1], '<=', 4], [[1, 3], '<=', 6], [[-1, 0], '>=', -3.5]])
+
+
+def problem_of(payload):
+    return validate_solve_payload(payload)
+
+
+# no solver pool and no job threads, everything runs in the test thread
+SOLVER_SETTINGS = dict(SIMPLEX_SOLVER_WORKERS=0, SIMPLEX_JOB_WORKERS=0, SIMPLEX_SOLUTION_CACHE='local',
+                       SIMPLEX_HISTORY=True, SIMPLEX_METRICS=True)
+
+
+class SimplexTestMixin:
+    """
+    Starts every test with an empty solution cache and metrics registry.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache._cache = None
+        metrics.registry.clear()
+
+    def post_json(self, url, payload):
+        return self.client.post(url, json.dumps(payload), content_type='application/json')
+
+
+@override_settings(**SOLVER_SETTINGS)
+class SolverTests(SimpleTestCase):
+
+    def test_pulp_and_engine_agree(self):
+        objective, constraints, bounds = problem_of(WYNDOR)
+
+        for presolve in (False, True):
+            with self.subTest(presolve=presolve):
+                result = solver.lp_solver_job(objective, constraints, bounds, presolve, 5)
+
+                self.assertEqual(result['status'], 'Optimal')
+                self.assertAlmostEqual(result['objective_value'], 36.0)
+                self.assertEqual(result['variables_value_list'], [2.0, 6.0])
+
+        result = solver.lp_problem_solver(objective, constraints, bounds, None, 5)
+
+        self.assertAlmostEqual(result['objective_value'], 36.0)
+        self.assertEqual(result['variables_value_list'], [2.0, 6.0])
+
+    def test_variable_order_past_ten_columns(self):
+        # PuLP sorts variables by name, x10 and x11 came back before x2
+        n = 12
+        objective = [[float(j + 1) for j in range(n)], ['max']]
+        constraints = [[[1.0 if k == j else 0.0 for k in range(n)], '<=', float(j)] for j in range(n)]
+
+        for presolve in (False, True):
+            with self.subTest(presolve=presolve):
+                result = solver.lp_solver_job(objective, constraints, None, presolve)
+
+                self.assertEqual(result['variables_value_list'], [float(j) for j in range(n)])
+                self.assertEqual(result['variables_value']['x11'], 11.0)
+
+    def test_duals(self):
+        result = solver.lp_solver_job(*problem_of(WYNDOR))
+
+        self.assertEqual(result['duals'], [0.0, 1.5, 1.0])
+
+    def test_sensitivity_report(self):
+        objective, constraints, bounds = problem_of(WYNDOR)
+        report = solver.sensitivity_report(objective, constraints, bounds)
+
+        self.assertEqual([row['dual'] for row in report['constraints']], [0.0, 1.5, 1.0])
+
+    def test_scenario_solver(self):
+        objective, constraints, bounds = problem_of(WYNDOR)
+        scenarios = [{'rhs': [4, 12 + k, 18 + k]} for k in range(4)]
+        result = solver.scenario_solver(objective, constraints, bounds, scenarios, True, 5)
+
+        self.assertAlmostEqual(result['objective_value'], 36.0)
+        self.assertEqual([scenario['objective_value'] for scenario in result['scenarios']],
+                         [36.0, 38.5, 41.0, 43.5])
+
+    def test_scenario_time_limit(self):
+        # the limit is for the whole sweep, not for every resolve
+        objective, constraints, bounds = problem_of(WYNDOR)
+        clock = itertools.count(step=0.5)
+
+        with mock.patch('time.perf_counter', lambda: float(next(clock))):
+            result = solver.scenario_solver(objective, constraints, bounds, [{'rhs': [4, 12, 18]}] * 100, False, 10)
+
+        statuses = [scenario['status'] for scenario in result['scenarios']]
+
+        self.assertEqual(result['status'], 'Optimal')
+        self.assertIn('TimeLimit', statuses)
+        self.assertLess(statuses.count('Optimal'), 10)
+
+    def test_model_solver(self):
+        model = read_model(os.path.join(CORPUS, 'trnsport.mps'))
+
+        for engine in ('pulp', 'simplex'):
+            with self.subTest(engine=engine):
+                result = solver.model_solver(model, engine, 5)
+
+                self.assertEqual(result['status'], 'Optimal')
+                self.assertAlmostEqual(result['objective_value'], 153.675, places=4)
+
+    def test_time_limit(self):
+        with override_settings(SIMPLEX_SOLVER_TIMEOUT=7):
+            self.assertEqual(executor.time_limit(), 7)
+
+
+class ValidationTests(SimpleTestCase):
+
+    def test_solve_payload(self):
+        objective, constraints, bounds = validate_solve_payload(dict(WYNDOR, bounds=[[0, 3], [1, None]]))
+
+        self.assertEqual(objective, [[3.0, 5.0], ['max']])
+        self.assertEqual(constraints[2], ([3.0, 2.0], '<=', 18.0))
+        self.assertEqual(bounds, [(0.0, 3.0), (1.0, None)])
+
+    def test_invalid_payloads(self):
+        invalid = [
+            [],
+            dict(WYNDOR, sense='maximize'),
+            dict(WYNDOR, objective=[]),
+            dict(WYNDOR, objective=[3, 'five']),
+            dict(WYNDOR, objective=[3, float('nan')]),
+            dict(WYNDOR, constraints=[]),
+            dict(WYNDOR, constraints={'coefficients': [1, 0]}),
+            dict(WYNDOR, constraints=[{'coefficients': [1], 'operator': '<=', 'rhs': 4}]),
+            dict(WYNDOR, constraints=[{'coefficients': [1, 0], 'operator': '<', 'rhs': 4}]),
+            dict(WYNDOR, bounds=[[0, 1]]),
+            dict(WYNDOR, bounds=[[2, 1], [0, None]]),
+        ]
+
+        for payload in invalid:
+            with self.subTest(payload=payload):
+                with self.assertRaises(InvalidPayloadException):
+                    validate_solve_payload(payload)
+
+
+class CacheKeyTests(SimpleTestCase):
+
+    def test_key_invariance(self):
+        objective, constraints = MIXED
+        key = cache.problem_key(objective, constraints)
+
+        for rows in itertools.permutations(constraints):
+            self.assertEqual(cache.problem_key(objective, list(rows)), key)
+
+        # a '>=' row is the negated '<=' row, 4 and 4.0 are the same number
+        negated = [constraints[0], constraints[1], [[1, 0], '<=', 3.5]]
+        floats = [[[1.0, 1.0], '<=', 4.0]] + constraints[1:]
+
+        self.assertEqual(cache.problem_key(objective, negated), key)
+        self.assertEqual(cache.problem_key(objective, floats), key)
+        self.assertEqual(cache.problem_key(objective, constraints, [(0, None), (0, None)]), key)
+
+    def test_key_changes(self):
+        objective, constraints = MIXED
+        key = cache.problem_key(objective, constraints)
+
+        self.assertNotEqual(cache.problem_key([[3, 2], ['min']], constraints), key)
+        self.assertNotEqual(cache.problem_key([[3, 3], ['max']], constraints), key)
+        self.assertNotEqual(cache.problem_key(objective, constraints[:2]), key)
+        self.assertNotEqual(cache.problem_key(objective, constraints, [(0, 3), (0, None)]), key)
+
+        # no rounding, a coefficient one ulp off is another problem
+        self.assertNotEqual(cache.problem_key([[3, 2.0000000000000004], ['max']], constraints), key)
+
+    def test_canonical_rows_round_trip(self):
+        constraints = MIXED[1]
+        data = {'duals': [1.0, 2.0, 3.0], 'rhs_ranges': [(0, 5), (1, None), (-4, -2)]}
+
+        canonical = cache.to_canonical_rows(data, constraints, ('duals', 'rhs_ranges'))
+
+        self.assertEqual(cache.from_canonical_rows(canonical, constraints, ('duals', 'rhs_ranges')), data)
+
+
+@override_settings(**SOLVER_SETTINGS)
+class SolutionCacheTests(SimplexTestMixin, SimpleTestCase):
+
+    def test_duals_follow_the_rows_of_each_request(self):
+        # a hit for rows in another order, or a row written as '>=', gets its own duals
+        objective, constraints = MIXED
+        solution_cache = cache.SolutionCache(cache.LocalCache())
+        analyses = list()
+
+        def analyse(*args):
+            analyses.append(args)
+            return solver.sensitivity_analysis(*args)
+
+        for rows in itertools.permutations(constraints):
+            rows = list(rows)
+            expected = solver.lp_solver_job(objective, rows)
+            result = solution_cache.get_or_solve(objective, rows, solver.lp_solver_job)
+            analysis = solution_cache.get_or_analyse(objective, rows, analyse)
+
+            self.assertEqual(result['duals'], expected['duals'])
+            self.assertEqual(analysis['duals'], solver.sensitivity_analysis(objective, rows)['duals'])
+
+        self.assertEqual(solution_cache.stats(), {'hits': 5, 'misses': 1})
+        self.assertEqual(len(analyses), 1)
+
+    def test_negated_row_ranges(self):
+        objective, constraints = MIXED
+        negated = [constraints[0], constraints[1], [[1, 0], '<=', 3.5]]
+        solution_cache = cache.SolutionCache(cache.LocalCache())
+
+        solution_cache.get_or_analyse(objective, constraints, solver.sensitivity_analysis)
+        analysis = solution_cache.get_or_analyse(objective, negated, solver.sensitivity_analysis)
+        expected = solver.sensitivity_analysis(objective, negated)
+
+        for got, want in zip(analysis['rhs_ranges'], expected['rhs_ranges']):
+            for got_end, want_end in zip(got, want):
+                if want_end is None:
+                    self.assertIsNone(got_end)
+                else:
+                    self.assertAlmostEqual(got_end, want_end)
+
+    def test_only_final_statuses_are_cached(self):
+        objective, constraints = MIXED
+        solution_cache = cache.SolutionCache(cache.LocalCache())
+
+        for status in ('TimeLimit', 'IterationLimit', 'Not Solved', 'Infeasible'):
+            with self.subTest(status=status):
+                solve = mock.Mock(return_value={'status': status, 'duals': None})
+
+                solution_cache.get_or_solve(objective, constraints, solve)
+                solution_cache.get_or_solve(objective, constraints, solve)
+
+                self.assertEqual(solve.call_count, 1 if status == 'Infeasible' else 2)
+
+    def test_local_cache_eviction(self):
+        local = cache.LocalCache(max_size=2, ttl=3600)
+
+        for key in 'abc':
+            local.set(key, {'key': key})
+
+        self.assertIsNone(local.get('a'))
+        self.assertEqual(local.get('c'), {'key': 'c'})
+
+        expired = cache.LocalCache(max_size=2, ttl=0.001)
+        expired.set('a', {'key': 'a'})
+        time.sleep(0.01)
+
+        self.assertIsNone(expired.get('a'))
+
+
+@override_settings(**SOLVER_SETTINGS)
+class SolveApiTests(SimplexTestMixin, TestCase):
+
+    def test_solve(self):
+        response = self.post_json('/api/solve/', WYNDOR)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'Optimal')
+        self.assertEqual(response.json()['objective_value'], 36.0)
+        self.assertEqual(response.json()['variables'], [2.0, 6.0])
+        self.assertFalse(response.json()['cache_hit'])
+
+        response = self.post_json('/api/solve/', dict(WYNDOR, constraints=WYNDOR['constraints'][::-1]))
+
+        self.assertTrue(response.json()['cache_hit'])
+        self.assertEqual(LpProblem.objects.count(), 1)
+
+    def test_variable_order_past_ten_columns(self):
+        n = 12
+        payload = {
+            'objective': [float(j + 1) for j in range(n)],
+            'constraints': [{'coefficients': [1.0 if k == j else 0.0 for k in range(n)], 'operator': '<=',
+                             'rhs': float(j)} for j in range(n)],
+        }
+
+        for presolve in (False, True):
+            with self.subTest(presolve=presolve), self.settings(SIMPLEX_PRESOLVE=presolve):
+                cache._cache = None
+                response = self.post_json('/api/solve/', payload)
+
+                self.assertEqual(response.json()['variables'], [float(j) for j in range(n)])
+
+    def test_errors(self):
+        response = self.client.post('/api/solve/', 'not json', content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Request body is not valid JSON'})
+
+        # the engine needs rows, an empty problem is a 400 and not a 500
+        for payload in (dict(WYNDOR, constraints=[]), {'objective': [1]}, dict(WYNDOR, sense='best')):
+            with self.subTest(payload=payload):
+                response = self.post_json('/api/solve/', payload)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+        self.assertEqual(self.client.get('/api/solve/').status_code, 405)
+
+    def test_solver_errors(self):
+        for error, status in ((SolverBusyException('busy', 5), 503), (SolverTimeoutException('timeout'), 504)):
+            with self.subTest(status=status), mock.patch.object(executor, 'solve', side_effect=error):
+                response = self.post_json('/api/solve/', WYNDOR)
+
+                self.assertEqual(response.status_code, status)
+
+                if status == 503:
+                    self.assertEqual(response['Retry-After'], '5')
+
+    def test_problem_history(self):
+        self.post_json('/api/solve/', WYNDOR)
+        problem = LpProblem.objects.get()
+
+        listed = self.client.get('/api/problems/').json()['problems']
+
+        self.assertEqual([(p['id'], p['variable_count'], p['constraint_count']) for p in listed],
+                         [(problem.pk, 2, 3)])
+
+        response = self.client.post('/api/problems/{}/solve/'.format(problem.pk))
+
+        self.assertEqual(response.json()['objective_value'], 36.0)
+        self.assertEqual(len(self.client.get('/api/problems/{}/'.format(problem.pk)).json()['solutions']), 2)
+        self.assertEqual(self.client.get('/api/problems/{}/'.format(problem.pk + 1)).status_code, 404)
+
+    def test_scenarios(self):
+        response = self.post_json('/api/scenarios/', dict(WYNDOR, parametric={
+            'rhs': [0, 1, 1], 'start': 0, 'stop': 3, 'steps': 4}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['objective_value'], 36.0)
+        self.assertEqual([scenario['objective_value'] for scenario in response.json()['scenarios']],
+                         [36.0, 38.5, 41.0, 43.5])
+
+        response = self.post_json('/api/scenarios/', dict(WYNDOR, scenarios=[{'rhs': [4, 12]}]))
+
+        self.assertEqual(response.status_code, 400)
+
+        response = self.post_json('/api/scenarios/', WYNDOR)
+
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(**SOLVER_SETTINGS)
+class SolveFormTests(SimplexTestMixin, TestCase):
+
+    def form_data(self, rows):
+        data = {'variables': 2, 'constraints': len(rows), 'tendency': 'max',
+                'func_coeff_1': 3, 'func_coeff_2': 2, 'lower_bound_1': '', 'lower_bound_2': '',
+                'upper_bound_1': '', 'upper_bound_2': ''}
+
+        for i, (coeffs, operator, rhs) in enumerate(rows, 1):
+            data.update({'constr_coeff_{}_1'.format(i): coeffs[0], 'constr_coeff_{}_2'.format(i): coeffs[1],
+                         'constr_operator_{}'.format(i): operator, 'constr_const_{}'.format(i): rhs})
+
+        return data
+
+    def test_sensitivity_rows(self):
+        # a cached analysis is shown with the duals of the posted row order
+        rows = MIXED[1]
+        analyse = mock.Mock(side_effect=solver.sensitivity_analysis)
+
+        with mock.patch.object(executor, 'analyse', analyse):
+            for order in (rows, rows[::-1], rows):
+                response = self.client.post('/solve/', self.form_data(order))
+                duals = [row['dual'] for row in response.context['sensitivity']['constraints']]
+                expected = [{'<=': 2.0, '>=': -1.0}[operator] if rhs != 6 else 0.0 for _, operator, rhs in order]
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([round(dual, 9) + 0.0 for dual in duals], expected)
+
+        self.assertEqual(analyse.call_count, 1)
+
+
+@override_settings(**SOLVER_SETTINGS)
+class ModelImportApiTests(SimplexTestMixin, SimpleTestCase):
+
+    def upload(self, name, content=None, **data):
+        if content is None:
+            with open(os.path.join(CORPUS, name), 'rb') as file:
+                content = file.read()
+
+        return self.client.post('/api/import/', dict(data, file=SimpleUploadedFile(name, content)))
+
+    def test_import(self):
+        for engine in ('pulp', 'simplex'):
+            with self.subTest(engine=engine):
+                response = self.upload('wyndor.mps', engine=engine)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['objective_value'], 36.0)
+                self.assertEqual((response.json()['rows'], response.json()['columns']), (3, 2))
+                self.assertEqual(response.json()['column_names'], ['DOORS', 'WINDOWS'])
+
+    def test_lp_file(self):
+        content = b'Maximize\n obj: 3 x + 5 y\nSubject To\n c1: x <= 4\n c2: 2 y <= 12\n c3: 3 x + 2 y <= 18\nEnd\n'
+        response = self.upload('wyndor.lp', content)
+
+        self.assertEqual(response.json()['objective_value'], 36.0)
+
+    def test_errors(self):
+        self.assertEqual(self.client.post('/api/import/').status_code, 400)
+        self.assertEqual(self.upload('wyndor.mps', engine='cplex').status_code, 400)
+        self.assertEqual(self.upload('broken.mps', b'ROWS\n X  BAD\nENDATA\n').status_code, 400)
+        self.assertEqual(self.upload('wyndor.mps', format='xls').status_code, 400)
+
+        with self.settings(SIMPLEX_IMPORT_MAX_SIZE=10):
+            self.assertEqual(self.upload('wyndor.mps').status_code, 413)
+
+
+@override_settings(**SOLVER_SETTINGS)
+class JobTests(SimplexTestMixin, TestCase):
+
+    def create(self, engine='simplex'):
+        response = self.post_json('/api/jobs/', dict(WYNDOR, engine=engine))
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Location'], '/api/jobs/{}/'.format(response.json()['id']))
+
+        return SolveJob.objects.get(pk=response.json()['id'])
+
+    def test_lifecycle(self):
+        for engine in ('simplex', 'pulp'):
+            with self.subTest(engine=engine):
+                job = self.create(engine)
+
+                self.assertEqual(self.client.get('/api/jobs/{}/'.format(job.pk)).json()['status'], 'queued')
+
+                claimed = jobs.claim_job()
+
+                self.assertEqual((claimed.pk, claimed.status, claimed.attempts), (job.pk, 'running', 1))
+                self.assertIsNone(jobs.claim_job())
+
+                jobs.run_job(claimed, time_limit=5)
+                described = self.client.get('/api/jobs/{}/'.format(job.pk)).json()
+
+                self.assertEqual(described['status'], 'finished')
+                self.assertEqual(described['result']['objective_value'], 36.0)
+                self.assertEqual(self.client.post('/api/jobs/{}/cancel/'.format(job.pk)).status_code, 409)
+
+    def test_cancel(self):
+        job = self.create()
+        response = self.client.post('/api/jobs/{}/cancel/'.format(job.pk))
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], 'cancelled')
+        self.assertIsNone(jobs.claim_job())
+
+        # a running job stops at its next progress report
+        job = self.create()
+        claimed = jobs.claim_job()
+        self.client.post('/api/jobs/{}/cancel/'.format(job.pk))
+
+        with mock.patch.object(solver, 'lp_problem_solver', side_effect=self.cancelled_solve):
+            jobs.run_job(claimed, progress_interval=0)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'cancelled')
+
+    @staticmethod
+    def cancelled_solve(objective, constraints, bounds, progress, time_limit):
+        stopped = not progress(1, 0.0)
+
+        return {'status': 'Cancelled' if stopped else 'Optimal', 'objective_value': None, 'iterations': 1}
+
+    def test_expired_leases(self):
+        queued, failing, cancelled = self.create('pulp'), self.create(), self.create()
+
+        for _ in range(3):
+            jobs.claim_job()
+
+        jobs.cancel_job(cancelled)
+        SolveJob.objects.filter(pk=failing.pk).update(attempts=2)
+        SolveJob.objects.update(heartbeat=timezone.now() - timedelta(seconds=120))
+
+        self.assertEqual(jobs.reclaim_jobs(lease=60, max_attempts=2), 3)
+
+        statuses = {job.pk: job.status for job in SolveJob.objects.all()}
+
+        self.assertEqual([statuses[job.pk] for job in (queued, failing, cancelled)],
+                         ['queued', 'failed', 'cancelled'])
+        self.assertEqual(jobs.reclaim_jobs(lease=60, max_attempts=2), 0)
+
+    def test_live_lease_is_kept(self):
+        self.create()
+        jobs.claim_job()
+
+        self.assertEqual(jobs.reclaim_jobs(lease=60), 0)
+        self.assertEqual(SolveJob.objects.get().status, 'running')
+
+    def test_reclaimed_claim_does_not_store(self):
+        job = self.create()
+        stale = jobs.claim_job()
+
+        SolveJob.objects.filter(pk=job.pk).update(heartbeat=timezone.now() - timedelta(seconds=120))
+        jobs.reclaim_jobs(lease=60, max_attempts=3)
+        current = jobs.claim_job()
+
+        jobs.run_job(stale, time_limit=5)
+        job.refresh_from_db()
+
+        self.assertEqual((job.status, job.attempts), ('running', 2))
+
+        jobs.run_job(current, time_limit=5)
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, 'finished')
+
+    def test_errors(self):
+        self.assertEqual(self.post_json('/api/jobs/', dict(WYNDOR, engine='cplex')).status_code, 400)
+        self.assertEqual(self.post_json('/api/jobs/', dict(WYNDOR, constraints=[])).status_code, 400)
+        self.assertEqual(self.client.get('/api/jobs/00000000-0000-0000-0000-000000000000/').status_code, 404)
+
+
+@override_settings(**SOLVER_SETTINGS)
+class TransportationAssignmentApiTests(SimplexTestMixin, SimpleTestCase):
+
+    def test_transportation(self):
+        response = self.post_json('/api/transportation/', {
+            'costs': [[4, 6, 9], [5, 3, 8]], 'supply': [30, 20], 'demand': [15, 25, 10]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['objective_value'], 240.0)
+        self.assertEqual(response.json()['allocation'], [[15.0, 5.0, 10.0], [0.0, 20.0, 0.0]])
+
+    def test_unbalanced_transportation(self):
+        response = self.post_json('/api/transportation/', {
+            'costs': [[4, 6], [5, 3]], 'supply': [30, 20], 'demand': [15, 25]})
+
+        self.assertEqual(response.json()['status'], 'Optimal')
+        self.assertEqual(response.json()['dummy'], 'demand')
+        self.assertEqual(response.json()['objective_value'], 15 * 4 + 5 * 6 + 20 * 3)
+
+    def test_assignment(self):
+        response = self.post_json('/api/assignment/', {'costs': [[9, 2, 7], [6, 4, 3], [5, 8, 1]]})
+
+        self.assertEqual(response.json()['assignment'], [1, 0, 2])
+        self.assertEqual(response.json()['objective_value'], 9.0)
+
+        response = self.post_json('/api/assignment/', {'sense': 'max', 'costs': [[9, 2, 7], [6, 4, 3], [5, 8, 1]]})
+
+        self.assertEqual(response.json()['objective_value'], 21.0)
+
+    def test_assignment_batch(self):
+        response = self.post_json('/api/assignment/', {'batch': [[[9, 2], [6, 4]], [[1, 3], [2, 8]]]})
+
+        self.assertEqual(response.json()['status'], ['Optimal', 'Optimal'])
+        self.assertEqual(response.json()['objective_value'], [8.0, 5.0])
+        self.assertEqual(response.json()['assignment'], [[1, 0], [1, 0]])
+
+    def test_errors(self):
+        invalid = [
+            ('/api/transportation/', {'costs': [[1, 2]], 'supply': [1, 2], 'demand': [1, 2]}),
+            ('/api/transportation/', {'costs': [[1]], 'supply': [-1], 'demand': [1]}),
+            ('/api/assignment/', {'costs': [[1, 2]], 'batch': [[[1, 2]]]}),
+            ('/api/assignment/', {'batch': [[[1, 2]], [[1, 2], [3, 4]]]}),
+            ('/api/assignment/', {'costs': [[1, 'x']]}),
+        ]
+
+        for url, payload in invalid:
+            with self.subTest(url=url, payload=payload):
+                self.assertEqual(self.post_json(url, payload).status_code, 400)
+
+
+async def solve_async(objective, constraints, bounds, engine):
+    return {'status': 'Optimal', 'objective_value': 36.0, 'variables_value_list': [2.0, 6.0],
+            'solution_time': 0.0}
+
+
+async def record_async(*args):
+    return None
+
+
+@override_settings(**SOLVER_SETTINGS)
+class AsyncSolveApiTests(SimplexTestMixin, SimpleTestCase):
+
+    async def test_solve_without_csrf_token(self):
+        client = AsyncClient(enforce_csrf_checks=True)
+
+        with mock.patch('simplex.utils.async_solver.solve_async', solve_async), \
+                mock.patch('simplex.utils.history.record_async', record_async):
+            response = await client.post('/api/async/solve/', json.dumps(WYNDOR), content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['objective_value'], 36.0)
+
+    def test_wsgi(self):
+        with mock.patch('simplex.utils.async_solver.solve_async', solve_async), \
+                mock.patch('simplex.utils.history.record_async', record_async):
+            response = self.post_json('/api/async/solve/', WYNDOR)
+
+        self.assertEqual(response.json()['variables'], [2.0, 6.0])
+
+
+@override_settings(**SOLVER_SETTINGS)
+class MetricsTests(SimplexTestMixin, TestCase):
+
+    def test_request_metrics(self):
+        self.post_json('/api/solve/', WYNDOR)
+        self.post_json('/api/solve/', WYNDOR)
+
+        text = self.client.get('/metrics').content.decode()
+
+        self.assertIn('simplex_request_seconds_count{status="200",view="simplex:api_solve"} 2', text)
+        self.assertIn('simplex_cache_requests_total{result="hit"} 1', text)
+        self.assertIn('simplex_solver_seconds_count{solver="lp_solver_job"} 1', text)
+
+    def test_disabled(self):
+        with self.settings(SIMPLEX_METRICS=False):
+            self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    def test_token(self):
+        with self.settings(SIMPLEX_METRICS_TOKEN='secret'):
+            self.assertEqual(self.client.get('/metrics').status_code, 403)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+
+
+@override_settings(**SOLVER_SETTINGS)
+class AsyncMiddlewareTests(SimplexTestMixin, SimpleTestCase):
+
+    def test_middleware_is_async_capable(self):
+        async def get_response(request):
+            return None
+
+        self.assertTrue(asyncio.iscoroutinefunction(MetricsMiddleware(get_response)))
+        self.assertFalse(asyncio.iscoroutinefunction(MetricsMiddleware(lambda request: None)))
+
+    async def test_async_requests_run_at_once(self):
+        # sync middleware made async views answer one request at a time
+        async def slow_solve_async(objective, constraints, bounds, engine):
+            await asyncio.sleep(0.2)
+            metrics.observe('simplex_solver_seconds', 0.2, solver='slow')
+
+            return {'status': 'Optimal', 'objective_value': 1.0, 'variables_value_list': [1.0],
+                    'solution_time': 0.2}
+
+        client = AsyncClient()
+        body = json.dumps({'objective': [1], 'constraints': [{'coefficients': [1], 'operator': '<=', 'rhs': 1}]})
+
+        with mock.patch('simplex.utils.async_solver.solve_async', slow_solve_async), \
+                mock.patch('simplex.utils.history.record_async', record_async):
+            start = time.perf_counter()
+            responses = await asyncio.gather(*[client.post('/api/async/solve/', body,
+                                                           content_type='application/json') for _ in range(5)])
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual([response.status_code for response in responses], [200] * 5)
+        self.assertLess(elapsed, 0.8)
+
+        text = metrics.registry.render()
+
+        self.assertIn('simplex_request_seconds_count{status="200",view="simplex:api_solve_async"} 5', text)
+        self.assertIn('simplex_solver_seconds_count{solver="slow"} 5', text)
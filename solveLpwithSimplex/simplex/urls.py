@@ -6,6 +6,21 @@ app_name = 'simplex'
 urlpatterns = [
     path('', InitView.as_view(), name='init'),
     path('solve/', SolveView.as_view(), name='solve'),
+    path('api/solve/', SolveApiView.as_view(), name='api_solve'),
+    path('api/async/solve/', solve_api_async, name='api_solve_async'),
+    path('api/jobs/', JobCreateApiView.as_view(), name='api_jobs'),
+    path('api/jobs/<uuid:pk>/', JobApiView.as_view(), name='api_job'),
+    path('api/jobs/<uuid:pk>/cancel/', JobCancelApiView.as_view(), name='api_job_cancel'),
+    path('api/problems/', ProblemListApiView.as_view(), name='api_problems'),
+    path('api/problems/<int:pk>/', ProblemApiView.as_view(), name='api_problem'),
+    path('api/problems/<int:pk>/solve/', ProblemSolveApiView.as_view(), name='api_problem_solve'),
+    path('api/import/', ModelImportApiView.as_view(), name='api_import'),
+    path('api/scenarios/', ScenarioApiView.as_view(), name='api_scenarios'),
     path('transportation/', TransportationInit.as_view(), name='transportation_init'),
-    path('assigment/', AssignmentInit.as_view(), name='assignment_init')
+    path('transportation/solve/', TransportationSolve.as_view(), name='transportation_solve'),
+    path('api/transportation/', TransportationApiView.as_view(), name='api_transportation'),
+    path('assigment/', AssignmentInit.as_view(), name='assignment_init'),
+    path('assignment/solve/', AssignmentSolve.as_view(), name='assignment_solve'),
+    path('api/assignment/', AssignmentApiView.as_view(), name='api_assignment'),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
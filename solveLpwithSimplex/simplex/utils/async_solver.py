@@ -0,0 +1,147 @@
+import asyncio
+import functools
+import os
+import time
+import weakref
+
+import pulp
+from django.conf import settings
+
+from ..exceptions import SolverBusyException, SolverTimeoutException
+from . import cache, executor, metrics, solver
+
+# one semaphore per event loop, asyncio primitives can not be shared between loops
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def get_semaphore():
+    """
+    Gets the semaphore limiting solves running at once on the current event loop.
+    """
+    loop = asyncio.get_running_loop()
+
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(getattr(settings, 'SIMPLEX_ASYNC_CONCURRENCY', 32))
+
+    return _semaphores[loop]
+
+
+async def solve_cbc(lp, timeout=None):
+    """
+    Solves a pulp problem like lp.solve() with the bundled CBC,
+    but awaits the CBC process instead of blocking on it. MPS writing
+    and solution reading run in a thread to keep the event loop free.
+    Kills CBC and raises SolverTimeoutException after `timeout` seconds.
+    """
+    loop = asyncio.get_running_loop()
+    command = pulp.PULP_CBC_CMD(msg=False)
+    tmp_mps, tmp_sol = command.create_tmp_files(lp.name, 'mps', 'sol')
+
+    was_none, dummy = lp.fixObjective()
+    variables, variable_names, constraint_names, _ = await loop.run_in_executor(
+        None, functools.partial(lp.writeMPS, tmp_mps, rename=1))
+
+    args = [command.path, tmp_mps]
+
+    if lp.sense == pulp.LpMaximize:
+        args.append('-max')
+
+    args += ['-timeMode', 'elapsed', '-solve', '-printingOptions', 'all', '-solution', tmp_sol]
+
+    start = time.time()
+
+    try:
+        process = await asyncio.create_subprocess_exec(*args, stdin=asyncio.subprocess.DEVNULL,
+                                                       stdout=asyncio.subprocess.DEVNULL,
+                                                       stderr=asyncio.subprocess.DEVNULL)
+        try:
+            returncode = await asyncio.wait_for(process.wait(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise SolverTimeoutException('The problem could not be solved in {} seconds.'.format(timeout))
+
+        if returncode != 0 or not os.path.exists(tmp_sol):
+            raise pulp.PulpSolverError('Pulp: Error while executing ' + command.path)
+
+        status, values, reduced_costs, shadow_prices, slacks, sol_status = await loop.run_in_executor(
+            None, command.readsol_MPS, tmp_sol, lp, variables, variable_names, constraint_names)
+    finally:
+        command.delete_tmp_files(tmp_mps, tmp_sol)
+
+    lp.assignVarsVals(values)
+    lp.assignVarsDj(reduced_costs)
+    lp.assignConsPi(shadow_prices)
+    lp.assignConsSlack(slacks, activity=True)
+    lp.assignStatus(status, sol_status)
+    lp.restoreObjective(was_none, dummy)
+    lp.solutionTime = time.time() - start
+
+    return status
+
+
+async def lp_solver_async(objective, constraints, bounds=None, presolve=False):
+    """
+    lp_solver for async views, presolve and model building run
+    in a thread and the CBC process is awaited.
+    """
+    loop = asyncio.get_running_loop()
+    timeout = getattr(settings, 'SIMPLEX_SOLVER_TIMEOUT', 30)
+
+    if presolve:
+        reduction, presolve_time = await loop.run_in_executor(None, solver.presolve_problem,
+                                                              objective, constraints, bounds)
+        result = None
+
+        if reduction.status == 'Reduced':
+            result = await lp_solver_async(*solver.reduced_problem(objective, reduction))
+
+        result = solver.presolved_result(reduction, result, presolve_time)
+    else:
+        start = time.perf_counter()
+        lp, variables = await loop.run_in_executor(None, solver.build_lp, objective, constraints, bounds)
+        build_time = time.perf_counter() - start
+        await solve_cbc(lp, timeout)
+        result = solver.lp_result(lp, variables)
+        result['timings'] = {'build': build_time, 'solve': time.perf_counter() - start - build_time}
+
+    result.pop('lp', None)
+
+    return result
+
+
+async def solve_async(objective, constraints, bounds=None, engine='pulp'):
+    """
+    Solves through the solution cache with at most SIMPLEX_ASYNC_CONCURRENCY
+    solves running at once. 'pulp' awaits CBC, 'simplex' runs LpProblem
+    in the solver pool. Raises SolverBusyException when no slot frees up
+    within SIMPLEX_ASYNC_QUEUE_TIMEOUT seconds.
+    """
+    async def solve(objective, constraints, bounds):
+        semaphore = get_semaphore()
+
+        try:
+            await asyncio.wait_for(semaphore.acquire(), getattr(settings, 'SIMPLEX_ASYNC_QUEUE_TIMEOUT', 10))
+        except asyncio.TimeoutError:
+            raise SolverBusyException('The solver is busy, please try again in a few seconds.',
+                                      getattr(settings, 'SIMPLEX_SOLVER_RETRY_AFTER', 5))
+
+        try:
+            if engine == 'simplex':
+                return await executor.submit_async(solver.lp_problem_solver, objective, constraints, bounds,
+                                                   None, executor.time_limit())
+
+            start = time.perf_counter()
+            result = await lp_solver_async(objective, constraints, bounds, getattr(settings, 'SIMPLEX_PRESOLVE', False))
+            metrics.record_solve(lp_solver_async, result, time.perf_counter() - start)
+
+            return result
+        finally:
+            semaphore.release()
+
+    solution_cache = cache.get_cache()
+
+    if solution_cache is None:
+        return await solve(objective, constraints, bounds)
+
+    return await solution_cache.get_or_solve_async(objective, constraints, solve, bounds)
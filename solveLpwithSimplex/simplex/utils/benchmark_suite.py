@@ -0,0 +1,263 @@
+import glob
+import json
+import math
+import os
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+import simplex_engine
+from simplex_engine.assignment import solve_assignment
+from simplex_engine.benchmark import (BEALE, degenerate_lp, random_covering_lp, random_lp, random_sparse_lp,
+                                      random_transportation, transportation_lp)
+from simplex_engine.readers import read_model
+from simplex_engine.transportation import solve_transportation
+
+from . import solver
+
+# relative objective gap two solver paths may differ by
+OBJECTIVE_TOL = 1e-6
+
+FAMILIES = ('dense', 'sparse', 'covering', 'degenerate', 'infeasible', 'transportation', 'assignment', 'netlib')
+
+
+def corpus_dir():
+    """
+    Gets the directory of the bundled MPS models, simplex_engine/corpus.
+    """
+    return os.path.join(os.path.dirname(simplex_engine.__file__), 'corpus')
+
+
+def generated_problem(problem, sense):
+    """
+    Converts a simplex_engine/benchmark.py problem to the lp_solver format.
+    :param problem: (obj, constraints, senses, rhs), constraints may be a scipy sparse matrix
+    :param sense: 'max' or 'min'
+    :return: (objective, constraints, bounds)
+    """
+    obj, rows, senses, rhs = problem
+    rows = rows.toarray() if hasattr(rows, 'toarray') else np.array(rows, dtype=float)
+
+    return ([[float(c) for c in obj], [sense]],
+            [(row.tolist(), operator, float(b)) for row, operator, b in zip(rows, senses, rhs)],
+            None)
+
+
+def model_problem(model):
+    """
+    Converts a LpModel of solver.readers to the lp_solver format, rows are made dense.
+    :return: (objective, constraints, bounds)
+    """
+    bounds = [(float(lower), None if math.isinf(upper) else float(upper))
+              for lower, upper in zip(model.lower, model.upper)]
+
+    return ([model.obj.tolist(), [model.sense]],
+            [(row.tolist(), operator, float(b)) for row, operator, b in zip(model.A.toarray(), model.senses, model.rhs)],
+            bounds)
+
+
+def infeasible_lp(m, n, seed=0):
+    """
+    Generates a random_lp with a >= copy of its first row above that row's rhs.
+    :return: (obj, constraints, senses, rhs)
+    """
+    obj, constraints, senses, rhs = random_lp(m, n, seed)
+
+    return obj, constraints + [constraints[0]], senses + ['>='], rhs + [rhs[0] + 1]
+
+
+def _transportation(size, seed):
+    costs, supply, demand = random_transportation(size, size, seed)
+    problem = solve_transportation(costs, supply, demand)
+
+    return {'status': problem.status, 'objective_value': problem.Z, 'iterations': problem.iterations}
+
+
+def _assignment(size, seed):
+    costs = np.random.RandomState(seed).randint(1, 100, size=(size, size)).astype(float)
+    problem = solve_assignment(costs)
+
+    return {'status': problem.status, 'objective_value': problem.Z, 'iterations': None}
+
+
+def corpus(families=FAMILIES):
+    """
+    Gets the benchmark problems. Generated problems have fixed seeds, netlib
+    are the MPS models of simplex_engine/corpus. Transportation and assignment
+    problems are also solved by their dedicated engine.
+    :param families: families to include
+    :return: [{'name': 'dense-50', 'family': 'dense', 'problem': (objective, constraints, bounds),
+               'dedicated': None or (path name, callable returning a result)}]
+    """
+    problems = list()
+
+    def add(family, name, problem, dedicated=None):
+        if family in families:
+            problems.append({'name': name, 'family': family, 'problem': problem, 'dedicated': dedicated})
+
+    for size in (50, 150):
+        add('dense', 'dense-{}'.format(size), generated_problem(random_lp(size, size, seed=size), 'max'))
+
+    add('sparse', 'sparse-300', generated_problem(random_sparse_lp(300, 300, 0.02, seed=300), 'max'))
+    add('covering', 'covering-80', generated_problem(random_covering_lp(80, 80, seed=80), 'min'))
+    add('degenerate', 'beale', generated_problem(BEALE, 'max'))
+    add('degenerate', 'degenerate-60', generated_problem(degenerate_lp(60, 60, seed=60), 'max'))
+    add('infeasible', 'infeasible-40', generated_problem(infeasible_lp(40, 40, seed=40), 'max'))
+
+    for size in (10, 20):
+        costs, supply, demand = random_transportation(size, size, seed=size)
+        add('transportation', 'transportation-{}'.format(size),
+            generated_problem(transportation_lp(costs, supply, demand), 'min'),
+            ('transportation', lambda size=size: _transportation(size, size)))
+
+        costs = np.random.RandomState(size).randint(1, 100, size=(size, size)).astype(float)
+        add('assignment', 'assignment-{}'.format(size),
+            generated_problem(transportation_lp(costs, np.ones(size), np.ones(size)), 'min'),
+            ('assignment', lambda size=size: _assignment(size, size)))
+
+    if 'netlib' in families:
+        for path in sorted(glob.glob(os.path.join(corpus_dir(), '*.mps'))):
+            add('netlib', os.path.splitext(os.path.basename(path))[0], model_problem(read_model(path)))
+
+    return problems
+
+
+def measure(fn, repeat=3):
+    """
+    Runs fn once under tracemalloc for its peak memory, then `repeat`
+    times for the best wall time. CBC runs in a subprocess, only the
+    Python side of the pulp path is traced.
+    :return: (result of the last run, seconds, peak MB)
+    """
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+
+    seconds = math.inf
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    return result, seconds, peak
+
+
+def agree(results):
+    """
+    Whether every path of a problem found the same status and objective value.
+    """
+    statuses = {result['status'] for result in results}
+    objectives = [result['objective'] for result in results if result['objective'] is not None]
+
+    if len(statuses) > 1:
+        return False
+
+    return not objectives or max(objectives) - min(objectives) <= OBJECTIVE_TOL * max(1.0, max(map(abs, objectives)))
+
+
+def run_suite(families=FAMILIES, repeat=3, report=None):
+    """
+    Solves the corpus with LpProblem ('simplex', lp_problem_solver) and
+    pulp ('pulp', lp_solver), and the dedicated engine when there is one.
+    :param report: callable(name, family, paths, agree) called after every problem
+    :return: baseline dict, see save_baseline
+    """
+    problems = dict()
+
+    for entry in corpus(families):
+        objective, constraints, bounds = entry['problem']
+        paths = [('simplex', lambda: solver.lp_problem_solver(objective, constraints, bounds)),
+                 ('pulp', lambda: solver.lp_solver(objective, constraints, bounds))]
+
+        if entry['dedicated'] is not None:
+            paths.append(entry['dedicated'])
+
+        results = dict()
+
+        for path, fn in paths:
+            result, seconds, peak = measure(fn, repeat)
+            results[path] = {
+                'seconds': round(seconds, 6),
+                'peak_mb': round(peak, 3),
+                'iterations': result.get('iterations'),
+                'status': result['status'],
+                # pulp reports an objective value for infeasible problems too
+                'objective': float(result['objective_value']) if result['status'] == 'Optimal' else None,
+            }
+
+        problems[entry['name']] = {
+            'family': entry['family'],
+            'agree': agree(list(results.values())),
+            'paths': results,
+        }
+
+        if report is not None:
+            report(entry['name'], entry['family'], results, problems[entry['name']]['agree'])
+
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'problems': problems,
+    }
+
+
+def save_baseline(results, path):
+    """
+    Writes run_suite results as a JSON baseline.
+    :param results: {'created': ..., 'problems': {'dense-50': {'family': 'dense', 'agree': True,
+                     'paths': {'simplex': {'seconds': 0.01, 'peak_mb': 1.2, 'iterations': 40,
+                     'status': 'Optimal', 'objective': 123.0}, 'pulp': {...}}}}}
+    """
+    with open(path, 'w') as baseline:
+        json.dump(results, baseline, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as baseline:
+        return json.load(baseline)
+
+
+def compare(baseline, results, threshold=0.25, min_seconds=0.005):
+    """
+    Flags what got worse since a baseline: a path more than threshold slower
+    (both times under min_seconds are noise and pass), a status or objective
+    that changed, paths that stopped agreeing and problems that are gone.
+    :return: list of messages, empty when nothing got worse
+    """
+    flags = list()
+
+    for name, before in sorted(baseline['problems'].items()):
+        now = results['problems'].get(name)
+
+        if now is None:
+            if before['family'] in {problem['family'] for problem in results['problems'].values()}:
+                flags.append('{}: missing from the run'.format(name))
+            continue
+
+        if before['agree'] and not now['agree']:
+            flags.append('{}: solver paths no longer agree'.format(name))
+
+        for path, old in sorted(before['paths'].items()):
+            new = now['paths'].get(path)
+
+            if new is None:
+                flags.append('{} {}: missing from the run'.format(name, path))
+                continue
+
+            if new['status'] != old['status']:
+                flags.append('{} {}: status {} -> {}'.format(name, path, old['status'], new['status']))
+            elif not agree([old, new]):
+                flags.append('{} {}: objective {} -> {}'.format(name, path, old['objective'], new['objective']))
+
+            if max(old['seconds'], new['seconds']) >= min_seconds and new['seconds'] > old['seconds'] * (1 + threshold):
+                flags.append('{} {}: {:.4f}s -> {:.4f}s ({:.1f}x)'.format(
+                    name, path, old['seconds'], new['seconds'], new['seconds'] / max(old['seconds'], 1e-9)))
+
+    return flags
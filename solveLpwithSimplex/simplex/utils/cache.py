@@ -0,0 +1,334 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+from . import executor, metrics, solver
+
+OPERATORS = {'<=': '<=', '>=': '>=', '=': '==', '==': '=='}
+
+# statuses that do not change when the same problem is solved again,
+# a solve stopped by a time or iteration limit may finish next time
+CACHED_STATUSES = ('Optimal', 'Infeasible', 'Unbounded')
+
+
+def _number(value):
+    """
+    Gets the exact float of a coefficient, 2 and 2.0 give the same value
+    and -0.0 becomes 0.0. Keys are hashed from json, which writes floats
+    by repr, so only the very same numbers share a key.
+    """
+    return float(value) + 0.0
+
+
+def _bound(value):
+    return None if value is None else _number(value)
+
+
+def _canonical_row(row_coeffs, operator, rhs):
+    """
+    Gets a row with '>=' negated into '<='.
+    """
+    operator = OPERATORS[operator]
+    sign = -1 if operator == '>=' else 1
+
+    return [_number(sign * c) for c in row_coeffs], '<=' if operator == '>=' else operator, _number(sign * rhs)
+
+
+def canonicalize(objective, constraints, bounds=None):
+    """
+    Gets an order independent form of the problem.
+    '>=' rows are negated into '<=' rows and rows are sorted.
+    Default x >= 0 bounds are left out so they share the key of no bounds.
+    :Example: ('max', [3.0, 5.0], [([1.0, 0.0], '<=', 4.0)])
+    """
+    sense = objective[1][0]
+    coeffs = [_number(c) for c in objective[0]]
+
+    rows = sorted(_canonical_row(*constraint) for constraint in constraints)
+
+    if bounds is None:
+        return sense, coeffs, rows
+
+    bounds = [[_bound(low), _bound(up)] for low, up in bounds]
+
+    if all(bound == [0.0, None] for bound in bounds):
+        return sense, coeffs, rows
+
+    return sense, coeffs, rows, bounds
+
+
+def problem_key(objective, constraints, bounds=None):
+    """
+    Gets a stable hash of the canonical problem.
+    """
+    canonical = json.dumps(canonicalize(objective, constraints, bounds), separators=(',', ':'))
+
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def row_order(constraints):
+    """
+    Gets where the rows of a problem are in its canonical form.
+    :return: (order, signs), order[k] is the row at canonical position k,
+             signs[i] is -1 for a '>=' row canonicalize negates
+    """
+    rows = [_canonical_row(*constraint) for constraint in constraints]
+    signs = [-1 if OPERATORS[constraint[1]] == '>=' else 1 for constraint in constraints]
+
+    return sorted(range(len(rows)), key=rows.__getitem__), signs
+
+
+def _signed(value, sign):
+    """
+    Gets a row value of the negated row, a (low, high) range becomes (-high, -low).
+    """
+    if sign > 0 or value is None:
+        return value
+
+    if isinstance(value, (list, tuple)):
+        low, high = value
+        return None if high is None else -high, None if low is None else -low
+
+    return -value
+
+
+def to_canonical_rows(data, constraints, fields):
+    """
+    Reorders the per row lists of data under fields into canonical row order,
+    so they can be cached under problem_key and read back for any row order.
+    """
+    order, signs = row_order(constraints)
+    data = dict(data)
+
+    for field in fields:
+        if data.get(field) is not None:
+            data[field] = [_signed(data[field][i], signs[i]) for i in order]
+
+    return data
+
+
+def from_canonical_rows(data, constraints, fields):
+    """
+    Puts the per row lists of to_canonical_rows back into the row order of constraints.
+    """
+    order, signs = row_order(constraints)
+    data = dict(data)
+
+    for field in fields:
+        if data.get(field) is not None:
+            values = [None] * len(order)
+
+            for k, i in enumerate(order):
+                values[i] = _signed(data[field][k], signs[i])
+
+            data[field] = values
+
+    return data
+
+
+class LocalCache:
+    """
+    In process LRU cache with size and TTL eviction.
+    """
+
+    def __init__(self, max_size=1024, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+
+            if item is None:
+                return None
+
+            expires, value = item
+
+            if expires is not None and expires < time.monotonic():
+                del self._items[key]
+                return None
+
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+
+        with self._lock:
+            self._items[key] = (expires, value)
+            self._items.move_to_end(key)
+
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+class DjangoCache:
+    """
+    Stores solutions in one of Django's CACHES.
+    """
+
+    prefix = 'simplex:solution:'
+
+    def __init__(self, alias='default', ttl=3600):
+        self.alias = alias
+        self.ttl = ttl
+
+    def get(self, key):
+        return caches[self.alias].get(self.prefix + key)
+
+    def set(self, key, value):
+        caches[self.alias].set(self.prefix + key, value, self.ttl)
+
+
+class SolutionCache:
+    """
+    Looks solutions up by problem_key and counts hits and misses.
+    Only solutions with one of CACHED_STATUSES are stored. Row ordered
+    values are cached in canonical row order and mapped back to the rows
+    of every request.
+    """
+
+    # per row lists of a solution and of a sensitivity analysis
+    solution_rows = ('duals',)
+    analysis_rows = ('duals', 'rhs_ranges')
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_solve(self, objective, constraints, solve, bounds=None):
+        key = problem_key(objective, constraints, bounds)
+        result = self.backend.get(key)
+
+        if result is not None:
+            self._count(hit=True)
+            return dict(from_canonical_rows(result, constraints, self.solution_rows), cache_hit=True)
+
+        self._count(hit=False)
+
+        result = solve(objective, constraints, bounds)
+
+        if result.get('status') in CACHED_STATUSES:
+            self.backend.set(key, to_canonical_rows(result, constraints, self.solution_rows))
+
+        return dict(result, cache_hit=False)
+
+    async def get_or_solve_async(self, objective, constraints, solve, bounds=None):
+        """
+        get_or_solve with an async solve, backend calls run in a thread.
+        """
+        key = problem_key(objective, constraints, bounds)
+        result = await sync_to_async(self.backend.get, thread_sensitive=False)(key)
+
+        if result is not None:
+            self._count(hit=True)
+            return dict(from_canonical_rows(result, constraints, self.solution_rows), cache_hit=True)
+
+        self._count(hit=False)
+
+        result = await solve(objective, constraints, bounds)
+
+        if result.get('status') in CACHED_STATUSES:
+            await sync_to_async(self.backend.set, thread_sensitive=False)(
+                key, to_canonical_rows(result, constraints, self.solution_rows))
+
+        return dict(result, cache_hit=False)
+
+    def get_or_analyse(self, objective, constraints, analyse, bounds=None):
+        """
+        Looks the sensitivity analysis of a problem up next to its solution,
+        analyse(objective, constraints, bounds) runs on a miss.
+        """
+        key = 'sensitivity:' + problem_key(objective, constraints, bounds)
+        analysis = self.backend.get(key)
+
+        if analysis is not None:
+            return from_canonical_rows(analysis, constraints, self.analysis_rows)
+
+        analysis = analyse(objective, constraints, bounds)
+
+        if analysis is not None:
+            self.backend.set(key, to_canonical_rows(analysis, constraints, self.analysis_rows))
+
+        return analysis
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def _count(self, hit):
+        metrics.record_cache(hit)
+
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+BACKENDS = {
+    'local': lambda: LocalCache(max_size=getattr(settings, 'SIMPLEX_SOLUTION_CACHE_SIZE', 1024),
+                                ttl=getattr(settings, 'SIMPLEX_SOLUTION_CACHE_TTL', 3600)),
+    'django': lambda: DjangoCache(alias=getattr(settings, 'SIMPLEX_SOLUTION_CACHE_ALIAS', 'default'),
+                                  ttl=getattr(settings, 'SIMPLEX_SOLUTION_CACHE_TTL', 3600)),
+}
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    Gets the process wide SolutionCache, None if SIMPLEX_SOLUTION_CACHE is not set.
+    """
+    global _cache
+
+    backend = getattr(settings, 'SIMPLEX_SOLUTION_CACHE', None)
+
+    if backend is None:
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = SolutionCache(BACKENDS[backend]())
+
+    return _cache
+
+
+def solve(objective, constraints, bounds=None):
+    """
+    Solves through the solution cache, on a miss through the solver pool.
+    """
+    cache = get_cache()
+
+    if cache is None:
+        return executor.solve(objective, constraints, bounds)
+
+    return cache.get_or_solve(objective, constraints, executor.solve, bounds)
+
+
+def sensitivity(objective, constraints, bounds=None, result=None):
+    """
+    Gets the sensitivity_report of an optimal result. The engine analysis runs
+    in the solver pool once per problem, later reports are built from the cache.
+    """
+    cache = get_cache()
+
+    if cache is None:
+        analysis = executor.analyse(objective, constraints, bounds)
+    else:
+        analysis = cache.get_or_analyse(objective, constraints, executor.analyse, bounds)
+
+    if analysis is None:
+        return None
+
+    return solver.analysis_report(objective, constraints, analysis, result)
@@ -0,0 +1,207 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from ..exceptions import SolverBusyException, SolverTimeoutException
+from . import metrics, solver
+
+
+def _warm_up():
+    """
+    Runs once in every worker process so the first job
+    does not pay for importing the solver.
+    """
+    import pulp  # noqa: F401
+
+
+def _noop():
+    return None
+
+
+class SolverExecutor:
+    """
+    Persistent process pool for solving with a bounded queue.
+
+    At most `workers + queue_size` jobs are accepted at once, further
+    submissions fail fast with SolverBusyException instead of piling up
+    behind the busy workers.
+    """
+
+    def __init__(self, workers, queue_size, timeout, retry_after):
+        self.workers = workers
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_up)
+
+        # start every worker now, not on the first requests
+        for _ in range(workers):
+            self._pool.submit(_noop)
+
+    def run(self, fn, *args):
+        """
+        Runs fn(*args) in a worker and waits at most `timeout` seconds.
+        A job that times out keeps its slot until the worker finishes it.
+        solve, analyse and sweep give their solver function time_limit()
+        for the whole job, a sweep's base solve and scenarios together, so
+        the slot is not held for long past `timeout`.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise SolverBusyException('The solver is busy, please try again in a few seconds.',
+                                      self.retry_after)
+
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda f: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise SolverTimeoutException('The problem could not be solved in {} seconds.'.format(self.timeout))
+
+    async def run_async(self, fn, *args):
+        """
+        run for async views, awaits the worker instead of blocking the event loop.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise SolverBusyException('The solver is busy, please try again in a few seconds.',
+                                      self.retry_after)
+
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda f: self._slots.release())
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise SolverTimeoutException('The problem could not be solved in {} seconds.'.format(self.timeout))
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Gets the process wide SolverExecutor, None if SIMPLEX_SOLVER_WORKERS is 0.
+    """
+    global _executor
+
+    workers = getattr(settings, 'SIMPLEX_SOLVER_WORKERS', 0)
+
+    if not workers:
+        return None
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = SolverExecutor(
+                workers=workers,
+                queue_size=getattr(settings, 'SIMPLEX_SOLVER_QUEUE_SIZE', workers),
+                timeout=getattr(settings, 'SIMPLEX_SOLVER_TIMEOUT', 30),
+                retry_after=getattr(settings, 'SIMPLEX_SOLVER_RETRY_AFTER', 5),
+            )
+
+    return _executor
+
+
+def _reset_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+        _executor = None
+
+
+def submit(fn, *args):
+    """
+    Runs fn(*args) in the solver pool, or in the calling thread
+    when the pool is disabled. The call is recorded in metrics.
+    """
+    executor = get_executor()
+    start = time.perf_counter()
+
+    if executor is None:
+        result = fn(*args)
+    else:
+        try:
+            result = executor.run(fn, *args)
+        except BrokenProcessPool:
+            # a worker died, start a fresh pool for the next request
+            _reset_executor()
+            raise SolverTimeoutException('The solver stopped unexpectedly, please try again.')
+
+    metrics.record_solve(fn, result, time.perf_counter() - start)
+
+    return result
+
+
+async def submit_async(fn, *args):
+    """
+    Awaits fn(*args) in the solver pool, or in the default
+    thread pool of the event loop when the pool is disabled.
+    """
+    executor = get_executor()
+    start = time.perf_counter()
+
+    if executor is None:
+        result = await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+    else:
+        try:
+            result = await executor.run_async(fn, *args)
+        except BrokenProcessPool:
+            _reset_executor()
+            raise SolverTimeoutException('The solver stopped unexpectedly, please try again.')
+
+    metrics.record_solve(fn, result, time.perf_counter() - start)
+
+    return result
+
+
+def time_limit():
+    """
+    Seconds a solve in the pool may run, SIMPLEX_SOLVER_TIMEOUT. A job that
+    timed out can not be cancelled once it runs, so CBC and the engine
+    stop at the same limit instead of keeping the worker busy.
+    """
+    return getattr(settings, 'SIMPLEX_SOLVER_TIMEOUT', 30)
+
+
+def solve(objective, constraints, bounds=None):
+    """
+    Solves with lp_solver through the solver pool.
+    """
+    return submit(solver.lp_solver_job, objective, constraints, bounds,
+                  getattr(settings, 'SIMPLEX_PRESOLVE', False), time_limit())
+
+
+def analyse(objective, constraints, bounds=None):
+    """
+    Runs sensitivity_analysis through the solver pool.
+    """
+    return submit(solver.sensitivity_analysis, objective, constraints, bounds, time_limit())
+
+
+def sweep(objective, constraints, bounds=None, scenarios=(), chain=False):
+    """
+    Solves a scenario sweep with scenario_solver in one pool job. The
+    scenarios run one after another in that worker, and the base solve
+    and all scenarios together stop at time_limit().
+    """
+    return submit(solver.scenario_solver, objective, constraints, bounds, scenarios, chain, time_limit())
@@ -0,0 +1,92 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from ..models import LpProblem, Solution, pack_vector
+from .cache import problem_key
+
+
+def get_or_create_problem(objective, constraints, bounds=None):
+    """
+    Gets the stored problem with the same problem_key or saves a new one.
+    """
+    key = problem_key(objective, constraints, bounds)
+    problem = LpProblem.objects.filter(key=key).first()
+
+    if problem is None:
+        problem = LpProblem.objects.create_problem(objective, constraints, bounds, key=key)
+
+    return problem
+
+
+def record(objective, constraints, result, bounds=None, engine='pulp'):
+    """
+    Saves a solve result and its metrics, the problem is only saved once.
+    Does nothing if SIMPLEX_HISTORY is off.
+    :return: Solution or None
+    """
+    if not getattr(settings, 'SIMPLEX_HISTORY', False):
+        return None
+
+    problem = get_or_create_problem(objective, constraints, bounds)
+
+    return save_solution(problem, result, engine)
+
+
+def record_solution(problem, result, engine='pulp'):
+    """
+    Saves a solve result of a stored problem, does nothing if SIMPLEX_HISTORY is off.
+    :return: Solution or None
+    """
+    if not getattr(settings, 'SIMPLEX_HISTORY', False):
+        return None
+
+    return save_solution(problem, result, engine)
+
+
+def save_solution(problem, result, engine='pulp'):
+    return Solution.objects.create(problem=problem,
+                                   status=result['status'],
+                                   objective_value=result['objective_value'],
+                                   variables=pack_vector(result['variables_value_list']),
+                                   solution_time=result['solution_time'],
+                                   iterations=result.get('iterations'),
+                                   engine=engine,
+                                   cache_hit=result.get('cache_hit', False),
+                                   presolve=result.get('presolve'))
+
+
+record_async = sync_to_async(record)
+
+
+def describe_problem(problem, solutions=20):
+    """
+    Gets the JSON form of a stored problem with its latest solutions,
+    load the problem with with_equations().
+    :Example: {'id': 1, 'sense': 'max', 'objective': [3.0, 5.0], 'constraints': [...], 'solutions': [...]}
+    """
+    objective, constraints, bounds = problem.to_problem()
+
+    return {
+        'id': problem.pk,
+        'name': problem.name,
+        'sense': problem.sense,
+        'created': problem.created.isoformat(),
+        'objective': objective[0],
+        'constraints': [{'coefficients': coeffs, 'operator': operator, 'rhs': rhs}
+                        for coeffs, operator, rhs in constraints],
+        'bounds': bounds,
+        'solutions': [describe_solution(solution) for solution in problem.solutions.all()[:solutions]],
+    }
+
+
+def describe_solution(solution):
+    return {
+        'status': solution.status,
+        'objective_value': solution.objective_value,
+        'variables': solution.values,
+        'solution_time': solution.solution_time,
+        'iterations': solution.iterations,
+        'engine': solution.engine,
+        'cache_hit': solution.cache_hit,
+        'created': solution.created.isoformat(),
+    }
@@ -0,0 +1,288 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import SolveJob
+from . import history, solver
+
+logger = logging.getLogger(__name__)
+
+
+def claim_job():
+    """
+    Moves the oldest queued job to running and returns it, None if the queue is empty.
+    The status filter in the update makes the claim atomic, a job is
+    never run twice by threads or processes sharing the database.
+    Every claim counts an attempt, the lease of the job belongs to it.
+    """
+    for pk in SolveJob.objects.filter(status=SolveJob.Status.QUEUED).values_list('pk', flat=True)[:10]:
+        now = timezone.now()
+        claimed = SolveJob.objects.filter(pk=pk, status=SolveJob.Status.QUEUED).update(
+            status=SolveJob.Status.RUNNING, started=now, heartbeat=now, attempts=F('attempts') + 1)
+
+        if claimed:
+            return SolveJob.objects.get(pk=pk)
+
+    return None
+
+
+def reclaim_jobs(lease, max_attempts=2):
+    """
+    Ends the lease of running jobs without a heartbeat for `lease` seconds,
+    their worker stopped while solving them. A cancelled job is cancelled,
+    a job claimed `max_attempts` times fails, any other is queued again.
+    :return: number of reclaimed jobs
+    """
+    now = timezone.now()
+    expired = SolveJob.objects.filter(status=SolveJob.Status.RUNNING, heartbeat__lt=now - timedelta(seconds=lease))
+
+    reclaimed = expired.filter(cancel_requested=True).update(status=SolveJob.Status.CANCELLED, finished=now)
+    reclaimed += expired.filter(attempts__gte=max_attempts).update(
+        status=SolveJob.Status.FAILED, error='The job worker stopped while solving it.', finished=now)
+    reclaimed += expired.update(status=SolveJob.Status.QUEUED, started=None, heartbeat=None)
+
+    return reclaimed
+
+
+class JobHeartbeat:
+    """
+    Renews the lease of a running job every `interval` seconds from a
+    thread of its own, so a job keeps its lease while CBC runs without
+    progress reports. Only the claim of `attempt` is renewed, a reclaimed
+    job belongs to its new worker.
+    """
+
+    def __init__(self, pk, attempt, interval):
+        self.pk = pk
+        self.attempt = attempt
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name='simplex-heartbeat', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _beat(self):
+        try:
+            while not self._stop.wait(self.interval):
+                SolveJob.objects.filter(pk=self.pk, status=SolveJob.Status.RUNNING, attempts=self.attempt).update(
+                    heartbeat=timezone.now())
+        finally:
+            connection.close()
+
+
+class JobProgress:
+    """
+    LpProblem progress callback, writes iteration and objective of a
+    running job at most every `interval` seconds and stops the solve
+    once the job is cancelled.
+    """
+
+    def __init__(self, pk, interval):
+        self.pk = pk
+        self.interval = interval
+        self._last = time.monotonic()
+
+    def __call__(self, iterations, objective):
+        now = time.monotonic()
+
+        if now - self._last < self.interval:
+            return True
+
+        self._last = now
+        jobs = SolveJob.objects.filter(pk=self.pk)
+        jobs.update(iteration=iterations, objective_value=objective)
+
+        return not jobs.filter(cancel_requested=True).exists()
+
+
+def run_job(job, progress_interval=0.5, time_limit=None, lease=60):
+    """
+    Solves a claimed job and stores its result, renewing its lease
+    every quarter of `lease` seconds. Both engines stop at time_limit,
+    'simplex' jobs report progress and can be cancelled while running,
+    'pulp' jobs can only be cancelled while queued. A job reclaimed
+    from this worker in the meantime keeps the result of its new claim.
+    """
+    problem = job.problem
+
+    try:
+        with JobHeartbeat(job.pk, job.attempts, lease / 4):
+            if job.engine == SolveJob.Engine.PULP:
+                result = solver.lp_solver_job(problem['objective'], problem['constraints'], problem['bounds'],
+                                              getattr(settings, 'SIMPLEX_PRESOLVE', False), time_limit)
+            else:
+                result = solver.lp_problem_solver(problem['objective'], problem['constraints'], problem['bounds'],
+                                                  JobProgress(job.pk, progress_interval), time_limit)
+    except Exception as error:
+        SolveJob.objects.filter(pk=job.pk, attempts=job.attempts).update(
+            status=SolveJob.Status.FAILED, error=str(error), finished=timezone.now())
+        return
+
+    status = SolveJob.Status.CANCELLED if result['status'] == 'Cancelled' else SolveJob.Status.FINISHED
+
+    stored = SolveJob.objects.filter(pk=job.pk, attempts=job.attempts).update(
+        status=status, result=result, iteration=result.get('iterations', job.iteration),
+        objective_value=result['objective_value'], finished=timezone.now())
+
+    if stored and status == SolveJob.Status.FINISHED:
+        history.record(problem['objective'], problem['constraints'], result, problem['bounds'], job.engine)
+
+
+class JobRunner:
+    """
+    Worker threads taking jobs from the SolveJob table.
+
+    Idle workers poll the table every `poll_interval` seconds, wake()
+    makes them look at once after a job is created in this process.
+    Before each claim they reclaim the jobs of workers that stopped.
+    """
+
+    def __init__(self, workers, poll_interval=2, progress_interval=0.5, time_limit=None, lease=60, max_attempts=2):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.progress_interval = progress_interval
+        self.time_limit = time_limit
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = list()
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name='simplex-job-{}'.format(i), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def run_forever(self):
+        self.start()
+
+        for thread in self._threads:
+            thread.join()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _work(self):
+        try:
+            while not self._stop.is_set():
+                # the worker outlives a database that is down or not migrated yet
+                try:
+                    reclaim_jobs(self.lease, self.max_attempts)
+                    job = claim_job()
+                except DatabaseError:
+                    logger.exception('Solve job worker could not read the queue')
+                    connection.close()
+                    self._stop.wait(self.poll_interval)
+                    continue
+
+                if job is None:
+                    self._wake.wait(self.poll_interval)
+                    self._wake.clear()
+                    continue
+
+                run_job(job, self.progress_interval, self.time_limit, self.lease)
+        finally:
+            connection.close()
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner():
+    """
+    Gets the process wide JobRunner, None if SIMPLEX_JOB_WORKERS is 0.
+    Jobs then wait for `manage.py run_solve_jobs`. wsgi.py and asgi.py
+    start it with the server, management commands and tests do not.
+    """
+    global _runner
+
+    workers = getattr(settings, 'SIMPLEX_JOB_WORKERS', 0)
+
+    if not workers:
+        return None
+
+    with _runner_lock:
+        if _runner is None:
+            _runner = make_runner(workers)
+            _runner.start()
+
+    return _runner
+
+
+def make_runner(workers):
+    return JobRunner(workers,
+                     poll_interval=getattr(settings, 'SIMPLEX_JOB_POLL_INTERVAL', 2),
+                     progress_interval=getattr(settings, 'SIMPLEX_JOB_PROGRESS_INTERVAL', 0.5),
+                     time_limit=getattr(settings, 'SIMPLEX_JOB_TIME_LIMIT', None),
+                     lease=getattr(settings, 'SIMPLEX_JOB_LEASE', 60),
+                     max_attempts=getattr(settings, 'SIMPLEX_JOB_MAX_ATTEMPTS', 2))
+
+
+def create_job(objective, constraints, bounds=None, engine=SolveJob.Engine.SIMPLEX):
+    """
+    Queues a solve and wakes the workers of this process.
+    """
+    job = SolveJob.objects.create(engine=engine, problem={
+        'objective': objective,
+        'constraints': constraints,
+        'bounds': bounds,
+    })
+
+    runner = get_runner()
+
+    if runner is not None:
+        runner.wake()
+
+    return job
+
+
+def cancel_job(job):
+    """
+    Cancels a queued job at once, a running job stops at its next progress report.
+    :return: False if the job has already ended
+    """
+    jobs = SolveJob.objects.filter(pk=job.pk)
+
+    if jobs.filter(status=SolveJob.Status.QUEUED).update(status=SolveJob.Status.CANCELLED, cancel_requested=True,
+                                                         finished=timezone.now()):
+        return True
+
+    return bool(jobs.filter(status=SolveJob.Status.RUNNING).update(cancel_requested=True))
+
+
+def describe(job):
+    """
+    Gets the JSON form of a job.
+    :Example: {'id': '...', 'status': 'running', 'iteration': 120, 'objective_value': 35.5, ...}
+    """
+    return {
+        'id': str(job.id),
+        'status': job.status,
+        'engine': job.engine,
+        'iteration': job.iteration,
+        'objective_value': job.objective_value,
+        'cancel_requested': job.cancel_requested,
+        'result': job.result,
+        'error': job.error,
+        'created': job.created.isoformat(),
+        'started': job.started.isoformat() if job.started else None,
+        'finished': job.finished.isoformat() if job.finished else None,
+    }
@@ -0,0 +1,204 @@
+import bisect
+import contextvars
+import math
+import threading
+import time
+
+# upper bounds of the seconds histograms
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# upper bounds of the iteration, pivot and refactorization histograms
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000)
+
+# name: (type, help, histogram buckets)
+METRICS = {
+    'simplex_request_seconds': (
+        'histogram', 'Time to answer a request, by view and status code.', SECONDS_BUCKETS),
+    'simplex_validation_seconds': (
+        'histogram', 'Time to parse and validate a form, a JSON payload or a model file.', SECONDS_BUCKETS),
+    'simplex_solver_seconds': (
+        'histogram', 'Time of a solver call in the web process, waiting for the solver pool included.',
+        SECONDS_BUCKETS),
+    'simplex_phase_seconds': (
+        'histogram', 'Time of a solve phase: build, presolve, phase_one, phase_two, dual or solve.',
+        SECONDS_BUCKETS),
+    'simplex_iterations': (
+        'histogram', 'Simplex iterations of a solve, bound flips included.', COUNT_BUCKETS),
+    'simplex_pivots': (
+        'histogram', 'Basis changes of a solve.', COUNT_BUCKETS),
+    'simplex_refactorizations': (
+        'histogram', 'Basis refactorizations of a solve.', COUNT_BUCKETS),
+    'simplex_cache_requests_total': (
+        'counter', 'Solution cache lookups, by result.', None),
+}
+
+# observations of the running request, None outside MetricsMiddleware
+_pending = contextvars.ContextVar('simplex_metrics_pending', default=None)
+
+
+class Histogram:
+    """
+    Counts of observations per bucket, not cumulative, the last one is +Inf.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Registry:
+    """
+    Histograms and counters of one process, a series per metric and label values.
+    Every web process has its own, Prometheus sums them over the scraped targets.
+    """
+
+    def __init__(self, metrics=METRICS):
+        self.metrics = metrics
+        self._series = {name: dict() for name in metrics}
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, labels):
+        """
+        Adds value to a counter or an observation to a histogram.
+        :param labels: {'phase': 'build'}
+        """
+        self.observe_many([(name, value, labels)])
+
+    def observe_many(self, observations):
+        """
+        observe for a list of (name, value, labels), under one lock.
+        """
+        with self._lock:
+            for name, value, labels in observations:
+                kind, _, buckets = self.metrics[name]
+                series = self._series[name]
+                key = tuple(sorted(labels.items()))
+
+                if kind == 'counter':
+                    series[key] = series.get(key, 0) + value
+                    continue
+
+                if key not in series:
+                    series[key] = Histogram(buckets)
+
+                series[key].observe(value)
+
+    def render(self):
+        """
+        Gets every series in the Prometheus text format.
+        """
+        lines = list()
+
+        with self._lock:
+            for name, (kind, help_text, buckets) in self.metrics.items():
+                lines.append('# HELP {} {}'.format(name, help_text))
+                lines.append('# TYPE {} {}'.format(name, kind))
+
+                for key, series in sorted(self._series[name].items()):
+                    if kind == 'counter':
+                        lines.append('{}{} {}'.format(name, _labels(key), _number(series)))
+                        continue
+
+                    total = 0
+
+                    for bound, count in zip(buckets + (math.inf,), series.counts):
+                        total += count
+                        lines.append('{}_bucket{} {}'.format(name, _labels(key + (('le', _number(bound)),)), total))
+
+                    lines.append('{}_sum{} {}'.format(name, _labels(key), _number(series.sum)))
+                    lines.append('{}_count{} {}'.format(name, _labels(key), total))
+
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            self._series = {name: dict() for name in self.metrics}
+
+
+def _number(value):
+    if value == math.inf:
+        return '+Inf'
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(key):
+    """
+    :Example: (('phase', 'build'),) -> '{phase="build"}'
+    """
+    if not key:
+        return ''
+
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in key)
+
+    return '{' + ','.join('{}="{}"'.format(name, value) for (name, _), value in zip(key, escaped)) + '}'
+
+
+registry = Registry()
+
+
+def observe(name, value, **labels):
+    """
+    Records value of a metric. Inside a request it is held back until
+    MetricsMiddleware adds the request's observations at once.
+    """
+    pending = _pending.get()
+
+    if pending is None:
+        registry.observe(name, value, labels)
+    else:
+        pending.append((name, value, labels))
+
+
+def start_request():
+    """
+    Starts holding back the observations of the current request.
+    :return: token of end_request
+    """
+    return _pending.set(list())
+
+
+def end_request(token):
+    """
+    Adds the held back observations to the registry.
+    """
+    pending = _pending.get()
+    _pending.reset(token)
+    registry.observe_many(pending)
+
+
+def record_validation(step, start):
+    """
+    Records the time since start a 'form', 'payload' or 'model' took to parse and validate.
+    """
+    observe('simplex_validation_seconds', time.perf_counter() - start, step=step)
+
+
+def record_solve(fn, result, seconds):
+    """
+    Records a solver call: its time and what its result reports,
+    'timings' per phase, 'iterations', 'pivots' and 'refactorizations'.
+    :param fn: solver function, its name is the 'solver' label
+    :param result: result dict of fn, anything else only records the time
+    """
+    solver = getattr(fn, '__name__', str(fn))
+    observe('simplex_solver_seconds', seconds, solver=solver)
+
+    if not isinstance(result, dict):
+        return
+
+    for phase, phase_seconds in (result.get('timings') or dict()).items():
+        observe('simplex_phase_seconds', phase_seconds, solver=solver, phase=phase)
+
+    for key in ('iterations', 'pivots', 'refactorizations'):
+        if result.get(key) is not None:
+            observe('simplex_' + key, result[key], solver=solver)
+
+
+def record_cache(hit):
+    observe('simplex_cache_requests_total', 1, result='hit' if hit else 'miss')
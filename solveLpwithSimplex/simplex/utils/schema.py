@@ -0,0 +1,292 @@
+import math
+
+import numpy as np
+
+from django.conf import settings
+from simplex_engine.solver import parametric
+
+from ..exceptions import InvalidPayloadException
+from ..models import SolveJob
+
+SENSES = ('max', 'min')
+
+OPERATORS = ('<=', '>=', '==', '=')
+
+
+def _number(value, name, allow_none=False):
+    if value is None and allow_none:
+        return None
+
+    # bool is an int subclass, true/false are not coefficients
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise InvalidPayloadException('{} should be a finite number'.format(name))
+
+    return float(value)
+
+
+def _list(value, name, length=None):
+    if not isinstance(value, list):
+        raise InvalidPayloadException('{} should be a list'.format(name))
+
+    if length is not None and len(value) != length:
+        raise InvalidPayloadException('{} should have {} items'.format(name, length))
+
+    return value
+
+
+def validate_solve_payload(payload):
+    """
+    Checks a JSON solve request and converts it to the lp_solver format.
+    Lower bounds default to 0, a null upper bound is unbounded.
+    :param payload: {'sense': 'max', 'objective': [3, 5],
+                     'constraints': [{'coefficients': [1, 0], 'operator': '<=', 'rhs': 4}],
+                     'bounds': [[0, null], [1, 5]]}
+    :return: ([[3.0, 5.0], ['max']], [([1.0, 0.0], '<=', 4.0)], [(0.0, None), (1.0, 5.0)])
+    """
+    if not isinstance(payload, dict):
+        raise InvalidPayloadException('Request body should be a JSON object')
+
+    sense = payload.get('sense', 'max')
+
+    if sense not in SENSES:
+        raise InvalidPayloadException("sense should be 'max' or 'min'")
+
+    objective = _list(payload.get('objective'), 'objective')
+
+    if not objective:
+        raise InvalidPayloadException('objective should have at least one coefficient')
+
+    n = len(objective)
+    objective = [_number(c, 'objective[{}]'.format(j)) for j, c in enumerate(objective)]
+
+    rows = _list(payload.get('constraints'), 'constraints')
+
+    # the engine needs at least one row to build a tableau
+    if not rows:
+        raise InvalidPayloadException('constraints should have at least one row')
+
+    constraints = list()
+
+    for i, row in enumerate(rows):
+        name = 'constraints[{}]'.format(i)
+
+        if not isinstance(row, dict):
+            raise InvalidPayloadException('{} should be an object'.format(name))
+
+        coeffs = _list(row.get('coefficients'), name + '.coefficients', n)
+        operator = row.get('operator')
+
+        if operator not in OPERATORS:
+            raise InvalidPayloadException('{}.operator should be one of {}'.format(name, ', '.join(OPERATORS)))
+
+        constraints.append(([_number(c, '{}.coefficients[{}]'.format(name, j)) for j, c in enumerate(coeffs)],
+                            '==' if operator == '=' else operator,
+                            _number(row.get('rhs'), name + '.rhs')))
+
+    bounds = None
+
+    if payload.get('bounds') is not None:
+        bounds = list()
+
+        for j, bound in enumerate(_list(payload['bounds'], 'bounds', n)):
+            name = 'bounds[{}]'.format(j)
+            lower, upper = _list(bound, name, 2)
+
+            lower = 0.0 if lower is None else _number(lower, name + '[0]')
+            upper = _number(upper, name + '[1]', allow_none=True)
+
+            if upper is not None and lower > upper:
+                raise InvalidPayloadException('Lower bound of X{} is above its upper bound'.format(j + 1))
+
+            bounds.append((lower, upper))
+
+    return [objective, [sense]], constraints, bounds
+
+
+def validate_job_payload(payload, default_engine=SolveJob.Engine.SIMPLEX):
+    """
+    Checks a JSON job request, a solve request with an optional engine.
+    :param payload: {'engine': 'simplex', 'sense': 'max', 'objective': [3, 5], ...}
+    :return: (objective, constraints, bounds, 'simplex')
+    """
+    objective, constraints, bounds = validate_solve_payload(payload)
+    engine = payload.get('engine', default_engine)
+
+    if engine not in SolveJob.Engine.values:
+        raise InvalidPayloadException('engine should be one of {}'.format(', '.join(SolveJob.Engine.values)))
+
+    return objective, constraints, bounds, engine
+
+
+def _vector(value, name, length):
+    return [_number(v, '{}[{}]'.format(name, i)) for i, v in enumerate(_list(value, name, length))]
+
+
+def validate_scenario_payload(payload):
+    """
+    Checks a JSON scenario request, a solve request of the base problem with
+    "scenarios", a list of rhs and/or objective replacements, or "parametric",
+    rhs and/or objective directions moved from start to stop in steps.
+    :param payload: {'sense': 'max', 'objective': [3, 5], 'constraints': [...],
+                     'scenarios': [{'rhs': [4, 20]}, {'objective': [3, 6]}]}
+                    or {..., 'parametric': {'rhs': [0, 1], 'start': 0, 'stop': 10, 'steps': 11}}
+    :return: (objective, constraints, bounds, [{'rhs': [4.0, 20.0]}, ...], chain),
+             chain is True for parametric sweeps
+    """
+    objective, constraints, bounds = validate_solve_payload(payload)
+    n, m = len(objective[0]), len(constraints)
+    limit = getattr(settings, 'SIMPLEX_SCENARIO_MAX', 10000)
+
+    if ('scenarios' in payload) == ('parametric' in payload):
+        raise InvalidPayloadException('Either scenarios or parametric should be given')
+
+    if 'scenarios' in payload:
+        if not 1 <= len(_list(payload['scenarios'], 'scenarios')) <= limit:
+            raise InvalidPayloadException('scenarios should have 1 to {} items'.format(limit))
+
+        scenarios = list()
+
+        for k, scenario in enumerate(payload['scenarios']):
+            name = 'scenarios[{}]'.format(k)
+
+            if not isinstance(scenario, dict):
+                raise InvalidPayloadException('{} should be an object'.format(name))
+
+            changes = dict()
+
+            if scenario.get('rhs') is not None:
+                changes['rhs'] = _vector(scenario['rhs'], name + '.rhs', m)
+
+            if scenario.get('objective') is not None:
+                changes['objective'] = _vector(scenario['objective'], name + '.objective', n)
+
+            scenarios.append(changes)
+
+        chain = False
+    else:
+        sweep = payload['parametric']
+
+        if not isinstance(sweep, dict) or (sweep.get('rhs') is None and sweep.get('objective') is None):
+            raise InvalidPayloadException('parametric should be an object with a rhs and/or objective direction')
+
+        start = _number(sweep.get('start', 0), 'parametric.start')
+        stop = _number(sweep.get('stop'), 'parametric.stop')
+        steps = sweep.get('steps')
+
+        if isinstance(steps, bool) or not isinstance(steps, int) or not 1 <= steps <= limit:
+            raise InvalidPayloadException('parametric.steps should be an integer from 1 to {}'.format(limit))
+
+        scenarios = [dict() for _ in range(steps)]
+
+        if sweep.get('rhs') is not None:
+            rhs = parametric([constraint[-1] for constraint in constraints],
+                             _vector(sweep['rhs'], 'parametric.rhs', m), start, stop, steps)
+            for scenario, values in zip(scenarios, rhs):
+                scenario['rhs'] = values
+
+        if sweep.get('objective') is not None:
+            costs = parametric(objective[0], _vector(sweep['objective'], 'parametric.objective', n),
+                               start, stop, steps)
+            for scenario, values in zip(scenarios, costs):
+                scenario['objective'] = values
+
+        chain = True
+
+    return objective, constraints, bounds, scenarios, chain
+
+
+def validate_transportation_payload(payload):
+    """
+    Checks a JSON transportation request, a cost row per supply.
+    :param payload: {'sense': 'min', 'costs': [[4, 6], [5, 3]], 'supply': [30, 20], 'demand': [25, 25]}
+    :return: ([[4.0, 6.0], [5.0, 3.0]], [30.0, 20.0], [25.0, 25.0], 'min')
+    """
+    if not isinstance(payload, dict):
+        raise InvalidPayloadException('Request body should be a JSON object')
+
+    sense = payload.get('sense', 'min')
+
+    if sense not in SENSES:
+        raise InvalidPayloadException("sense should be 'max' or 'min'")
+
+    limit = getattr(settings, 'SIMPLEX_TRANSPORTATION_MAX', 1000)
+    supply = _list(payload.get('supply'), 'supply')
+    demand = _list(payload.get('demand'), 'demand')
+
+    if not 1 <= len(supply) <= limit or not 1 <= len(demand) <= limit:
+        raise InvalidPayloadException('supply and demand should have 1 to {} items'.format(limit))
+
+    supply = _vector(supply, 'supply', len(supply))
+    demand = _vector(demand, 'demand', len(demand))
+
+    if min(supply) < 0 or min(demand) < 0:
+        raise InvalidPayloadException('supply and demand should not be negative')
+
+    costs = [_vector(row, 'costs[{}]'.format(i), len(demand))
+             for i, row in enumerate(_list(payload.get('costs'), 'costs', len(supply)))]
+
+    return costs, supply, demand, sense
+
+
+def _matrix(value, name, limit, shape=None):
+    rows = _list(value, name, shape and shape[0])
+
+    if not 1 <= len(rows) <= limit:
+        raise InvalidPayloadException('{} should have 1 to {} rows'.format(name, limit))
+
+    columns = shape[1] if shape else len(_list(rows[0], name + '[0]'))
+
+    if not 1 <= columns <= limit:
+        raise InvalidPayloadException('{} should have 1 to {} columns'.format(name, limit))
+
+    # plain type checks per row, _vector only runs to name a bad value
+    for i, row in enumerate(rows):
+        _list(row, '{}[{}]'.format(name, i), columns)
+
+        if not all(type(value) in (int, float) for value in row):
+            _vector(row, '{}[{}]'.format(name, i), columns)
+
+    matrix = np.array(rows, dtype=float)
+
+    if not np.isfinite(matrix).all():
+        for i, row in enumerate(rows):
+            _vector(row, '{}[{}]'.format(name, i), columns)
+
+    return matrix
+
+
+def validate_assignment_payload(payload):
+    """
+    Checks a JSON assignment request, "costs" a row per worker, or "batch"
+    a list of cost matrices with the same shape.
+    :param payload: {'sense': 'min', 'costs': [[9, 2], [6, 4], [5, 8]]}
+                    or {'sense': 'min', 'batch': [[[9, 2], [6, 4]], [[1, 3], [2, 8]]]}
+    :return: (np.ndarray((3, 2)), 'min', False), True for a batch of np.ndarray((n, m))
+    """
+    if not isinstance(payload, dict):
+        raise InvalidPayloadException('Request body should be a JSON object')
+
+    sense = payload.get('sense', 'min')
+
+    if sense not in SENSES:
+        raise InvalidPayloadException("sense should be 'max' or 'min'")
+
+    if ('costs' in payload) == ('batch' in payload):
+        raise InvalidPayloadException('Either costs or batch should be given')
+
+    limit = getattr(settings, 'SIMPLEX_ASSIGNMENT_MAX', 2000)
+
+    if 'costs' in payload:
+        return _matrix(payload['costs'], 'costs', limit), sense, False
+
+    batch = _list(payload['batch'], 'batch')
+    batch_limit = getattr(settings, 'SIMPLEX_ASSIGNMENT_BATCH_MAX', 10000)
+
+    if not 1 <= len(batch) <= batch_limit:
+        raise InvalidPayloadException('batch should have 1 to {} items'.format(batch_limit))
+
+    first = _matrix(batch[0], 'batch[0]', limit)
+    shape = (len(first), len(first[0]))
+
+    return [first] + [_matrix(costs, 'batch[{}]'.format(k), limit, shape)
+                      for k, costs in enumerate(batch[1:], 1)], sense, True
@@ -1,29 +1,72 @@
+import time
+
+import numpy as np
 import pulp
 
+from simplex_engine.assignment import solve_assignment, solve_assignments
+from simplex_engine.presolve import Presolve
+from simplex_engine.solver import LpProblem
+from simplex_engine.transportation import solve_transportation
+
+# presolve statuses as pulp.LpStatus values
+PRESOLVE_STATUS = {'Optimal': 'Optimal', 'infeasible': 'Infeasible', 'Unbounded': 'Unbounded'}
+
 
-def lp_solver(objective, constraints):
+def lp_solver(objective, constraints, bounds=None, presolve=False, time_limit=None):
     """
     :param objective: [[0, 1], ['max']]
     :param constraints: [[0, 1, '<=', 25], [0, 1, '<=', 25]]
-    :return:
+    :param bounds: [(0, None), (1, 5)], None is unbounded, defaults to x >= 0
+    :param presolve: reduce the problem before building the pulp model
+    :param time_limit: seconds CBC may run
+    :return: lp_result keys and 'timings', seconds of 'build' and 'solve'
+    """
+    if presolve:
+        return presolved_lp_solver(objective, constraints, bounds, time_limit)
+
+    start = time.perf_counter()
+    lp, variables = build_lp(objective, constraints, bounds)
+    build_time = time.perf_counter() - start
+    lp.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+
+    result = lp_result(lp, variables)
+    result['timings'] = {'build': build_time, 'solve': time.perf_counter() - start - build_time}
+
+    return result
+
+
+def build_lp(objective, constraints, bounds=None):
+    """
+    Builds the pulp problem of lp_solver.
+    :return: pulp.LpProblem, list of its variables in column order
     """
     variable_count = len(objective[0])
 
+    if bounds is None:
+        bounds = [(0, None)] * variable_count
+
     lp_sense = -1 if objective[1][0] == "max" else 1
     lp = pulp.LpProblem('lp', sense=lp_sense)
 
     variables = list()
 
     for i in range(variable_count):
-        variables.append(pulp.LpVariable(name="x" + str(i), lowBound=0))
+        variables.append(pulp.LpVariable(name="x" + str(i), lowBound=bounds[i][0], upBound=bounds[i][1]))
 
     lp += objective_function(objective[0], variables)
 
     for i in range(len(constraints)):
         lp += constraint_function(constraints[i], variables)
 
-    lp.solve()
+    return lp, variables
+
 
+def lp_result(lp, variables):
+    """
+    Gets the lp_solver result of a solved pulp problem.
+    :param variables: LpVariables of build_lp in column order, lp.variables()
+                      is sorted by name and puts x10 before x2
+    """
     result = dict()
 
     result['lp'] = lp
@@ -33,7 +76,7 @@ def lp_solver(objective, constraints):
     variables_value = dict()
     variables_value_list = list()
 
-    for variable in lp.variables():
+    for variable in variables:
         variables_value[variable.name] = variable.varValue
         variables_value_list.append(variable.varValue)
 
@@ -41,9 +84,414 @@ def lp_solver(objective, constraints):
     result['variables_value_list'] = variables_value_list
     result['objective_value'] = pulp.value(lp.objective)
 
+    # shadow prices and reduced costs, None unless CBC found an optimum
+    optimal = result['status'] == 'Optimal'
+    result['duals'] = [constraint.pi for constraint in lp.constraints.values()] if optimal else None
+    result['reduced_costs'] = [variable.dj for variable in variables] if optimal else None
+
+    return result
+
+
+def presolved_lp_solver(objective, constraints, bounds=None, time_limit=None):
+    """
+    Solves the presolved problem with lp_solver and maps its
+    values back to the original variables. Presolve statistics
+    are returned under 'presolve'.
+    """
+    reduction, presolve_time = presolve_problem(objective, constraints, bounds)
+    result = None
+
+    if reduction.status == 'Reduced':
+        result = lp_solver(*reduced_problem(objective, reduction), time_limit=time_limit)
+
+    return presolved_result(reduction, result, presolve_time)
+
+
+def presolve_problem(objective, constraints, bounds=None):
+    """
+    Runs the engine presolve on a lp_solver problem.
+    :return: (Presolve, seconds)
+    """
+    if bounds is None:
+        bounds = [(0, None)] * len(objective[0])
+
+    start = time.perf_counter()
+    reduction = Presolve(objective[0],
+                         [constraint[0] for constraint in constraints],
+                         [constraint[-2] for constraint in constraints],
+                         [constraint[-1] for constraint in constraints],
+                         [bound[0] for bound in bounds],
+                         [bound[1] for bound in bounds],
+                         objective[1][0]).run()
+
+    return reduction, time.perf_counter() - start
+
+
+def reduced_problem(objective, reduction):
+    """
+    Gets the reduced problem in lp_solver arguments.
+    :return: (objective, constraints, bounds)
+    """
+    obj, A, senses, rhs, lower, upper = reduction.reduced()
+
+    return [obj, objective[1]], list(zip(A.toarray().tolist(), senses, rhs)), list(zip(lower, upper))
+
+
+def presolved_result(reduction, result, presolve_time):
+    """
+    Maps the lp_solver result of the reduced problem back to the
+    original variables, result is None if presolve decided the problem.
+    """
+    if result is not None:
+        values = [result['variables_value'].get('x' + str(i)) or 0 for i in range(int(reduction.columns.sum()))]
+        result['solution_time'] = round(result['solution_time'] + presolve_time, 2)
+    else:
+        result = {'lp': None, 'status': PRESOLVE_STATUS[reduction.status], 'solution_time': round(presolve_time, 2)}
+        values = []
+
+    if result['status'] == 'Optimal':
+        solution = reduction.postsolve(values)
+
+        result['variables_value'] = {'x' + str(i): float(value) for i, value in enumerate(solution)}
+        result['variables_value_list'] = [float(value) for value in solution]
+        result['objective_value'] = reduction.objective_value(solution)
+    else:
+        result['variables_value'] = dict()
+        result['variables_value_list'] = list()
+        result['objective_value'] = None
+
+    # prices of the reduced problem do not map to the original rows
+    result['duals'] = None
+    result['reduced_costs'] = None
+    result['presolve'] = reduction.statistics()
+    result['timings'] = dict(result.get('timings') or dict(), presolve=presolve_time)
+
+    return result
+
+
+def lp_problem_solver(objective, constraints, bounds=None, progress=None, time_limit=None):
+    """
+    Solves with the engine's LpProblem instead of pulp, result has
+    the lp_solver keys and 'iterations'.
+    :param progress: callable(iterations, objective), returning False cancels the solve
+    :param time_limit: seconds, status is 'TimeLimit' when reached
+    :return:
+    """
+    start = time.perf_counter()
+    variable_count = len(objective[0])
+
+    lp = build_lp_problem(objective, constraints, bounds, time_limit=time_limit, progress=progress)
+    lp.solve()
+
+    return lp_problem_result(lp, variable_count, start)
+
+
+def lp_problem_result(lp, variable_count, start):
+    """
+    Gets the lp_problem_solver result of a solved LpProblem, with the
+    engine's phase 'timings', 'pivots' and 'refactorizations'.
+    :param start: time.perf_counter() when the solve started
+    """
+    result = dict()
+
+    result['status'] = PRESOLVE_STATUS.get(lp.status, lp.status)
+    result['solution_time'] = round(time.perf_counter() - start, 2)
+    result['iterations'] = lp.iterations
+    result['pivots'] = lp.pivots
+    result['refactorizations'] = lp.refactorizations
+    result['timings'] = dict(lp.timings)
+
+    if lp.status == 'Optimal':
+        values = [float(value) for value in lp.solution[:variable_count]]
+        result['variables_value'] = {'x' + str(i): value for i, value in enumerate(values)}
+        result['variables_value_list'] = values
+        result['objective_value'] = float(lp.Z)
+    else:
+        result['variables_value'] = dict()
+        result['variables_value_list'] = list()
+        result['objective_value'] = None
+
     return result
 
 
+def scenario_solver(objective, constraints, bounds=None, scenarios=(), chain=False, time_limit=None):
+    """
+    Solves the base problem with the engine, then its what-if scenarios
+    one after another, warm started from the base optimal basis.
+    :param scenarios: [{'rhs': [4, 18], 'objective': [3, 5]}], a missing key keeps the base value
+    :param chain: start each scenario from the previous optimal basis, for parametric sweeps
+    :param time_limit: seconds for the base solve and the whole sweep together, scenarios
+                       left when it is reached get status 'TimeLimit'
+    :return: lp_problem_solver result of the base problem, 'iterations', 'pivots' and 'timings'
+             are those of the base solve and 'solution_time' is the wall time of the base
+             solve and the whole sweep. 'scenarios' has a dict of status, objective_value,
+             variables and iterations per scenario, in order, empty when the base problem
+             has no optimum
+    """
+    start = time.perf_counter()
+
+    lp = build_lp_problem(objective, constraints, bounds, time_limit=time_limit)
+    lp.solve()
+
+    result = lp_problem_result(lp, len(objective[0]), start)
+    result['scenarios'] = list()
+
+    if lp.status == 'Optimal':
+        left = None if time_limit is None else max(time_limit - (time.perf_counter() - start), 0)
+
+        result['scenarios'] = [{
+            'status': PRESOLVE_STATUS.get(scenario['status'], scenario['status']),
+            'objective_value': scenario['Z'],
+            'variables': scenario['solution'],
+            'iterations': scenario['iterations'],
+        } for scenario in lp.sweep(list(scenarios), chain, left)]
+
+    result['solution_time'] = round(time.perf_counter() - start, 2)
+
+    return result
+
+
+def build_lp_problem(objective, constraints, bounds=None, **kwargs):
+    """
+    Builds the engine LpProblem of a lp_solver problem, ready to solve.
+    :param kwargs: LpProblem arguments, factorization defaults to 'lu'
+    :return: LpProblem
+    """
+    kwargs.setdefault('factorization', 'lu')
+
+    lp = LpProblem(objective[1][0], **kwargs)
+    lp.objective(list(objective[0]))
+    lp.constraints([list(constraint[0]) for constraint in constraints])
+    lp.constraint_senses(['==' if constraint[-2] == '=' else constraint[-2] for constraint in constraints])
+
+    if bounds is not None:
+        lp.bounds([bound[0] for bound in bounds], [bound[1] for bound in bounds])
+
+    lp.rhs([constraint[-1] for constraint in constraints])
+    lp._tableau_format()
+
+    return lp
+
+
+def sensitivity_report(objective, constraints, bounds=None, result=None):
+    """
+    Shadow prices, slacks, reduced costs and rhs/objective ranges of an
+    optimal solution. Ranges are read from the final basis of one engine
+    solve, PuLP's pi and dj are used as prices when result holds them.
+    :param result: lp_solver result of the same problem
+    :return: {'constraints': [...], 'variables': [...]}, a dict per row and variable,
+             ranges are (low, high) with None for unbounded ends,
+             None if the engine finds no optimum
+    :Example:
+
+    >>> sensitivity_report([[3, 2], ['max']], [[[1, 1], '<=', 4], [[1, 3], '<=', 6]])['constraints'][0]
+    {'rhs': 4, 'slack': 0.0, 'dual': 3.0, 'range': (0.0, 6.0)}
+    """
+    analysis = sensitivity_analysis(objective, constraints, bounds)
+
+    if analysis is None:
+        return None
+
+    return analysis_report(objective, constraints, analysis, result)
+
+
+def sensitivity_analysis(objective, constraints, bounds=None, time_limit=None):
+    """
+    Solves with the engine and reads LpProblem.sensitivity from its final basis.
+    :param time_limit: seconds the engine may run
+    :return: {'duals': [...], 'reduced_costs': [...], 'rhs_ranges': [...], 'objective_ranges': [...]},
+             None if the engine finds no optimum
+    """
+    lp = build_lp_problem(objective, constraints, bounds, time_limit=time_limit)
+    lp.solve()
+
+    analysis = lp.sensitivity()
+
+    if analysis is not None:
+        analysis['solution'] = [float(value) for value in lp.solution[:len(objective[0])]]
+
+    return analysis
+
+
+def analysis_report(objective, constraints, analysis, result=None):
+    """
+    Gets the sensitivity_report of a sensitivity_analysis without solving again.
+    """
+    result = result or dict()
+    values = result.get('variables_value_list') or analysis['solution']
+    duals = result.get('duals') or analysis['duals']
+    reduced_costs = result.get('reduced_costs') or analysis['reduced_costs']
+
+    return {
+        'constraints': [{
+            'rhs': constraint[-1],
+            'slack': float(constraint[-1] - np.dot(constraint[0], values)),
+            'dual': duals[i],
+            'range': analysis['rhs_ranges'][i],
+        } for i, constraint in enumerate(constraints)],
+        'variables': [{
+            'value': values[j],
+            'cost': cost,
+            'reduced_cost': reduced_costs[j],
+            'range': analysis['objective_ranges'][j],
+        } for j, cost in enumerate(objective[0])],
+    }
+
+
+def lp_solver_job(objective, constraints, bounds=None, presolve=False, time_limit=None):
+    """
+    lp_solver for the solver pool, drops the pulp problem
+    so only plain values are sent back to the web process.
+    """
+    result = lp_solver(objective, constraints, bounds, presolve, time_limit)
+    result.pop('lp')
+
+    return result
+
+
+def model_solver(model, engine='pulp', time_limit=None):
+    """
+    Solves a LpModel of solver.readers, as its LP relaxation.
+    Variables keep their names from the file.
+    :param model: LpModel
+    :param engine: 'pulp' or 'simplex'
+    :param time_limit: seconds
+    :return: lp_solver result without 'lp'
+    """
+    start = time.perf_counter()
+
+    if engine == 'simplex':
+        lp = model.lp_problem(factorization='lu', time_limit=time_limit)
+        lp.solve()
+
+        status = PRESOLVE_STATUS.get(lp.status, lp.status)
+        iterations = lp.iterations
+        timings = dict(lp.timings)
+        values = lp.solution[:model.shape[1]] if status == 'Optimal' else None
+    else:
+        lp, variables = build_model_lp(model)
+        build_time = time.perf_counter() - start
+        lp.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+
+        status = pulp.LpStatus[lp.status]
+        iterations = None
+        timings = {'build': build_time, 'solve': time.perf_counter() - start - build_time}
+        values = [variable.varValue or 0 for variable in variables] if status == 'Optimal' else None
+
+    result = dict()
+
+    result['status'] = status
+    result['solution_time'] = round(time.perf_counter() - start, 2)
+    result['iterations'] = iterations
+    result['timings'] = timings
+
+    if values is not None:
+        values = [float(value) for value in values]
+        result['variables_value'] = dict(zip(model.column_names, values))
+        result['variables_value_list'] = values
+        result['objective_value'] = model.objective_value(values)
+    else:
+        result['variables_value'] = dict()
+        result['variables_value_list'] = list()
+        result['objective_value'] = None
+
+    return result
+
+
+def build_model_lp(model):
+    """
+    Builds the pulp problem of a LpModel row by row from its CSR matrix,
+    columns are named x0, x1, ... as file names may not be valid in pulp.
+    :return: pulp.LpProblem, list of its variables in column order
+    """
+    lp = pulp.LpProblem('lp', sense=pulp.LpMaximize if model.sense == 'max' else pulp.LpMinimize)
+
+    variables = [pulp.LpVariable('x' + str(j),
+                                 lowBound=None if np.isinf(lower) else float(lower),
+                                 upBound=None if np.isinf(upper) else float(upper))
+                 for j, (lower, upper) in enumerate(zip(model.lower, model.upper))]
+
+    lp += pulp.LpAffineExpression([(variables[j], float(value)) for j, value in enumerate(model.obj) if value],
+                                  constant=model.offset)
+
+    senses = {'<=': pulp.LpConstraintLE, '>=': pulp.LpConstraintGE, '==': pulp.LpConstraintEQ}
+    A = model.A
+
+    for i, (sense, rhs) in enumerate(zip(model.senses, model.rhs)):
+        row = slice(A.indptr[i], A.indptr[i + 1])
+        expression = pulp.LpAffineExpression(list(zip(map(variables.__getitem__, A.indices[row]),
+                                                      A.data[row].tolist())))
+
+        lp += pulp.LpConstraint(e=expression, sense=senses[sense], rhs=float(rhs), name='c' + str(i))
+
+    return lp, variables
+
+
+def transportation_solver(costs, supply, demand, sense='min'):
+    """
+    Solves a transportation problem with the Vogel + MODI engine
+    instead of a S x D variable LP.
+    :param costs: [[4, 6], [5, 3]], a row per source
+    :param supply: [30, 20]
+    :param demand: [25, 25], unbalanced totals get a dummy source or destination
+    :param sense: 'min' for costs, 'max' for profits
+    :return: {'status': 'Optimal', 'solution_time': 0.0, 'objective_value': 190.0,
+              'allocation': [[25.0, 5.0], [0.0, 20.0]], 'u': [...], 'v': [...],
+              'iterations': 0, 'dummy': None}
+    """
+    problem = solve_transportation(costs, supply, demand, sense)
+
+    return {
+        'status': problem.status,
+        'solution_time': round(problem.solution_time, 4),
+        'objective_value': problem.Z,
+        'allocation': problem.allocation.tolist(),
+        'u': problem.u.tolist(),
+        'v': problem.v.tolist(),
+        'iterations': problem.iterations,
+        'dummy': problem.dummy,
+    }
+
+
+def assignment_solver(costs, sense='min'):
+    """
+    Solves an assignment problem with the Hungarian (Jonker-Volgenant)
+    engine instead of a n x m variable LP.
+    :param costs: [[9, 2], [6, 4], [5, 8]], a row per worker, rows and columns may differ
+    :param sense: 'min' for costs, 'max' for weights
+    :return: {'status': 'Optimal', 'solution_time': 0.0, 'objective_value': 7.0,
+              'assignment': [1, -1, 0], 'u': [...], 'v': [...]},
+             assignment is the job of every worker, -1 when left out
+    """
+    problem = solve_assignment(costs, sense)
+
+    return {
+        'status': problem.status,
+        'solution_time': round(problem.solution_time, 4),
+        'objective_value': problem.Z,
+        'assignment': problem.assignment.tolist(),
+        'u': problem.u.tolist(),
+        'v': problem.v.tolist(),
+    }
+
+
+def assignment_batch_solver(costs, sense='min'):
+    """
+    Solves many assignment problems with the same shape in one batch.
+    :param costs: [[[9, 2], [6, 4]], [[1, 3], [2, 8]]]
+    :return: {'status': ['Optimal', 'Optimal'], 'solution_time': 0.0,
+              'objective_value': [8.0, 5.0], 'assignment': [[1, 0], [1, 0]]}
+    """
+    batch = solve_assignments(costs, sense)
+
+    return {
+        'status': batch.status.tolist(),
+        'solution_time': round(batch.solution_time, 4),
+        'objective_value': batch.Z.tolist(),
+        'assignment': batch.assignment.tolist(),
+    }
+
+
 def objective_function(objective, variables):
     objective_func = ""
 
@@ -59,7 +507,7 @@ def constraint_function(constraint, variables):
 
     if constraint[-2] == '<=':
         constrain_sense = pulp.LpConstraintLE
-    elif constraint[-2] == '=':
+    elif constraint[-2] in ('=', '=='):
         constrain_sense = pulp.LpConstraintEQ
     else:
         constrain_sense = pulp.LpConstraintGE
@@ -1,7 +1,35 @@
-from django.shortcuts import render
+import asyncio
+import hmac
+import json
+import time
+
+from django.conf import settings
+from django.db.models import Count
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, JsonResponse
+from django.shortcuts import render, reverse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import FormView, DetailView
+from .exceptions import InvalidPayloadException, SolverBusyException, SolverTimeoutException
 from .forms import *
-from .mixins import SimplexInitMixin, SimplexSolveActionMixin
+from .mixins import JobApiMixin, ProblemApiMixin, SimplexInitMixin, SimplexSolveActionMixin
+from .models import LpProblem, SolveJob
+from .utils import async_solver, cache, executor, history, jobs, metrics, solver
+from .utils.schema import (validate_job_payload, validate_scenario_payload, validate_solve_payload,
+                           validate_transportation_payload, validate_assignment_payload)
+from simplex_engine.readers import read_model
+
+
+def async_view(view):
+    """
+    Marks a decorated async view as a coroutine function again. Decorators
+    of Django 3.2 such as csrf_exempt wrap it in a sync function, which the
+    handler would run in a thread and get an unawaited coroutine back.
+    """
+    view._is_coroutine = asyncio.coroutines._is_coroutine
+
+    return view
 
 
 # Create your views here.
@@ -26,11 +54,449 @@ class SolveView(SimplexSolveActionMixin, SimplexInitMixin, FormView):
         return kwargs
 
 
+def solve_api_response(result, start, **extra):
+    """
+    Gets the JSON answer of a solve request, `extra` keys are added to it.
+    """
+    return JsonResponse({
+        'status': result['status'],
+        'objective_value': result['objective_value'],
+        'variables': result['variables_value_list'],
+        'solution_time': result['solution_time'],
+        'elapsed': round(time.perf_counter() - start, 4),
+        'cache_hit': result.get('cache_hit', False),
+        **extra,
+    })
+
+
+def solver_error_response(error):
+    """
+    Gets the JSON answer of SolverBusyException (503) or SolverTimeoutException (504).
+    """
+    if isinstance(error, SolverBusyException):
+        response = JsonResponse({'error': str(error)}, status=503)
+        response['Retry-After'] = error.retry_after
+        return response
+
+    return JsonResponse({'error': str(error)}, status=504)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class SolveApiView(View):
+    """
+    JSON solve endpoint for scripted clients. Skips SolveForm and
+    template rendering, so there is no 10x10 size cap.
+    """
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        start = time.perf_counter()
+
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'error': 'Request body is not valid JSON'}, status=400)
+
+        try:
+            objective, constraints, bounds = validate_solve_payload(payload)
+            metrics.record_validation('payload', start)
+            result = cache.solve(objective, constraints, bounds)
+        except InvalidPayloadException as error:
+            return JsonResponse({'error': str(error)}, status=400)
+        except (SolverBusyException, SolverTimeoutException) as error:
+            return solver_error_response(error)
+
+        history.record(objective, constraints, result, bounds)
+
+        return solve_api_response(result, start)
+
+
+@async_view
+@csrf_exempt
+async def solve_api_async(request):
+    """
+    Async /api/solve/ for ASGI, the request waits on CBC or the solver
+    pool without holding a thread. Takes an optional "engine",
+    'pulp' (default) or 'simplex'.
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    start = time.perf_counter()
+
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': 'Request body is not valid JSON'}, status=400)
+
+    try:
+        objective, constraints, bounds, engine = validate_job_payload(payload, SolveJob.Engine.PULP)
+        metrics.record_validation('payload', start)
+        result = await async_solver.solve_async(objective, constraints, bounds, engine)
+    except InvalidPayloadException as error:
+        return JsonResponse({'error': str(error)}, status=400)
+    except (SolverBusyException, SolverTimeoutException) as error:
+        return solver_error_response(error)
+
+    await history.record_async(objective, constraints, result, bounds, engine)
+
+    return solve_api_response(result, start)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class JobCreateApiView(View):
+    """
+    Queues a solve request and answers 202 at once,
+    the job is polled at its Location.
+    """
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        start = time.perf_counter()
+
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'error': 'Request body is not valid JSON'}, status=400)
+
+        try:
+            objective, constraints, bounds, engine = validate_job_payload(payload)
+            metrics.record_validation('payload', start)
+        except InvalidPayloadException as error:
+            return JsonResponse({'error': str(error)}, status=400)
+
+        job = jobs.create_job(objective, constraints, bounds, engine)
+
+        response = JsonResponse(jobs.describe(job), status=202)
+        response['Location'] = reverse('simplex:api_job', args=[job.pk])
+        return response
+
+
+class JobApiView(JobApiMixin, View):
+    """
+    Status, progress (iteration, current objective) and result of a job.
+    """
+    http_method_names = ['get']
+
+    def get(self, request, *args, **kwargs):
+        job = self.get_job()
+
+        if job is None:
+            return JsonResponse({'error': 'Job not found'}, status=404)
+
+        return JsonResponse(jobs.describe(job))
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class JobCancelApiView(JobApiMixin, View):
+    """
+    Cancels a queued or running job, 409 if it has already ended.
+    """
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        job = self.get_job()
+
+        if job is None:
+            return JsonResponse({'error': 'Job not found'}, status=404)
+
+        if not jobs.cancel_job(job):
+            return JsonResponse({'error': 'Job has already ended'}, status=409)
+
+        job.refresh_from_db()
+        return JsonResponse(jobs.describe(job), status=202)
+
+
+class ProblemListApiView(View):
+    """
+    Latest stored problems, one query.
+    """
+    http_method_names = ['get']
+    limit = 50
+
+    def get(self, request, *args, **kwargs):
+        problems = (LpProblem.objects.order_by('-created')
+                    .annotate(constraint_count=Count('equations'))
+                    .values('id', 'name', 'sense', 'created', 'objective__variable_count', 'constraint_count'))
+
+        return JsonResponse({'problems': [{
+            'id': problem['id'],
+            'name': problem['name'],
+            'sense': problem['sense'],
+            'created': problem['created'].isoformat(),
+            'variable_count': problem['objective__variable_count'],
+            'constraint_count': problem['constraint_count'],
+        } for problem in problems[:self.limit]]})
+
+
+class ProblemApiView(ProblemApiMixin, View):
+    """
+    A stored problem with its latest solutions.
+    """
+    http_method_names = ['get']
+
+    def get(self, request, *args, **kwargs):
+        problem = self.get_problem()
+
+        if problem is None:
+            return JsonResponse({'error': 'Problem not found'}, status=404)
+
+        return JsonResponse(history.describe_problem(problem))
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ProblemSolveApiView(ProblemApiMixin, View):
+    """
+    Solves a stored problem again and stores the new solution.
+    """
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        start = time.perf_counter()
+        problem = self.get_problem()
+
+        if problem is None:
+            return JsonResponse({'error': 'Problem not found'}, status=404)
+
+        objective, constraints, bounds = problem.to_problem()
+
+        try:
+            result = cache.solve(objective, constraints, bounds)
+        except (SolverBusyException, SolverTimeoutException) as error:
+            return solver_error_response(error)
+
+        history.record_solution(problem, result)
+
+        return solve_api_response(result, start)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ModelImportApiView(View):
+    """
+    Solves an uploaded MPS or CPLEX LP file, multipart field "file".
+    Optional "format" ('mps' or 'lp', else taken from the file name)
+    and "engine" ('pulp' or 'simplex'). Integer markers are dropped,
+    the LP relaxation is solved.
+    """
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        start = time.perf_counter()
+        upload = request.FILES.get('file')
+
+        if upload is None:
+            return JsonResponse({'error': 'No file uploaded'}, status=400)
+
+        if upload.size > getattr(settings, 'SIMPLEX_IMPORT_MAX_SIZE', 256 * 1024 * 1024):
+            return JsonResponse({'error': 'The file is too large'}, status=413)
+
+        engine = request.POST.get('engine', SolveJob.Engine.PULP)
+
+        if engine not in SolveJob.Engine.values:
+            return JsonResponse({'error': 'engine must be one of {}'.format(', '.join(SolveJob.Engine.values))},
+                                status=400)
+
+        try:
+            model = read_model(upload, request.POST.get('format') or None)
+        except ValueError as error:
+            return JsonResponse({'error': str(error)}, status=400)
+
+        parse_time = time.perf_counter() - start
+        metrics.observe('simplex_validation_seconds', parse_time, step='model')
+
+        try:
+            result = executor.submit(solver.model_solver, model, engine, executor.time_limit())
+        except (SolverBusyException, SolverTimeoutException) as error:
+            return solver_error_response(error)
+
+        return solve_api_response(result, start,
+                                  name=model.name,
+                                  rows=model.shape[0],
+                                  columns=model.shape[1],
+                                  nonzeros=model.nonzeros,
+                                  column_names=model.column_names,
+                                  parse_time=round(parse_time, 4))
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ScenarioApiView(View):
+    """
+    What-if sweep of a problem, a solve request with "scenarios" (rhs and/or
+    objective replacements) or "parametric" (directions moved from start to
+    stop). Scenarios are solved by the engine warm started from the base
+    optimal basis, one after another in one solver pool job. The response
+    is that of /api/solve/ for the base problem with "scenarios", fields as
+    in solver.scenario_solver, empty when the base problem has no optimum.
+    """
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        start = time.perf_counter()
+
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'error': 'Request body is not valid JSON'}, status=400)
+
+        try:
+            objective, constraints, bounds, scenarios, chain = validate_scenario_payload(payload)
+            metrics.record_validation('payload', start)
+            result = executor.sweep(objective, constraints, bounds, scenarios, chain)
+        except InvalidPayloadException as error:
+            return JsonResponse({'error': str(error)}, status=400)
+        except (SolverBusyException, SolverTimeoutException) as error:
+            return solver_error_response(error)
+
+        return solve_api_response(result, start, scenarios=result['scenarios'])
+
+
 class TransportationInit(SimplexInitMixin, FormView):
     template_name = 'simplex/transportation/transportation_init.html'
     form_class = TransportationInitForm
 
 
+class TransportationSolve(SimplexSolveActionMixin, SimplexInitMixin, FormView):
+    template_name = 'simplex/transportation/transportation_solve.html'
+    template_name_success = 'simplex/transportation/transportation_result.html'
+    form_class = TransportationSolveForm
+    init_url = 'simplex:transportation_init'
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        variables = self.request.GET.get('variables',
+                                         self.request.POST.get('variables'))
+        constraints = self.request.GET.get('constraints',
+                                           self.request.POST.get('constraints'))
+        kwargs.update({'variables': variables})
+        kwargs.update({'constraints': constraints})
+
+        return kwargs
+
+    def get_result_context(self, form, result):
+        """
+        Allocation grid with the supply and demand duals.
+        """
+        return {
+            'status': result['status'],
+            'time': result['solution_time'],
+            'objective_value': result['objective_value'],
+            'iterations': result['iterations'],
+            'dummy': result['dummy'],
+            'rows': [{'allocation': allocation, 'u': u}
+                     for allocation, u in zip(result['allocation'], result['u'])],
+            'v': result['v'],
+        }
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class TransportationApiView(View):
+    """
+    JSON transportation endpoint, solved by the Vogel + MODI engine
+    instead of a S x D variable LP.
+    """
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        start = time.perf_counter()
+
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'error': 'Request body is not valid JSON'}, status=400)
+
+        try:
+            costs, supply, demand, sense = validate_transportation_payload(payload)
+            metrics.record_validation('payload', start)
+            result = executor.submit(solver.transportation_solver, costs, supply, demand, sense)
+        except InvalidPayloadException as error:
+            return JsonResponse({'error': str(error)}, status=400)
+        except (SolverBusyException, SolverTimeoutException) as error:
+            return solver_error_response(error)
+
+        return JsonResponse(dict(result, elapsed=round(time.perf_counter() - start, 4)))
+
+
 class AssignmentInit(SimplexInitMixin, FormView):
     template_name = 'simplex/assignment/assignment_init.html'
-    form_class = AssignmentInitForm
\ No newline at end of file
+    form_class = AssignmentInitForm
+
+
+class AssignmentSolve(SimplexSolveActionMixin, SimplexInitMixin, FormView):
+    template_name = 'simplex/assignment/assignment_solve.html'
+    template_name_success = 'simplex/assignment/assignment_result.html'
+    form_class = AssignmentSolveForm
+    init_url = 'simplex:assignment_init'
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        variables = self.request.GET.get('variables',
+                                         self.request.POST.get('variables'))
+        constraints = self.request.GET.get('constraints',
+                                           self.request.POST.get('constraints'))
+        kwargs.update({'variables': variables})
+        kwargs.update({'constraints': constraints})
+
+        return kwargs
+
+    def get_result_context(self, form, result):
+        """
+        Cost matrix with the assigned cells.
+        """
+        return {
+            'status': result['status'],
+            'time': result['solution_time'],
+            'objective_value': result['objective_value'],
+            'jobs': range(1, form.jobs + 1),
+            'rows': [{'job': job, 'cells': [{'cost': cost, 'assigned': j == job} for j, cost in enumerate(costs)]}
+                     for job, costs in zip(result['assignment'], form.get_values_of_costs())],
+        }
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AssignmentApiView(View):
+    """
+    JSON assignment endpoint, solved by the Hungarian engine instead of a
+    n x m variable LP. "costs" is one matrix, or "batch" a list of matrices
+    with the same shape that are solved together.
+    """
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        start = time.perf_counter()
+
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'error': 'Request body is not valid JSON'}, status=400)
+
+        try:
+            costs, sense, batch = validate_assignment_payload(payload)
+            metrics.record_validation('payload', start)
+            result = executor.submit(solver.assignment_batch_solver if batch else solver.assignment_solver,
+                                     costs, sense)
+        except InvalidPayloadException as error:
+            return JsonResponse({'error': str(error)}, status=400)
+        except (SolverBusyException, SolverTimeoutException) as error:
+            return solver_error_response(error)
+
+        return JsonResponse(dict(result, elapsed=round(time.perf_counter() - start, 4)))
+
+
+class MetricsView(View):
+    """
+    Solver and request metrics of this process in the Prometheus text format,
+    404 unless SIMPLEX_METRICS is set. With SIMPLEX_METRICS_TOKEN set, requests
+    without "Authorization: Bearer <token>" get 403.
+    """
+    http_method_names = ['get']
+
+    def get(self, request, *args, **kwargs):
+        if not getattr(settings, 'SIMPLEX_METRICS', False):
+            raise Http404
+
+        token = getattr(settings, 'SIMPLEX_METRICS_TOKEN', None)
+
+        if token and not hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', ''), 'Bearer ' + token):
+            return HttpResponse('Forbidden', status=403, content_type='text/plain; charset=utf-8')
+
+        return HttpResponse(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,436 @@
+import time
+
+import numpy as np
+
+
+class AssignmentProblem():
+    """
+    Assignment problem on an n x m cost matrix: every row (worker) takes at
+    most one column (job) and every column at most one row, min(n, m) pairs
+    are assigned at the least total cost.
+
+    Rows are assigned one at a time by shortest augmenting paths (Jonker-
+    Volgenant), a Dijkstra search over the columns on reduced costs
+    c_ij - u_i - v_j that stay non-negative. The search is vectorized over
+    the columns still to be scanned, O(n^2 m) in all. Wide matrices are
+    solved as they are, tall ones transposed.
+    """
+
+    def __init__(self, costs, sense='min'):
+        """
+        Parameters: costs: list[list[float]] or np.ndarray((n, m))
+                    sense: str -> could be ['min', 'max'], 'max' maximizes the total weight
+
+        Returns: None
+        """
+
+        self.costs = np.array(costs, dtype=float)
+
+        if self.costs.ndim != 2 or 0 in self.costs.shape:
+            raise ValueError("costs should be a non empty matrix")
+
+        if not np.all(np.isfinite(self.costs)):
+            raise ValueError("costs should be finite")
+
+        if sense not in ('min', 'max'):
+            raise ValueError("sense should be 'min' or 'max'")
+
+        self.sense = sense
+        self.status = "Unsolved"
+
+
+    def solve(self):
+        """
+        Solves the problem.
+
+        Parameters: None
+
+        Returns: AssignmentProblem -> status, Z, assignment (column of every
+                 row, -1 for rows left out of a tall matrix), u and v (row
+                 and column duals of the min cost problem)
+        """
+
+        start = time.perf_counter()
+
+        C = -self.costs if self.sense == 'max' else self.costs
+        transposed = C.shape[0] > C.shape[1]
+
+        if transposed:
+            C = C.T
+
+        n, m = C.shape
+        u, col4row, row4col = _row_reduction(C)
+        v = np.zeros(m)
+
+        # column duals of a wide matrix stay 0 until the column is assigned
+        if n == m:
+            _augmenting_row_reduction(C, u, v, col4row, row4col)
+
+        for i in np.flatnonzero(col4row < 0):
+            _augment(C, u, v, col4row, row4col, i)
+
+        # columns of the transposed matrix are the rows
+        if transposed:
+            u, v = v, u
+            col4row = row4col
+
+        self.assignment = col4row
+        self.u, self.v = u, v
+        rows = np.flatnonzero(self.assignment >= 0)
+        self.Z = float(self.costs[rows, self.assignment[rows]].sum())
+        self.status = "Optimal"
+        self.solution_time = time.perf_counter() - start
+
+        return self
+
+
+    def pairs(self):
+        """
+        Gets the assigned (row, column) pairs.
+
+        Parameters: None
+
+        Returns: list[(int, int)]
+        """
+
+        return [(int(i), int(j)) for i, j in enumerate(self.assignment) if j >= 0]
+
+
+class AssignmentBatch():
+    """
+    K assignment problems with the same n x m shape solved at once, for
+    many small matrices where the per row loop of AssignmentProblem costs
+    more than the arithmetic. Row i of every problem that still needs it is
+    assigned in the same augmenting path search, each step scans a column
+    in all of them.
+    """
+
+    def __init__(self, costs, sense='min'):
+        """
+        Parameters: costs: np.ndarray((K, n, m))
+                    sense: str -> could be ['min', 'max']
+
+        Returns: None
+        """
+
+        self.costs = np.array(costs, dtype=float)
+
+        if self.costs.ndim != 3 or 0 in self.costs.shape:
+            raise ValueError("costs should be a non empty (K, n, m) array")
+
+        if not np.all(np.isfinite(self.costs)):
+            raise ValueError("costs should be finite")
+
+        if sense not in ('min', 'max'):
+            raise ValueError("sense should be 'min' or 'max'")
+
+        self.sense = sense
+        self.status = np.full(len(self.costs), 'Unsolved', dtype=object)
+
+
+    def solve(self):
+        """
+        Solves every problem.
+
+        Parameters: None
+
+        Returns: AssignmentBatch -> status, Z (K,) and assignment (K, n)
+                 arrays, as in AssignmentProblem
+        """
+
+        start = time.perf_counter()
+
+        C = -self.costs if self.sense == 'max' else self.costs
+        transposed = C.shape[1] > C.shape[2]
+
+        if transposed:
+            C = C.transpose(0, 2, 1)
+
+        K, n, m = C.shape
+        batch = np.arange(K)
+
+        u = C.min(axis=2)
+        v = np.zeros((K, m))
+        col4row = np.full((K, n), -1)
+        row4col = np.full((K, m), -1)
+
+        cheapest = C.argmin(axis=2)
+
+        for i in range(n):
+            take = row4col[batch, cheapest[:, i]] < 0
+            col4row[take, i] = cheapest[take, i]
+            row4col[take, cheapest[take, i]] = i
+
+        for i in range(n):
+            problems = np.flatnonzero(col4row[:, i] < 0)
+
+            if len(problems):
+                _augment_batch(C, u, v, col4row, row4col, i, problems)
+
+        self.assignment = row4col[:, :self.costs.shape[1]] if transposed else col4row
+
+        rows = np.arange(self.assignment.shape[1])
+        assigned = self.assignment >= 0
+        picked = self.costs[batch[:, np.newaxis], rows, np.maximum(self.assignment, 0)]
+        self.Z = np.where(assigned, picked, 0).sum(axis=1)
+        self.status[:] = "Optimal"
+        self.solution_time = time.perf_counter() - start
+
+        return self
+
+
+def _row_reduction(C):
+    """
+    Initial duals u_i = min_j c_ij with v = 0, rows whose cheapest column
+    is still free take it at zero reduced cost.
+
+    Parameters: C: np.ndarray((n, m)) -> n <= m
+
+    Returns: (np.ndarray(n), np.ndarray(n), np.ndarray(m)) -> u, col4row, row4col
+    """
+
+    n, m = C.shape
+    cheapest = np.argmin(C, axis=1)
+    u = C[np.arange(n), cheapest]
+
+    col4row = np.full(n, -1)
+    row4col = np.full(m, -1)
+
+    # first row of every cheapest column gets it
+    columns, rows = np.unique(cheapest, return_index=True)
+    col4row[rows] = columns
+    row4col[columns] = rows
+
+    return u, col4row, row4col
+
+
+def _augmenting_row_reduction(C, u, v, col4row, row4col, passes=2):
+    """
+    Auction-like passes over the free rows of a square matrix. A free row
+    takes the column of its least reduced cost c_ij - v_j and lowers that
+    column's v by the gap to its second least, so the row it displaces
+    bids again at once. Every assigned row keeps its least reduced cost
+    column, u is set to match for the rows that changed.
+
+    Parameters: same as _augment, without i
+
+    Returns: None
+    """
+
+    free = list(np.flatnonzero(col4row < 0))
+
+    for _ in range(passes):
+        k, steps, unassigned = 0, 0, []
+
+        # bids are capped, rows left over are assigned by _augment
+        while k < len(free) and steps < 30 * len(C):
+            i = free[k]
+            k += 1
+            steps += 1
+
+            reduced = C[i] - v
+            j1 = int(reduced.argmin())
+            u1 = reduced[j1]
+            reduced[j1] = np.inf
+            j2 = int(reduced.argmin())
+            u2 = reduced[j2]
+
+            displaced = row4col[j1]
+
+            if u1 < u2:
+                v[j1] -= u2 - u1
+            elif displaced >= 0:
+                j1 = j2
+                displaced = row4col[j1]
+
+            col4row[i], row4col[j1] = j1, i
+            u[i] = C[i, j1] - v[j1]
+
+            if displaced >= 0:
+                col4row[displaced] = -1
+
+                if u1 < u2:
+                    k -= 1
+                    free[k] = displaced
+                else:
+                    unassigned.append(displaced)
+
+        free = unassigned + free[k:]
+
+
+def _augment(C, u, v, col4row, row4col, i):
+    """
+    Assigns free row i along the shortest augmenting path and updates the
+    duals so every assigned cell keeps a zero reduced cost. Ties between
+    columns go to a free column, which ends the search.
+
+    Parameters: C: np.ndarray((n, m))
+                u, v: np.ndarray -> duals, updated in place
+                col4row, row4col: np.ndarray -> matching, updated in place
+                i: int -> free row
+
+    Returns: None
+    """
+
+    m = C.shape[1]
+
+    # columns left to scan are kept in the first `left` slots, a scanned one is swapped out
+    remaining = np.arange(m)
+    labels = np.full(m, np.inf)
+    via = np.full(m, -1)
+    left = m
+
+    shortest = np.empty(m)
+    path = np.empty(m, dtype=int)
+    rows = [i]
+    lowest = 0.0
+    current = i
+
+    while True:
+        columns = remaining[:left]
+        reduced = lowest + C[current, columns] - u[current] - v[columns]
+        better = reduced < labels[:left]
+        labels[:left][better] = reduced[better]
+        via[:left][better] = current
+
+        k = int(labels[:left].argmin())
+        lowest = labels[k]
+
+        if row4col[columns[k]] >= 0:
+            ties = (labels[:left] == lowest).nonzero()[0]
+            if len(ties) > 1:
+                free = ties[row4col[columns[ties]] < 0]
+                if len(free):
+                    k = int(free[0])
+
+        j = int(columns[k])
+        shortest[j], path[j] = lowest, via[k]
+
+        left -= 1
+        remaining[k], remaining[left] = remaining[left], remaining[k]
+        labels[k], labels[left] = labels[left], labels[k]
+        via[k], via[left] = via[left], via[k]
+
+        if row4col[j] < 0:
+            break
+
+        current = int(row4col[j])
+        rows.append(current)
+
+    scanned = remaining[left:]
+
+    # scanned rows and columns move by how much nearer than the sink they were
+    u[i] += lowest
+    others = np.array(rows[1:], dtype=int)
+    u[others] += lowest - shortest[col4row[others]]
+    v[scanned] -= lowest - shortest[scanned]
+
+    sink = j
+
+    while True:
+        row = path[sink]
+        row4col[sink] = row
+        col4row[row], sink = sink, col4row[row]
+
+        if row == i:
+            break
+
+
+def _augment_batch(C, u, v, col4row, row4col, i, problems):
+    """
+    _augment of free row i in each of problems at once. Scanned columns are
+    masked instead of swapped out, a problem leaves the search when it
+    reaches a free column.
+
+    Parameters: C: np.ndarray((K, n, m))
+                u, v, col4row, row4col: np.ndarray -> as in _augment with a leading K axis
+                i: int -> free row in every one of problems
+                problems: np.ndarray -> problem indexes
+
+    Returns: None
+    """
+
+    A, m = len(problems), C.shape[2]
+    everyone = np.arange(A)
+
+    labels = np.full((A, m), np.inf)
+    via = np.full((A, m), -1)
+    scanned = np.zeros((A, m), dtype=bool)
+    shortest = np.zeros((A, m))
+    path = np.full((A, m), -1)
+    rows = np.zeros((A, C.shape[1]), dtype=bool)
+
+    lowest = np.zeros(A)
+    current = np.full(A, i)
+    sink = np.full(A, -1)
+    searching = everyone
+
+    while len(searching):
+        a, k, r = searching, problems[searching], current[searching]
+
+        reduced = lowest[a, np.newaxis] + C[k, r] - u[k, r][:, np.newaxis] - v[k]
+        better = (reduced < labels[a]) & ~scanned[a]
+        labels[a] = np.where(better, reduced, labels[a])
+        via[a] = np.where(better, r[:, np.newaxis], via[a])
+
+        masked = np.where(scanned[a], np.inf, labels[a])
+        j = masked.argmin(axis=1)
+        low = masked[np.arange(len(a)), j]
+
+        # ties go to a free column
+        ties = (masked == low[:, np.newaxis]) & (row4col[k] < 0)
+        j = np.where(ties.any(axis=1), ties.argmax(axis=1), j)
+
+        lowest[a] = low
+        scanned[a, j] = True
+        shortest[a, j] = low
+        path[a, j] = via[a, j]
+
+        owner = row4col[k, j]
+        found = owner < 0
+        sink[a[found]] = j[found]
+
+        a, owner = a[~found], owner[~found]
+        current[a] = owner
+        rows[a, owner] = True
+        searching = a
+
+    u[problems, i] += lowest
+    a, r = np.nonzero(rows)
+    u[problems[a], r] += lowest[a] - shortest[a, col4row[problems[a], r]]
+    v[problems] -= np.where(scanned, lowest[:, np.newaxis] - shortest, 0)
+
+    column = sink
+    going = everyone
+
+    while len(going):
+        k, j = problems[going], column[going]
+        row = path[going, j]
+        row4col[k, j] = row
+        column[going] = col4row[k, row]
+        col4row[k, row] = j
+        going = going[row != i]
+
+
+def solve_assignment(costs, sense='min'):
+    """
+    Solves an assignment problem.
+
+    Parameters: same as AssignmentProblem
+
+    Returns: AssignmentProblem
+    """
+
+    return AssignmentProblem(costs, sense).solve()
+
+
+def solve_assignments(costs, sense='min'):
+    """
+    Solves K assignment problems with the same shape in one vectorized batch.
+
+    Parameters: same as AssignmentBatch
+
+    Returns: AssignmentBatch
+    """
+
+    return AssignmentBatch(costs, sense).solve()
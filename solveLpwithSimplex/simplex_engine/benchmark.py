@@ -0,0 +1,772 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linear_sum_assignment
+
+from .readers import read_model
+from .assignment import solve_assignment, solve_assignments
+from .solver import LpProblem, solve_many, sweep
+from .transportation import solve_transportation
+
+
+def random_lp(m, n, seed=0):
+    """
+    Generates a feasible and bounded max problem with only <= constraints.
+
+    Parameters: m: int -> constraint count
+                n: int -> variable count
+                seed: int
+
+    Returns: (obj, constraints, senses, rhs)
+    """
+
+    rng = np.random.RandomState(seed)
+
+    obj = rng.randint(1, 20, size=n).astype(float)
+    constraints = rng.randint(1, 10, size=(m, n)).astype(float)
+    rhs = rng.randint(50, 100, size=m).astype(float) * n
+
+    return list(obj), constraints.tolist(), ['<='] * m, list(rhs)
+
+
+def random_sparse_lp(m, n, density, seed=0):
+    """
+    Generates a sparse feasible and bounded max problem with only <= constraints.
+    Every column gets at least one nonzero so no variable is unbounded.
+
+    Parameters: m: int -> constraint count
+                n: int -> variable count
+                density: float
+                seed: int
+
+    Returns: (obj, constraints, senses, rhs), constraints is a CSR matrix
+    """
+
+    rng = np.random.RandomState(seed)
+
+    A = sp.random(m, n, density=density, format='csr', random_state=rng,
+                  data_rvs=lambda k: rng.randint(1, 10, size=k))
+    A = A + sp.csr_matrix((np.ones(n), (np.arange(n) % m, np.arange(n))), shape=(m, n))
+
+    obj = rng.randint(1, 20, size=n).astype(float)
+    rhs = rng.randint(50, 100, size=m).astype(float)
+
+    return list(obj), A, ['<='] * m, list(rhs)
+
+
+def random_covering_lp(m, n, seed=0):
+    """
+    Generates a feasible and bounded min problem with only >= constraints.
+
+    Parameters: m: int -> constraint count
+                n: int -> variable count
+                seed: int
+
+    Returns: (obj, constraints, senses, rhs)
+    """
+
+    rng = np.random.RandomState(seed)
+
+    obj = rng.randint(1, 20, size=n).astype(float)
+    constraints = rng.randint(0, 10, size=(m, n)).astype(float)
+    rhs = rng.randint(10, 50, size=m).astype(float)
+
+    return list(obj), constraints.tolist(), ['>='] * m, list(rhs)
+
+
+def random_redundant_lp(m, n, seed=0):
+    """
+    Generates a random_lp with the redundancy of generated models added:
+    bound rows on single variables and scaled copies of rows.
+
+    Parameters: m: int -> constraint count before redundant rows
+                n: int -> variable count
+                seed: int
+
+    Returns: (obj, constraints, senses, rhs)
+    """
+
+    rng = np.random.RandomState(seed)
+    obj, constraints, senses, rhs = random_lp(m, n, seed)
+
+    for j in rng.choice(n, size=m // 4, replace=False):
+        row = [0.0] * n
+        row[j] = 1.0
+        constraints.append(row)
+        senses.append('<=')
+        rhs.append(float(rng.randint(5, 50)))
+
+    for i in rng.choice(m, size=m // 4, replace=False):
+        scale = float(rng.randint(2, 5))
+        constraints.append([scale * a for a in constraints[i]])
+        senses.append(senses[i])
+        rhs.append(scale * rhs[i])
+
+    return obj, constraints, senses, rhs
+
+
+def degenerate_lp(m, n, seed=0):
+    """
+    Generates a random_lp whose second half of rows has mixed signs
+    and rhs 0, so the starting vertex is degenerate.
+
+    Parameters: m: int -> constraint count
+                n: int -> variable count
+                seed: int
+
+    Returns: (obj, constraints, senses, rhs)
+    """
+
+    rng = np.random.RandomState(seed)
+    obj, constraints, senses, rhs = random_lp(m - m // 2, n, seed)
+
+    constraints += rng.randint(-5, 6, size=(m // 2, n)).astype(float).tolist()
+
+    return obj, constraints, senses + ['<='] * (m // 2), rhs + [0.0] * (m // 2)
+
+
+# Beale's example, cycles under Dantzig's rule with smallest row ties
+BEALE = ([0.75, -150, 0.02, -6], [[0.25, -60, -0.04, 9], [0.5, -90, -0.02, 3], [0, 0, 1, 0]], ['<='] * 3, [0, 0, 1])
+
+
+def badly_scaled_lp(m, n, magnitude=4, seed=0):
+    """
+    Generates a random_lp with rows and columns multiplied
+    by powers of 10 up to 10^magnitude.
+
+    Parameters: m: int -> constraint count
+                n: int -> variable count
+                magnitude: int
+                seed: int
+
+    Returns: (obj, constraints, senses, rhs)
+    """
+
+    rng = np.random.RandomState(seed)
+    obj, constraints, senses, rhs = random_lp(m, n, seed)
+
+    rows = 10.0 ** rng.uniform(-magnitude, magnitude, size=m)
+    cols = 10.0 ** rng.uniform(-magnitude, magnitude, size=n)
+
+    A = np.array(constraints) * rows[:, np.newaxis] * cols
+
+    return list(np.array(obj) * cols), A.tolist(), senses, list(np.array(rhs) * rows)
+
+
+def random_transportation(S, D, seed=0):
+    """
+    Generates a transportation problem with more supply than demand.
+
+    Parameters: S: int -> source count
+                D: int -> destination count
+                seed: int
+
+    Returns: (costs, supply, demand)
+    """
+
+    rng = np.random.RandomState(seed)
+
+    costs = rng.randint(1, 100, size=(S, D)).astype(float)
+    supply = rng.randint(10, 100, size=S).astype(float)
+    demand = rng.randint(10, 100, size=D).astype(float)
+
+    return costs, supply, demand * 0.9 * supply.sum() / demand.sum()
+
+
+def transportation_lp(costs, supply, demand):
+    """
+    The S * D variable LP of a transportation problem, a <= row per
+    source and a >= row per destination.
+
+    Parameters: costs: np.ndarray((S, D))
+                supply: np.ndarray(S)
+                demand: np.ndarray(D)
+
+    Returns: (obj, constraints, senses, rhs)
+    """
+
+    S, D = costs.shape
+
+    rows = np.vstack([np.kron(np.eye(S), np.ones(D)), np.kron(np.ones(S), np.eye(D))])
+
+    return list(costs.ravel()), rows.tolist(), ['<='] * S + ['>='] * D, list(supply) + list(demand)
+
+
+def solve_once(problem, upper=None, **kwargs):
+    """
+    Solves a generated problem and measures wall time.
+
+    Parameters: problem: tuple -> output of random_lp
+                upper: list[float] -> variable upper bounds
+                kwargs: LpProblem arguments
+
+    Returns: (seconds, LpProblem)
+    """
+
+    obj, constraints, senses, rhs = problem
+
+    start = time.perf_counter()
+
+    lp = LpProblem(**kwargs)
+    lp.objective(list(obj))
+    lp.constraints(constraints if sp.issparse(constraints) else [list(row) for row in constraints])
+    lp.constraint_senses(list(senses))
+    if upper is not None:
+        lp.bounds(upper=list(upper))
+    lp.rhs(list(rhs))
+    lp._tableau_format()
+    lp.solve()
+
+    return time.perf_counter() - start, lp
+
+
+def large_sparse_lp(m, n, per_row, seed=0):
+    """
+    Generates a large sparse max problem with `per_row` nonzeros in every
+    <= row, without the dense sampling of random_sparse_lp.
+
+    Parameters: m: int -> constraint count
+                n: int -> variable count
+                per_row: int -> nonzeros per row
+                seed: int
+
+    Returns: (obj, constraints, senses, rhs), constraints is a CSR matrix
+    """
+
+    rng = np.random.RandomState(seed)
+
+    rows = np.repeat(np.arange(m), per_row)
+    cols = rng.randint(0, n, size=m * per_row)
+    cols[:n] = np.arange(n) % n
+    A = sp.csr_matrix((rng.randint(1, 10, size=m * per_row).astype(float), (rows, cols)), shape=(m, n))
+
+    obj = rng.randint(1, 20, size=n).astype(float)
+    rhs = rng.randint(50, 100, size=m).astype(float)
+
+    return list(obj), A, ['<='] * m, list(rhs)
+
+
+def write_mps(path, problem):
+    """
+    Writes a sparse problem as a free MPS file, one entry per line.
+
+    Parameters: path: str
+                problem: tuple -> output of large_sparse_lp
+
+    Returns: None
+    """
+
+    obj, A, senses, rhs = problem
+    A = A.tocsc()
+    codes = {'<=': 'L', '>=': 'G', '==': 'E'}
+
+    with open(path, 'w') as file:
+        file.write('NAME RANDOM\nOBJSENSE\n    MAX\nROWS\n N obj\n')
+        file.writelines(' {} r{}\n'.format(codes[sense], i) for i, sense in enumerate(senses))
+        file.write('COLUMNS\n')
+
+        for j in range(A.shape[1]):
+            file.write('    x{} obj {}\n'.format(j, obj[j]))
+            file.writelines('    x{} r{} {}\n'.format(j, i, value)
+                            for i, value in zip(A.indices[A.indptr[j]:A.indptr[j + 1]], A.data[A.indptr[j]:A.indptr[j + 1]]))
+
+        file.write('RHS\n')
+        file.writelines('    rhs r{} {}\n'.format(i, value) for i, value in enumerate(rhs))
+        file.write('ENDATA\n')
+
+
+def write_lp(path, problem):
+    """
+    Writes a sparse problem as a CPLEX LP file, one row per line.
+
+    Parameters: path: str
+                problem: tuple -> output of large_sparse_lp
+
+    Returns: None
+    """
+
+    obj, A, senses, rhs = problem
+    A = A.tocsr()
+
+    with open(path, 'w') as file:
+        file.write('Maximize\n obj: ' + ' + '.join('{} x{}'.format(c, j) for j, c in enumerate(obj)) + '\n')
+        file.write('Subject To\n')
+
+        for i in range(A.shape[0]):
+            columns, values = A.indices[A.indptr[i]:A.indptr[i + 1]], A.data[A.indptr[i]:A.indptr[i + 1]]
+            file.write(' r{}: '.format(i) + ' + '.join('{} x{}'.format(value, j) for j, value in zip(columns, values)))
+            file.write(' {} {}\n'.format(senses[i], rhs[i]))
+
+        file.write('End\n')
+
+
+def bench_factorization(sizes, refactor_every):
+    print("{:>6} {:>10} {:>10} {:>8} {:>14}".format('m', 'path', 'seconds', 'iters', 'Z'))
+
+    for m in sizes:
+        problem = random_lp(m, m)
+
+        for name, kwargs in [('explicit', {'factorization': 'explicit'}),
+                             ('lu', {'factorization': 'lu', 'refactor_every': refactor_every})]:
+            seconds, lp = solve_once(problem, **kwargs)
+            print("{:>6} {:>10} {:>10.3f} {:>8} {:>14.4f}".format(m, name, seconds, lp.iterations, lp.Z))
+
+
+def bench_sparse(size, density, dense_max):
+    print("{:>6} {:>8} {:>8} {:>10} {:>10} {:>8} {:>14}".format(
+        'm=n', 'density', 'storage', 'seconds', 'peak MB', 'iters', 'Z'))
+
+    problem = random_sparse_lp(size, size, density)
+
+    runs = [('sparse', problem)]
+
+    # dense storage needs (m+1) x (n+m+1) floats, skip it for large sizes
+    if size <= dense_max:
+        obj, A, senses, rhs = problem
+        runs.append(('dense', (obj, A.toarray().tolist(), senses, rhs)))
+
+    for storage, p in runs:
+        tracemalloc.start()
+        seconds, lp = solve_once(p, storage=storage, factorization='lu')
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+        print("{:>6} {:>8} {:>8} {:>10.3f} {:>10.1f} {:>8} {:>14.4f}".format(
+            size, density, storage, seconds, peak, lp.iterations, lp.Z))
+
+
+def bench_batch(count, m, n):
+    print("{:>6} {:>6} {:>10} {:>10} {:>10}".format('K', 'm x n', 'loop s', 'batch s', 'speedup'))
+
+    problems = [random_lp(m, n, seed=seed) for seed in range(count)]
+
+    start = time.perf_counter()
+    looped = [solve_once(problem)[1].Z for problem in problems]
+    loop_seconds = time.perf_counter() - start
+
+    objs = np.array([p[0] for p in problems])
+    constraints = np.array([p[1] for p in problems])
+    rhs = np.array([p[3] for p in problems])
+
+    start = time.perf_counter()
+    batch = solve_many(objs, constraints, problems[0][2], rhs)
+    batch_seconds = time.perf_counter() - start
+
+    assert np.allclose(batch.Z, looped)
+
+    print("{:>6} {:>6} {:>10.3f} {:>10.3f} {:>9.1f}x".format(
+        count, '{}x{}'.format(m, n), loop_seconds, batch_seconds, loop_seconds / batch_seconds))
+
+
+def bench_dual(sizes):
+    print("{:>6} {:>24} {:>10} {:>8} {:>14}".format('m=n', 'path', 'seconds', 'iters', 'Z'))
+
+    for m in sizes:
+        obj, constraints, senses, rhs = random_covering_lp(m, m)
+
+        runs = [
+            ('min, transposed primal', (obj, constraints, senses, rhs), {'sense': 'min', 'method': 'primal'}),
+            ('max -c, two phase', ([-c for c in obj], constraints, senses, rhs), {'sense': 'max', 'method': 'primal'}),
+            ('min, dual simplex', (obj, constraints, senses, rhs), {'sense': 'min', 'method': 'dual'}),
+        ]
+
+        for name, problem, kwargs in runs:
+            seconds, lp = solve_once(problem, **kwargs)
+            print("{:>6} {:>24} {:>10.3f} {:>8} {:>14.4f}".format(m, name, seconds, lp.iterations, abs(lp.Z)))
+
+
+def bench_pricing(sizes, seeds):
+    print("{:>6} {:>10} {:>10} {:>8} {:>14}".format('m', 'pricing', 'seconds', 'iters', 'Z'))
+
+    for m in sizes:
+        # fixed corpus, every rule solves the same problems
+        problems = [random_lp(m, 2 * m, seed=seed) for seed in range(seeds)]
+
+        for pricing in ['dantzig', 'partial', 'multiple', 'devex', 'steepest']:
+            seconds, iterations, Z = 0, 0, 0
+
+            for problem in problems:
+                s, lp = solve_once(problem, pricing=pricing, factorization='lu')
+                seconds += s
+                iterations += lp.iterations
+                Z += lp.Z
+
+            print("{:>6} {:>10} {:>10.3f} {:>8} {:>14.4f}".format(m, pricing, seconds, iterations, Z))
+
+
+def bench_bounds(sizes):
+    print("{:>6} {:>12} {:>6} {:>10} {:>8} {:>14}".format('m=n', 'upper bounds', 'rows', 'seconds', 'iters', 'Z'))
+
+    for m in sizes:
+        obj, constraints, senses, rhs = random_lp(m, m)
+        upper = np.random.RandomState(m).randint(1, 10, size=m).astype(float)
+
+        # x_j <= u_j as rows, m grows to 2m
+        rows = (obj, constraints + np.eye(m).tolist(), senses + ['<='] * m, rhs + list(upper))
+
+        for name, problem, kwargs in [('rows', rows, {}), ('native', (obj, constraints, senses, rhs), {'upper': upper})]:
+            seconds, lp = solve_once(problem, **kwargs)
+            print("{:>6} {:>12} {:>6} {:>10.3f} {:>8} {:>14.4f}".format(m, name, lp.m, seconds, lp.iterations, lp.Z))
+
+
+def bench_presolve(sizes):
+    print("{:>6} {:>9} {:>12} {:>10} {:>8} {:>14}".format('m', 'presolve', 'rows', 'seconds', 'iters', 'Z'))
+
+    for m in sizes:
+        problem = random_redundant_lp(m, m)
+
+        for flag in [False, True]:
+            seconds, lp = solve_once(problem, presolve=flag)
+            rows = '{} -> {}'.format(*lp.presolved.statistics()['rows']) if flag else str(lp.m)
+            print("{:>6} {:>9} {:>12} {:>10.3f} {:>8} {:>14.4f}".format(m, str(flag), rows, seconds, lp.iterations, lp.Z))
+
+
+def bench_scaling(sizes, magnitude):
+    print("{:>6} {:>14} {:>10} {:>8} {:>12} {:>12}".format('m=n', 'scaling', 'seconds', 'iters', 'status', 'violation'))
+
+    for m in sizes:
+        obj, constraints, senses, rhs = badly_scaled_lp(m, m, magnitude)
+        A, b = np.array(constraints), np.array(rhs)
+
+        for scaling in [None, 'equilibration', 'geometric']:
+            seconds, lp = solve_once((obj, constraints, senses, rhs), scaling=scaling, factorization='lu')
+
+            # largest relative row violation of the returned point
+            x = np.array(lp.solution[:m], dtype=float)
+            violation = np.max(np.maximum(A.dot(x) - b, 0) / np.abs(b))
+
+            print("{:>6} {:>14} {:>10.3f} {:>8} {:>12} {:>12.2e}".format(
+                m, str(scaling), seconds, lp.iterations, lp.status, violation))
+
+
+def bench_read(sizes, per_row, solve_max):
+    print("{:>7} {:>8} {:>6} {:>10} {:>10} {:>8} {:>10} {:>14}".format(
+        'm=n', 'nnz', 'format', 'file MB', 'seconds', 'MB/s', 'peak MB', 'Z'))
+
+    directory = tempfile.mkdtemp()
+
+    for m in sizes:
+        problem = large_sparse_lp(m, m, per_row)
+
+        for format, write in [('mps', write_mps), ('lp', write_lp)]:
+            path = os.path.join(directory, 'random.' + format)
+            write(path, problem)
+            size = os.path.getsize(path) / 2 ** 20
+
+            start = time.perf_counter()
+            model = read_model(path)
+            seconds = time.perf_counter() - start
+
+            # tracemalloc slows reading down, memory is measured in a 2nd read
+            tracemalloc.start()
+            read_model(path)
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+
+            Z = float('nan')
+
+            if m <= solve_max:
+                Z = solve_once((model.obj.tolist(), model.A, model.senses, model.rhs.tolist()), factorization='lu')[1].Z
+
+            print("{:>7} {:>8} {:>6} {:>10.1f} {:>10.3f} {:>8.1f} {:>10.1f} {:>14.4f}".format(
+                m, model.nonzeros, format, size, seconds, size / seconds, peak, Z))
+            os.remove(path)
+
+    os.rmdir(directory)
+
+
+def bench_memmap(sizes, work_dir):
+    print("{:>6} {:>8} {:>10} {:>10} {:>12} {:>8} {:>14}".format(
+        'm=n', 'storage', 'seconds', 'peak MB', 'tableau MB', 'iters', 'Z'))
+
+    for m in sizes:
+        problem = random_covering_lp(m, m)
+
+        # memmap pages are file backed and not counted by tracemalloc, only heap allocations are
+        for storage in ['dense', 'memmap']:
+            tracemalloc.start()
+            seconds, lp = solve_once(problem, storage=storage, factorization='lu', work_dir=work_dir)
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+
+            print("{:>6} {:>8} {:>10.3f} {:>10.1f} {:>12.1f} {:>8} {:>14.4f}".format(
+                m, storage, seconds, peak, lp.tableau.nbytes / 2 ** 20, lp.iterations, lp.Z))
+
+
+def copy_insert_artificials(tableau, n, senses):
+    """
+    The former two phase setup, kept to compare against: one np.hstack
+    per '==' row and two per '>=' row, every one copying the tableau.
+
+    Returns: np.ndarray
+    """
+
+    m = len(senses)
+
+    for i, sense in enumerate(senses):
+        if sense == '>=':
+            col = np.zeros((m + 1, 1))
+            col[i + 1] = -1
+            tableau = np.hstack((tableau[:, :n], col, tableau[:, n:]))
+            n += 1
+
+        if sense in ('>=', '=='):
+            col = np.zeros((m + 1, 1))
+            col[0] = 1
+            col[i + 1] = 1
+            tableau = np.hstack((tableau[:, :n + i], col, tableau[:, n + i + 1:]))
+
+    return tableau
+
+
+def bench_artificials(sizes):
+    print("{:>6} {:>12} {:>10} {:>10}".format('m=n', 'setup', 'seconds', 'peak MB'))
+
+    for m in sizes:
+        obj, constraints, senses, rhs = random_covering_lp(m, m)
+
+        for name in ['layout', 'copy-insert']:
+            lp = LpProblem('max', storage='dense')
+            lp.objective(list(obj))
+            lp.constraints([list(row) for row in constraints])
+            lp.constraint_senses(list(senses))
+            lp.rhs(list(rhs))
+
+            tracemalloc.start()
+            start = time.perf_counter()
+
+            if name == 'layout':
+                lp._tableau_format()
+                lp._add_artificials()
+            else:
+                tableau = np.hstack((np.array([list(obj)] + constraints, dtype=float),
+                                     np.vstack((np.zeros(m), np.eye(m))),
+                                     np.array([0.0] + list(rhs))[:, np.newaxis]))
+                copy_insert_artificials(tableau, m, senses)
+
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+
+            print("{:>6} {:>12} {:>10.3f} {:>10.1f}".format(m, name, seconds, peak))
+
+
+def bench_degenerate(sizes):
+    print("{:>8} {:>13} {:>10} {:>8} {:>16} {:>14}".format('m=n', 'anti_cycling', 'seconds', 'iters', 'status', 'Z'))
+
+    problems = [('beale', BEALE)] + [(str(m), degenerate_lp(m, m)) for m in sizes]
+
+    for name, problem in problems:
+        # without anti cycling only max_iterations stops a cycle
+        for anti_cycling in [True, False]:
+            seconds, lp = solve_once(problem, anti_cycling=anti_cycling, factorization='lu')
+            print("{:>8} {:>13} {:>10.3f} {:>8} {:>16} {:>14.4f}".format(
+                name, str(anti_cycling), seconds, lp.iterations, lp.status, lp.Z))
+
+
+def bench_scenarios(size, count, spread, workers):
+    print("{:>9} {:>16} {:>10} {:>10} {:>10}".format('problem', 'mode', 'seconds', 'iters', 'speedup'))
+
+    rng = np.random.RandomState(1)
+
+    for name, sense, problem in [('packing', 'max', random_lp(size, size)),
+                                 ('covering', 'min', random_covering_lp(size, size))]:
+        obj, constraints, senses, rhs = problem
+        scenarios = []
+
+        # rhs moves by up to spread, every other scenario also moves the costs
+        for k in range(count):
+            scenario = {'rhs': list(np.array(rhs) * rng.uniform(1 - spread, 1 + spread, size=size))}
+            if k % 2:
+                scenario['objective'] = list(np.array(obj) * rng.uniform(1 - spread, 1 + spread, size=size))
+            scenarios.append(scenario)
+
+        start = time.perf_counter()
+        cold = [solve_once((scenario.get('objective', obj), constraints, senses, scenario['rhs']),
+                           sense=sense, factorization='lu')[1]
+                for scenario in scenarios]
+        cold_seconds = time.perf_counter() - start
+
+        print("{:>9} {:>16} {:>10.3f} {:>10} {:>10}".format(
+            name, 'cold', cold_seconds, sum(lp.iterations for lp in cold), '1.0x'))
+
+        for label, count_workers in [('warm', 1), ('warm {} workers'.format(workers), workers)]:
+            start = time.perf_counter()
+            _, base = solve_once(problem, sense=sense, factorization='lu')
+            results = sweep(base, scenarios, count_workers)
+            seconds = time.perf_counter() - start
+
+            assert np.allclose([result['Z'] for result in results], [lp.Z for lp in cold])
+
+            print("{:>9} {:>16} {:>10.3f} {:>10} {:>9.1f}x".format(
+                name, label, seconds, base.iterations + sum(result['iterations'] for result in results),
+                cold_seconds / seconds))
+
+
+def bench_transportation(sizes, lp_max):
+    print("{:>6} {:>16} {:>10} {:>8} {:>16} {:>14}".format('S=D', 'method', 'seconds', 'iters', 'status', 'Z'))
+
+    for size in sizes:
+        costs, supply, demand = random_transportation(size, size)
+
+        for initial in ['vogel', 'least-cost', 'northwest']:
+            start = time.perf_counter()
+            problem = solve_transportation(costs, supply, demand, initial=initial)
+            seconds = time.perf_counter() - start
+
+            print("{:>6} {:>16} {:>10.3f} {:>8} {:>16} {:>14.4f}".format(
+                size, initial, seconds, problem.iterations, problem.status, problem.Z))
+
+        # the same problem as a S * D variable LP
+        if size <= lp_max:
+            seconds, lp = solve_once(transportation_lp(costs, supply, demand), sense='min', factorization='lu')
+            print("{:>6} {:>16} {:>10.3f} {:>8} {:>16} {:>14.4f}".format(
+                size, 'LpProblem', seconds, lp.iterations, lp.status, lp.Z))
+
+
+def bench_assignment(sizes, lp_max, count, batch_size):
+    print("{:>6} {:>16} {:>10} {:>16} {:>14}".format('n', 'method', 'seconds', 'status', 'Z'))
+
+    rng = np.random.RandomState(0)
+
+    for n in sizes:
+        costs = rng.randint(1, 1000, size=(n, n)).astype(float)
+
+        start = time.perf_counter()
+        problem = solve_assignment(costs)
+        seconds = time.perf_counter() - start
+        print("{:>6} {:>16} {:>10.3f} {:>16} {:>14.4f}".format(n, 'hungarian', seconds, problem.status, problem.Z))
+
+        start = time.perf_counter()
+        rows, columns = linear_sum_assignment(costs)
+        seconds = time.perf_counter() - start
+        print("{:>6} {:>16} {:>10.3f} {:>16} {:>14.4f}".format(n, 'scipy', seconds, 'Optimal',
+                                                              costs[rows, columns].sum()))
+
+        # the same problem as a n * n variable LP, every row and column sums to 1
+        if n <= lp_max:
+            seconds, lp = solve_once(transportation_lp(costs, np.ones(n), np.ones(n)), sense='min',
+                                     factorization='lu')
+            print("{:>6} {:>16} {:>10.3f} {:>16} {:>14.4f}".format(n, 'LpProblem', seconds, lp.status, lp.Z))
+
+    print()
+    print("{:>6} {:>6} {:>16} {:>10}".format('K', 'n', 'method', 'seconds'))
+
+    costs = rng.rand(count, batch_size, batch_size)
+
+    start = time.perf_counter()
+    looped = [solve_assignment(matrix).Z for matrix in costs]
+    print("{:>6} {:>6} {:>16} {:>10.3f}".format(count, batch_size, 'loop', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    batch = solve_assignments(costs)
+    print("{:>6} {:>6} {:>16} {:>10.3f}".format(count, batch_size, 'batch', time.perf_counter() - start))
+
+    assert np.allclose(batch.Z, looped)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks for LpProblem.')
+    subparsers = parser.add_subparsers(dest='bench')
+
+    factorization = subparsers.add_parser('factorization', help='explicit B inverse vs LU + eta file')
+    factorization.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 2000])
+    factorization.add_argument('--refactor-every', type=int, default=50)
+
+    sparse = subparsers.add_parser('sparse', help='CSC tableau vs dense tableau memory and time')
+    sparse.add_argument('--size', type=int, default=10000)
+    sparse.add_argument('--density', type=float, default=0.001)
+    sparse.add_argument('--dense-max', type=int, default=2000)
+
+    batch = subparsers.add_parser('batch', help='looping LpProblem.solve vs solve_many')
+    batch.add_argument('--count', type=int, default=5000)
+    batch.add_argument('--m', type=int, default=10)
+    batch.add_argument('--n', type=int, default=10)
+
+    dual = subparsers.add_parser('dual', help='primal two phase vs dual simplex on >= min problems')
+    dual.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200])
+
+    pricing = subparsers.add_parser('pricing', help='entering variable rules on a fixed corpus')
+    pricing.add_argument('--sizes', type=int, nargs='+', default=[50, 200, 500])
+    pricing.add_argument('--seeds', type=int, default=5)
+
+    bounds = subparsers.add_parser('bounds', help='upper bounds as rows vs bounded simplex')
+    bounds.add_argument('--sizes', type=int, nargs='+', default=[100, 300, 500])
+
+    presolve = subparsers.add_parser('presolve', help='rows removed by presolve and solve time')
+    presolve.add_argument('--sizes', type=int, nargs='+', default=[100, 300, 500])
+
+    scaling = subparsers.add_parser('scaling', help='no scaling vs equilibration vs geometric on badly scaled problems')
+    scaling.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200])
+    scaling.add_argument('--magnitude', type=int, default=4)
+
+    degenerate = subparsers.add_parser('degenerate', help="Bland's rule fallback on degenerate problems")
+    degenerate.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200])
+
+    read = subparsers.add_parser('read', help='MPS and LP file reading speed and memory')
+    read.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    read.add_argument('--per-row', type=int, default=10)
+    read.add_argument('--solve-max', type=int, default=1000, help='largest size that is also solved')
+
+    memmap = subparsers.add_parser('memmap', help='in memory vs memory-mapped tableau on >= min problems')
+    memmap.add_argument('--sizes', type=int, nargs='+', default=[100, 200, 300])
+    memmap.add_argument('--work-dir', default=None, help='directory of the tableau files')
+
+    artificials = subparsers.add_parser('artificials', help='two phase setup with artificial masks vs copy-insert')
+    artificials.add_argument('--sizes', type=int, nargs='+', default=[250, 500, 1000])
+
+    scenarios = subparsers.add_parser('scenarios', help='cold solves vs warm started scenario sweep')
+    scenarios.add_argument('--size', type=int, default=50)
+    scenarios.add_argument('--count', type=int, default=1000)
+    scenarios.add_argument('--spread', type=float, default=0.05, help='largest relative change of rhs and costs')
+    scenarios.add_argument('--workers', type=int, default=4)
+
+    transportation = subparsers.add_parser('transportation', help='Vogel + MODI vs the transportation LP')
+    transportation.add_argument('--sizes', type=int, nargs='+', default=[100, 200, 500])
+    transportation.add_argument('--lp-max', type=int, default=30, help='largest size that is also solved as a LP')
+
+    assignment = subparsers.add_parser('assignment', help='Hungarian vs scipy and the assignment LP, batch vs loop')
+    assignment.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1000, 2000])
+    assignment.add_argument('--lp-max', type=int, default=30, help='largest size that is also solved as a LP')
+    assignment.add_argument('--count', type=int, default=10000, help='matrices of the batch')
+    assignment.add_argument('--batch-size', type=int, default=10, help='n of the batch matrices')
+
+    args = parser.parse_args()
+
+    if args.bench == 'factorization':
+        bench_factorization(args.sizes, args.refactor_every)
+    elif args.bench == 'sparse':
+        bench_sparse(args.size, args.density, args.dense_max)
+    elif args.bench == 'batch':
+        bench_batch(args.count, args.m, args.n)
+    elif args.bench == 'dual':
+        bench_dual(args.sizes)
+    elif args.bench == 'pricing':
+        bench_pricing(args.sizes, args.seeds)
+    elif args.bench == 'bounds':
+        bench_bounds(args.sizes)
+    elif args.bench == 'presolve':
+        bench_presolve(args.sizes)
+    elif args.bench == 'scaling':
+        bench_scaling(args.sizes, args.magnitude)
+    elif args.bench == 'degenerate':
+        bench_degenerate(args.sizes)
+    elif args.bench == 'read':
+        bench_read(args.sizes, args.per_row, args.solve_max)
+    elif args.bench == 'memmap':
+        bench_memmap(args.sizes, args.work_dir)
+    elif args.bench == 'artificials':
+        bench_artificials(args.sizes)
+    elif args.bench == 'scenarios':
+        bench_scenarios(args.size, args.count, args.spread, args.workers)
+    elif args.bench == 'transportation':
+        bench_transportation(args.sizes, args.lp_max)
+    elif args.bench == 'assignment':
+        bench_assignment(args.sizes, args.lp_max, args.count, args.batch_size)
+    else:
+        parser.print_help()
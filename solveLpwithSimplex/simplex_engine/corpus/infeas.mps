@@ -0,0 +1,16 @@
+NAME          INFEAS
+* x + 2y >= 4 cannot be met with x + y <= 1 and y <= 1
+ROWS
+ N  COST
+ L  CAP
+ G  NEED
+COLUMNS
+    X         COST           1.0   CAP            1.0
+    X         NEED           1.0
+    Y         COST           1.0   CAP            1.0
+    Y         NEED           2.0
+RHS
+    RHS       CAP            1.0   NEED           4.0
+BOUNDS
+ UP BND       Y              1.0
+ENDATA
@@ -0,0 +1,28 @@
+NAME          KLEEMIN5
+* Klee-Minty cube in 5 dimensions, Dantzig's rule visits all 32 vertices
+OBJSENSE
+    MAX
+ROWS
+ N  OBJ
+ L  R1
+ L  R2
+ L  R3
+ L  R4
+ L  R5
+COLUMNS
+    X1        OBJ        10000.0   R1             1.0
+    X1        R2            20.0   R3           200.0
+    X1        R4          2000.0   R5         20000.0
+    X2        OBJ         1000.0   R2             1.0
+    X2        R3            20.0   R4           200.0
+    X2        R5          2000.0
+    X3        OBJ          100.0   R3             1.0
+    X3        R4            20.0   R5           200.0
+    X4        OBJ           10.0   R4             1.0
+    X4        R5            20.0
+    X5        OBJ            1.0   R5             1.0
+RHS
+    RHS       R1             1.0   R2           100.0
+    RHS       R3         10000.0   R4       1000000.0
+    RHS       R5     100000000.0
+ENDATA
@@ -0,0 +1,26 @@
+NAME          PRODUCT
+* three products sharing a fixed material budget, labor hours in a range
+OBJSENSE
+    MAX
+ROWS
+ N  PROFIT
+ L  LABOR
+ E  MATERIAL
+ L  MACHINE
+COLUMNS
+    A         PROFIT        20.0   LABOR          2.0
+    A         MATERIAL       1.0   MACHINE        3.0
+    B         PROFIT        30.0   LABOR          3.0
+    B         MATERIAL       1.0   MACHINE        1.0
+    C         PROFIT        25.0   LABOR          2.0
+    C         MATERIAL       1.0   MACHINE        2.0
+RHS
+    RHS       LABOR        100.0   MATERIAL      40.0
+    RHS       MACHINE       90.0
+RANGES
+    RNG       LABOR         40.0
+BOUNDS
+ LO BND       A              5.0
+ UP BND       B             20.0
+ UP BND       C             15.0
+ENDATA
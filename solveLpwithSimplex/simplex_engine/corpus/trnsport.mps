@@ -0,0 +1,27 @@
+NAME          TRNSPORT
+* Dantzig's cannery transportation problem, cost in thousands of dollars
+ROWS
+ N  COST
+ L  SEATTLE
+ L  SANDIEGO
+ G  NEWYORK
+ G  CHICAGO
+ G  TOPEKA
+COLUMNS
+    SEA.NY    COST         0.225   SEATTLE        1.0
+    SEA.NY    NEWYORK        1.0
+    SEA.CHI   COST         0.153   SEATTLE        1.0
+    SEA.CHI   CHICAGO        1.0
+    SEA.TOP   COST         0.162   SEATTLE        1.0
+    SEA.TOP   TOPEKA         1.0
+    SD.NY     COST         0.225   SANDIEGO       1.0
+    SD.NY     NEWYORK        1.0
+    SD.CHI    COST         0.162   SANDIEGO       1.0
+    SD.CHI    CHICAGO        1.0
+    SD.TOP    COST         0.126   SANDIEGO       1.0
+    SD.TOP    TOPEKA         1.0
+RHS
+    RHS       SEATTLE      350.0   SANDIEGO     600.0
+    RHS       NEWYORK      325.0   CHICAGO      300.0
+    RHS       TOPEKA       275.0
+ENDATA
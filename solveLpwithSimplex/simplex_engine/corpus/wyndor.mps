@@ -0,0 +1,18 @@
+NAME          WYNDOR
+* Wyndor Glass Co. product mix, Hillier and Lieberman
+OBJSENSE
+    MAX
+ROWS
+ N  PROFIT
+ L  PLANT1
+ L  PLANT2
+ L  PLANT3
+COLUMNS
+    DOORS     PROFIT         3.0   PLANT1         1.0
+    DOORS     PLANT3         3.0
+    WINDOWS   PROFIT         5.0   PLANT2         2.0
+    WINDOWS   PLANT3         2.0
+RHS
+    RHS       PLANT1         4.0   PLANT2        12.0
+    RHS       PLANT3        18.0
+ENDATA
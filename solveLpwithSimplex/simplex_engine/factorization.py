@@ -0,0 +1,208 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import splu
+
+
+class ExplicitInverse():
+    """
+    Keeps a dense B inverse and updates it with E * B_inv products.
+
+    This is the original path of LpProblem._simplex, every update costs O(m^3).
+    """
+
+    def __init__(self, refactor_every=None):
+        self.refactor_every = refactor_every
+        self.refactorizations = 0
+        self.updates = 0
+
+    def factorize(self, B):
+        """
+        Computes B inverse from basis columns.
+
+        Parameters: B: np.ndarray((m, m), dtype='float')
+
+        Returns: None
+        """
+
+        if sp.issparse(B):
+            B = B.toarray()
+
+        self.m = B.shape[0]
+        self.B_inv = np.linalg.inv(B)
+        self.updates = 0
+        self.refactorizations += 1
+
+    def ftran(self, a):
+        """
+        Solves B x = a.
+
+        Parameters: a: np.ndarray(m) or np.ndarray((m, k))
+
+        Returns: np.ndarray
+        """
+
+        return np.dot(self.B_inv, a)
+
+    def btran(self, c):
+        """
+        Solves y B = c.
+
+        Parameters: c: np.ndarray(m)
+
+        Returns: np.ndarray(m)
+        """
+
+        return np.dot(c, self.B_inv)
+
+    def update(self, pivot_row, alpha):
+        """
+        Replaces basis column at pivot_row with entering column.
+
+        Parameters: pivot_row: int
+                    alpha: np.ndarray(m) -> B_inv * entering column
+
+        Returns: None
+        """
+
+        # find n to create E
+        n = alpha * -(1 / alpha[pivot_row])
+
+        # set pivot element positive value
+        n[pivot_row] = 1 / alpha[pivot_row]
+
+        # create identity matrix for E
+        E = np.eye(self.m)
+        E[:, pivot_row] = n
+
+        self.B_inv = np.dot(E, self.B_inv)
+        self.updates += 1
+
+    def needs_refactor(self):
+        return self.refactor_every is not None and self.updates >= self.refactor_every
+
+    def inverse(self):
+        return self.B_inv
+
+
+class ProductFormLU():
+    """
+    LU factorization of the starting basis followed by an eta file.
+
+    Every pivot appends one sparse eta column instead of touching B inverse,
+    so an update costs O(nnz(eta)) and ftran/btran cost one LU solve plus
+    O(sum of eta nnz). The eta file is dropped and B is factorized again
+    every `refactor_every` updates.
+    """
+
+    def __init__(self, refactor_every=50):
+        self.refactor_every = refactor_every
+        self.refactorizations = 0
+        self.updates = 0
+
+    def factorize(self, B):
+        """
+        LU factorizes basis columns and clears the eta file.
+        Sparse bases are factorized with SuperLU.
+
+        Parameters: B: np.ndarray((m, m), dtype='float') or scipy.sparse matrix
+
+        Returns: None
+        """
+
+        self.m = B.shape[0]
+
+        if sp.issparse(B):
+            self.lu = splu(sp.csc_matrix(B))
+        else:
+            self.lu = lu_factor(B)
+        self.etas = []
+        self.updates = 0
+        self.refactorizations += 1
+
+    def ftran(self, a):
+        """
+        Solves B x = a as E_k ... E_1 (LU)^-1 a.
+
+        Parameters: a: np.ndarray(m) or np.ndarray((m, k))
+
+        Returns: np.ndarray
+        """
+
+        x = self._solve(a)
+
+        for r, eta_r, idx, vals in self.etas:
+            x_r = x[r].copy() if x.ndim > 1 else x[r]
+            x[idx] += np.outer(vals, x_r) if x.ndim > 1 else vals * x_r
+            x[r] = eta_r * x_r
+
+        return x
+
+    def btran(self, c):
+        """
+        Solves y B = c as c E_k ... E_1 (LU)^-1.
+
+        Parameters: c: np.ndarray(m)
+
+        Returns: np.ndarray(m)
+        """
+
+        y = np.array(c, dtype=float)
+
+        for r, eta_r, idx, vals in reversed(self.etas):
+            y[r] = y[r] * eta_r + np.dot(y[idx], vals)
+
+        return self._solve(y, trans=1)
+
+    def _solve(self, a, trans=0):
+        if isinstance(self.lu, tuple):
+            return lu_solve(self.lu, a, trans=trans)
+        return self.lu.solve(np.array(a, dtype=float), trans='T' if trans else 'N')
+
+    def update(self, pivot_row, alpha):
+        """
+        Appends the eta column of the pivot to the eta file.
+
+        Parameters: pivot_row: int
+                    alpha: np.ndarray(m) -> B_inv * entering column
+
+        Returns: None
+        """
+
+        eta = alpha * -(1 / alpha[pivot_row])
+        eta[pivot_row] = 0
+
+        idx = np.nonzero(eta)[0]
+        self.etas.append((pivot_row, 1 / alpha[pivot_row], idx, eta[idx]))
+        self.updates += 1
+
+    def needs_refactor(self):
+        return self.refactor_every is not None and self.updates >= self.refactor_every
+
+    def inverse(self):
+        return self.ftran(np.eye(self.m))
+
+
+FACTORIZATIONS = {
+    'explicit': ExplicitInverse,
+    'lu': ProductFormLU,
+}
+
+
+def make_factorization(name, refactor_every=None):
+    """
+    Creates a basis factorization by name.
+
+    Parameters: name: str -> could be ['explicit', 'lu']
+                refactor_every: int
+
+    Returns: ExplicitInverse or ProductFormLU
+    """
+
+    if name not in FACTORIZATIONS:
+        raise ValueError("Unknown factorization: {}".format(name))
+
+    if refactor_every is None:
+        return FACTORIZATIONS[name]()
+
+    return FACTORIZATIONS[name](refactor_every=refactor_every)
@@ -0,0 +1,468 @@
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+
+# bounds closer than this are equal, rows violated by less than this are satisfied
+PRESOLVE_TOL = 1e-9
+
+# coefficients below this are not used to derive bounds
+COEFFICIENT_TOL = 1e-7
+
+# a derived bound has to improve the current one by this much (relative)
+BOUND_IMPROVEMENT = 1e-6
+
+# passes over all reductions before giving up on a fixpoint
+MAX_PASSES = 10
+
+REDUCTIONS = ['empty rows', 'singleton rows', 'fixed columns', 'parallel rows',
+              'dominated columns', 'bound tightening']
+
+
+class Presolve():
+    """
+    Reduces a lp problem before the tableau is built and maps the reduced
+    solution back with postsolve. The problem is plain data, so it can be
+    used ahead of LpProblem or PuLP.
+
+    Rows are never rewritten, only removed or given a new sense and rhs,
+    columns are removed by fixing them at a value.
+    """
+
+    def __init__(self, obj, constraints, senses, rhs, lower=None, upper=None, sense='max'):
+        """
+        Parameters: obj: list[float] len: n
+                    constraints: list[list[float]] or scipy.sparse matrix (m, n)
+                    senses: list[str] -> could be ['<=', '>=', '==']
+                    rhs: list[float] len: m
+                    lower: list[float] len: n, defaults to 0
+                    upper: list[float] len: n, None or inf entries are unbounded
+                    sense: str -> could be ['max', 'min']
+
+        Returns: None
+        """
+
+        self.obj = np.array(obj, dtype=float)
+
+        # csr_matrix([]) would be (1, 0), a problem without rows is (0, n)
+        if not sp.issparse(constraints):
+            constraints = np.reshape(np.array(constraints, dtype=float), (len(rhs), len(self.obj)))
+
+        self.A = sp.csr_matrix(constraints, dtype=float)
+        self.A.sum_duplicates()
+        self.A_csc = self.A.tocsc()
+        self.senses = ['==' if s == '=' else s for s in senses]
+        self.b = np.array(rhs, dtype=float)
+        self.sense = sense
+
+        self.m, self.n = self.A.shape
+
+        self.lower = np.zeros(self.n) if lower is None else np.array(lower, dtype=float)
+        upper = [np.inf] * self.n if upper is None else upper
+        self.upper = np.array([np.inf if u is None else u for u in upper], dtype=float)
+
+        self.rows = np.ones(self.m, dtype=bool)
+        self.columns = np.ones(self.n, dtype=bool)
+        self.values = np.zeros(self.n)
+
+        self.status = "Reduced"
+        self.stats = OrderedDict((name, {'rows': 0, 'columns': 0, 'bounds': 0}) for name in REDUCTIONS)
+
+    def run(self):
+        """
+        Applies reductions until nothing changes.
+        Sets status to 'infeasible' if a reduction proves it, to 'Optimal'
+        if every row and column is removed and to 'Unbounded' if only
+        columns that can grow without limit are left.
+
+        Parameters: None
+
+        Returns: Presolve
+        """
+
+        steps = [('empty rows', self._empty_rows),
+                 ('singleton rows', self._singleton_rows),
+                 ('fixed columns', self._fixed_columns),
+                 ('parallel rows', self._parallel_rows),
+                 ('dominated columns', self._dominated_columns),
+                 ('bound tightening', self._tighten_bounds)]
+
+        for _ in range(MAX_PASSES):
+            changed = False
+
+            for name, step in steps:
+                rows, columns = self.rows.sum(), self.columns.sum()
+                bounds = step()
+
+                self.stats[name]['rows'] += rows - self.rows.sum()
+                self.stats[name]['columns'] += columns - self.columns.sum()
+                self.stats[name]['bounds'] += bounds
+
+                if self.status == "infeasible":
+                    return self
+
+                changed = changed or bounds > 0 or rows != self.rows.sum() or columns != self.columns.sum()
+
+            if not changed:
+                break
+
+        if not self.rows.any():
+            # columns left have no rows and can grow with the objective
+            self.status = "Unbounded" if self.columns.any() else "Optimal"
+
+        return self
+
+    # Reduced problem
+
+    def reduced(self):
+        """
+        Gets the reduced problem.
+
+        Returns: (obj, constraints, senses, rhs, lower, upper), constraints is a CSR matrix
+        """
+
+        rows, columns = np.flatnonzero(self.rows), np.flatnonzero(self.columns)
+
+        return (list(self.obj[columns]),
+                self.A[rows][:, columns],
+                [self.senses[i] for i in rows],
+                list(self.b[rows]),
+                list(self.lower[columns]),
+                [None if np.isinf(u) else u for u in self.upper[columns]])
+
+    def postsolve(self, x):
+        """
+        Maps a solution of the reduced problem to the original columns.
+
+        Parameters: x: list[float] len: reduced column count
+
+        Returns: np.ndarray(n)
+        """
+
+        solution = self.values.copy()
+        solution[self.columns] = np.array(x, dtype=float)[:self.columns.sum()]
+
+        return solution
+
+    def objective_value(self, x):
+        """
+        Gets objective value of a postsolved solution.
+
+        Parameters: x: np.ndarray(n)
+
+        Returns: float
+        """
+
+        return float(np.dot(self.obj, x))
+
+    def statistics(self):
+        """
+        Gets rows and columns removed and bounds changed by each reduction.
+        :Example: {'rows': (12, 8), 'columns': (10, 9),
+                   'reductions': {'singleton rows': {'rows': 4, 'columns': 0, 'bounds': 4}, ...}}
+        """
+
+        return {'rows': (self.m, int(self.rows.sum())),
+                'columns': (self.n, int(self.columns.sum())),
+                'reductions': {name: {key: int(value) for key, value in counts.items()}
+                               for name, counts in self.stats.items()}}
+
+    # Reductions, each returns the number of bounds it changed
+
+    def _row(self, i):
+        """
+        Gets alive entries of row i.
+
+        Returns: (np.ndarray(dtype='int'), np.ndarray)
+        """
+
+        start, end = self.A.indptr[i], self.A.indptr[i + 1]
+        idx, data = self.A.indices[start:end], self.A.data[start:end]
+        keep = self.columns[idx] & (data != 0)
+
+        return idx[keep], data[keep]
+
+    def _column(self, j):
+        """
+        Gets alive entries of column j.
+
+        Returns: (np.ndarray(dtype='int'), np.ndarray)
+        """
+
+        start, end = self.A_csc.indptr[j], self.A_csc.indptr[j + 1]
+        idx, data = self.A_csc.indices[start:end], self.A_csc.data[start:end]
+        keep = self.rows[idx] & (data != 0)
+
+        return idx[keep], data[keep]
+
+    def _satisfied(self, activity, i):
+        """
+        Checks a constant activity against row i.
+        """
+
+        if self.senses[i] == '<=':
+            return activity <= self.b[i] + PRESOLVE_TOL
+        if self.senses[i] == '>=':
+            return activity >= self.b[i] - PRESOLVE_TOL
+
+        return abs(activity - self.b[i]) <= PRESOLVE_TOL
+
+    def _fix(self, j, value):
+        """
+        Removes column j, x_j = value moves into the rhs.
+        """
+
+        rows, data = self._column(j)
+        self.b[rows] -= data * value
+
+        self.values[j] = value
+        self.columns[j] = False
+
+    def _check_bounds(self, j):
+        if self.lower[j] > self.upper[j] + PRESOLVE_TOL:
+            self.status = "infeasible"
+        elif self.lower[j] > self.upper[j]:
+            self.upper[j] = self.lower[j]
+
+    def _empty_rows(self):
+        for i in np.flatnonzero(self.rows):
+            idx, data = self._row(i)
+
+            if len(idx) == 0:
+                if not self._satisfied(0, i):
+                    self.status = "infeasible"
+                    return 0
+
+                self.rows[i] = False
+
+        return 0
+
+    def _singleton_rows(self):
+        """
+        a * x_j (sense) b becomes a bound on x_j.
+        """
+
+        bounds = 0
+
+        for i in np.flatnonzero(self.rows):
+            idx, data = self._row(i)
+
+            if len(idx) != 1:
+                continue
+
+            j, a = idx[0], data[0]
+            value = self.b[i] / a
+            sense = self.senses[i]
+
+            # dividing by a negative coefficient flips the sense
+            if a < 0 and sense != '==':
+                sense = '>=' if sense == '<=' else '<='
+
+            if sense in ('<=', '==') and value < self.upper[j]:
+                self.upper[j] = value
+                bounds += 1
+            if sense in ('>=', '==') and value > self.lower[j]:
+                self.lower[j] = value
+                bounds += 1
+
+            self.rows[i] = False
+            self._check_bounds(j)
+
+            if self.status == "infeasible":
+                break
+
+        return bounds
+
+    def _fixed_columns(self):
+        for j in np.flatnonzero(self.columns):
+            if self.upper[j] - self.lower[j] <= PRESOLVE_TOL:
+                self._fix(j, self.lower[j])
+
+        return 0
+
+    def _parallel_rows(self):
+        """
+        Rows that are multiples of each other are merged into one row,
+        or two rows when both sides of the merged range are finite.
+        """
+
+        groups = OrderedDict()
+
+        for i in np.flatnonzero(self.rows):
+            idx, data = self._row(i)
+
+            if len(idx) == 0:
+                continue
+
+            # scale by the largest magnitude, sign of the first entry
+            scale = np.max(np.abs(data)) * np.sign(data[0])
+            key = (tuple(idx), tuple(np.round(data / scale, 9)))
+            groups.setdefault(key, []).append((i, scale))
+
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+
+            # range of the scaled row activity
+            low, high = -np.inf, np.inf
+
+            for i, scale in members:
+                value = self.b[i] / scale
+                sense = self.senses[i]
+
+                if scale < 0 and sense != '==':
+                    sense = '>=' if sense == '<=' else '<='
+
+                if sense in ('<=', '==') and value < high:
+                    high = value
+                if sense in ('>=', '==') and value > low:
+                    low = value
+
+            if low > high + PRESOLVE_TOL:
+                self.status = "infeasible"
+                return 0
+
+            for i, scale in members:
+                self.rows[i] = False
+
+            (first, first_scale), (second, second_scale) = members[0], members[1]
+
+            if high - low <= PRESOLVE_TOL:
+                self._set_row(first, first_scale, '==', high)
+                continue
+
+            if np.isfinite(high):
+                self._set_row(first, first_scale, '<=', high)
+            if np.isfinite(low):
+                self._set_row(second, second_scale, '>=', low)
+
+        return 0
+
+    def _set_row(self, i, scale, sense, value):
+        """
+        Keeps row i as scaled row activity (sense) value.
+        """
+
+        if scale < 0 and sense != '==':
+            sense = '>=' if sense == '<=' else '<='
+
+        self.senses[i] = sense
+        self.b[i] = value * scale
+        self.rows[i] = True
+
+    def _dominated_columns(self):
+        """
+        A column whose rows never block moving it in the improving direction
+        is fixed at that bound, a column that can only get worse is fixed
+        at its lower bound.
+        """
+
+        cost = self.obj if self.sense == 'max' else -self.obj
+
+        # rows that stop a column from growing (up) or shrinking (down)
+        rows, data = self.A_csc.indices, self.A_csc.data
+        columns = np.repeat(np.arange(self.n), np.diff(self.A_csc.indptr))
+        alive = self.rows[rows] & (data != 0)
+
+        equal = np.array([s == '==' for s in self.senses], dtype=bool)[rows]
+        less = np.array([s == '<=' for s in self.senses], dtype=bool)[rows]
+        up = alive & (equal | (less == (data > 0)))
+        down = alive & (equal | (less != (data > 0)))
+
+        up_locks = np.bincount(columns[up], minlength=self.n)
+        down_locks = np.bincount(columns[down], minlength=self.n)
+
+        for j in np.flatnonzero(self.columns):
+            if cost[j] <= 0 and down_locks[j] == 0:
+                self._fix(j, self.lower[j])
+            elif cost[j] >= 0 and up_locks[j] == 0 and np.isfinite(self.upper[j]):
+                self._fix(j, self.upper[j])
+
+        return 0
+
+    def _tighten_bounds(self):
+        """
+        Derives bounds from row activity ranges, drops rows implied by
+        bounds and detects rows no point within bounds satisfies.
+        """
+
+        bounds = 0
+
+        for i in np.flatnonzero(self.rows):
+            idx, data = self._row(i)
+
+            if len(idx) == 0:
+                continue
+
+            # a '>=' side is handled as -a * x <= -b
+            sides = []
+            if self.senses[i] in ('<=', '=='):
+                sides.append(1)
+            if self.senses[i] in ('>=', '=='):
+                sides.append(-1)
+
+            redundant = True
+
+            for sign in sides:
+                a, b = sign * data, sign * self.b[i]
+
+                low = np.where(a > 0, a * self.lower[idx], a * self.upper[idx])
+                high = np.where(a > 0, a * self.upper[idx], a * self.lower[idx])
+
+                if np.sum(low) > b + PRESOLVE_TOL * max(1, abs(b)):
+                    self.status = "infeasible"
+                    return bounds
+
+                if np.sum(high) > b + PRESOLVE_TOL * max(1, abs(b)):
+                    redundant = False
+
+                bounds += self._tighten_row(idx, a, b, low)
+
+                if self.status == "infeasible":
+                    return bounds
+
+            if redundant:
+                self.rows[i] = False
+
+        return bounds
+
+    def _tighten_row(self, idx, a, b, low):
+        """
+        a * x <= b gives a_j * x_j <= b - (minimum activity of the other columns).
+        """
+
+        infinite = ~np.isfinite(low)
+        finite = np.where(infinite, 0, low)
+
+        # only columns whose row rest has a finite minimum get a bound
+        usable = (np.abs(a) >= COEFFICIENT_TOL) & (infinite.sum() - infinite == 0)
+
+        if not usable.any():
+            return 0
+
+        value = np.full(len(idx), np.nan)
+        value[usable] = (b - (finite.sum() - finite[usable])) / a[usable]
+
+        margin = BOUND_IMPROVEMENT * np.maximum(1, np.abs(value))
+        upper = usable & (a > 0) & (value < self.upper[idx] - margin)
+        lower = usable & (a < 0) & (value > self.lower[idx] + margin)
+
+        self.upper[idx[upper]] = value[upper]
+        self.lower[idx[lower]] = value[lower]
+
+        for j in idx[upper | lower]:
+            self._check_bounds(j)
+
+        return int(upper.sum() + lower.sum())
+
+
+def presolve(obj, constraints, senses, rhs, lower=None, upper=None, sense='max'):
+    """
+    Runs every reduction on a lp problem.
+
+    Parameters: same as Presolve
+
+    Returns: Presolve
+    """
+
+    return Presolve(obj, constraints, senses, rhs, lower, upper, sense).run()
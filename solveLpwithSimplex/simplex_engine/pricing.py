@@ -0,0 +1,279 @@
+import numpy as np
+import scipy.sparse as sp
+
+from .storage import transposed_dot
+
+# reduced costs below this are treated as non-positive
+OPTIMALITY_TOL = 1e-9
+
+# devex reference framework is reset when a weight grows past this
+DEVEX_RESET = 1e6
+
+# columns per ftran block when steepest edge weights are computed
+STEEPEST_EDGE_BLOCK = 256
+
+
+def _reduced_costs(cost, A, w, columns):
+    """
+    Computes z_j - c_j = c_j - w * a_j for given columns only.
+
+    Parameters: cost: np.ndarray -> row 0
+                A: constraint block of tableau
+                w: np.ndarray(m) -> c_b * B_inv
+                columns: np.ndarray(dtype='int')
+
+    Returns: np.ndarray
+    """
+
+    return cost[columns] - A[:, columns].T.dot(w)
+
+
+def _pivot_row(A, factor, pivot_row, nonbasics):
+    """
+    Computes row pivot_row of B_inv * A_n with one btran.
+
+    Returns: np.ndarray
+    """
+
+    e = np.zeros(factor.m)
+    e[pivot_row] = 1
+    return transposed_dot(A, factor.btran(e))[nonbasics]
+
+
+class Dantzig():
+    """
+    Prices every nonbasic column and picks the largest reduced cost.
+
+    This is the original rule of LpProblem._simplex.
+    """
+
+    def reset(self, A, factor, basics, nonbasics):
+        pass
+
+    def select(self, cost, A, w, nonbasics):
+        """
+        Chooses entering variable.
+
+        Parameters: cost: np.ndarray -> row 0
+                    A: constraint block of tableau
+                    w: np.ndarray(m) -> c_b * B_inv
+                    nonbasics: list[int]
+
+        Returns: int -> position in nonbasics or None if basis is optimal
+        """
+
+        z_n_c_n = (cost[:-1] - transposed_dot(A, w))[nonbasics]
+
+        if np.all(z_n_c_n <= OPTIMALITY_TOL):
+            return None
+
+        return int(np.argmax(z_n_c_n))
+
+    def update(self, A, factor, basics, nonbasics, pivot_row, pivot_col, alpha):
+        """
+        Updates pricing state before the basis change, factor still
+        describes the old basis.
+
+        Parameters: pivot_row: int
+                    pivot_col: int -> position in nonbasics
+                    alpha: np.ndarray(m) -> B_inv * entering column
+
+        Returns: None
+        """
+
+        pass
+
+
+class Bland(Dantzig):
+    """
+    Picks the attractive column with the smallest index. Slow, but it
+    can not cycle, LpProblem falls back to it when pivots stall.
+    """
+
+    def select(self, cost, A, w, nonbasics):
+        nonbasics = np.asarray(nonbasics, dtype=int)
+        z_n_c_n = (cost[:-1] - transposed_dot(A, w))[nonbasics]
+        attractive = np.flatnonzero(z_n_c_n > OPTIMALITY_TOL)
+
+        if not len(attractive):
+            return None
+
+        return int(attractive[np.argmin(nonbasics[attractive])])
+
+
+class PartialPricing(Dantzig):
+    """
+    Splits nonbasics into segments and prices one segment at a time,
+    starting after the segment of the last entering variable. Optimality
+    is only declared after every segment is priced without a candidate.
+    """
+
+    def __init__(self, segments=8):
+        self.segments = segments
+        self.start = 0
+
+    def reset(self, A, factor, basics, nonbasics):
+        self.start = 0
+
+    def select(self, cost, A, w, nonbasics):
+        nonbasics = np.asarray(nonbasics, dtype=int)
+        count = len(nonbasics)
+        size = max(1, -(-count // self.segments))
+
+        for k in range(0, count, size):
+            positions = (np.arange(size) + self.start + k) % count
+            positions = np.unique(positions)
+
+            z_n_c_n = _reduced_costs(cost, A, w, nonbasics[positions])
+            best = np.argmax(z_n_c_n)
+
+            if z_n_c_n[best] > OPTIMALITY_TOL:
+                self.start = (self.start + k + size) % count
+                return int(positions[best])
+
+        return None
+
+
+class MultiplePricing(Dantzig):
+    """
+    Full pricing keeps the best `candidates` columns, following iterations
+    price only those until none of them is attractive.
+    """
+
+    def __init__(self, candidates=8):
+        self.candidates = candidates
+        self.columns = np.array([], dtype=int)
+
+    def reset(self, A, factor, basics, nonbasics):
+        self.columns = np.array([], dtype=int)
+
+    def select(self, cost, A, w, nonbasics):
+        nonbasics = np.asarray(nonbasics, dtype=int)
+
+        # minor iteration over candidates still nonbasic
+        columns = self.columns[np.isin(self.columns, nonbasics)]
+
+        if len(columns):
+            z_n_c_n = _reduced_costs(cost, A, w, columns)
+            best = np.argmax(z_n_c_n)
+
+            if z_n_c_n[best] > OPTIMALITY_TOL:
+                self.columns = columns
+                return int(np.flatnonzero(nonbasics == columns[best])[0])
+
+        # major iteration
+        z_n_c_n = (cost[:-1] - transposed_dot(A, w))[nonbasics]
+        attractive = np.flatnonzero(z_n_c_n > OPTIMALITY_TOL)
+
+        if not len(attractive):
+            return None
+
+        order = attractive[np.argsort(-z_n_c_n[attractive])]
+        self.columns = nonbasics[order[:self.candidates]]
+
+        return int(order[0])
+
+
+class Devex(Dantzig):
+    """
+    Approximate steepest edge with reference weights, picks the largest
+    d_j^2 / w_j. Weights are updated from the pivot row, one extra btran
+    per iteration.
+    """
+
+    def reset(self, A, factor, basics, nonbasics):
+        self.weights = np.ones(A.shape[1])
+
+    def select(self, cost, A, w, nonbasics):
+        z_n_c_n = (cost[:-1] - transposed_dot(A, w))[nonbasics]
+        attractive = z_n_c_n > OPTIMALITY_TOL
+
+        if not np.any(attractive):
+            return None
+
+        scores = np.where(attractive, z_n_c_n ** 2 / self.weights[nonbasics], -np.inf)
+        return int(np.argmax(scores))
+
+    def update(self, A, factor, basics, nonbasics, pivot_row, pivot_col, alpha):
+        nonbasics = np.asarray(nonbasics, dtype=int)
+        alpha_r = _pivot_row(A, factor, pivot_row, nonbasics)
+
+        enters = nonbasics[pivot_col]
+        leaves = basics[pivot_row]
+        w_q = self.weights[enters]
+
+        ratio = alpha_r / alpha[pivot_row]
+        self.weights[nonbasics] = np.maximum(self.weights[nonbasics], ratio ** 2 * w_q)
+        self.weights[leaves] = max(w_q / alpha[pivot_row] ** 2, 1)
+
+        if self.weights[leaves] > DEVEX_RESET:
+            self.weights[:] = 1
+
+
+class SteepestEdge(Dantzig):
+    """
+    Exact steepest edge, picks the largest d_j^2 / gamma_j where
+    gamma_j = 1 + ||B_inv * a_j||^2. Weights are computed once per phase
+    and updated with the pivot row and one more btran per iteration.
+    """
+
+    def reset(self, A, factor, basics, nonbasics):
+        nonbasics = np.asarray(nonbasics, dtype=int)
+        self.weights = np.ones(A.shape[1])
+
+        for k in range(0, len(nonbasics), STEEPEST_EDGE_BLOCK):
+            columns = nonbasics[k:k + STEEPEST_EDGE_BLOCK]
+            block = A[:, columns]
+            block = block.toarray() if sp.issparse(block) else np.asarray(block)
+            self.weights[columns] = 1 + np.sum(factor.ftran(block) ** 2, axis=0)
+
+    def select(self, cost, A, w, nonbasics):
+        z_n_c_n = (cost[:-1] - transposed_dot(A, w))[nonbasics]
+        attractive = z_n_c_n > OPTIMALITY_TOL
+
+        if not np.any(attractive):
+            return None
+
+        scores = np.where(attractive, z_n_c_n ** 2 / self.weights[nonbasics], -np.inf)
+        return int(np.argmax(scores))
+
+    def update(self, A, factor, basics, nonbasics, pivot_row, pivot_col, alpha):
+        nonbasics = np.asarray(nonbasics, dtype=int)
+        alpha_r = _pivot_row(A, factor, pivot_row, nonbasics)
+
+        enters = nonbasics[pivot_col]
+        leaves = basics[pivot_row]
+        gamma_q = 1 + np.dot(alpha, alpha)
+
+        # a_j * B_inv^T * alpha_q for every nonbasic j
+        tau = transposed_dot(A, factor.btran(alpha))[nonbasics]
+
+        ratio = alpha_r / alpha[pivot_row]
+        gamma = self.weights[nonbasics] - 2 * ratio * tau + ratio ** 2 * gamma_q
+        self.weights[nonbasics] = np.maximum(gamma, 1 + ratio ** 2)
+        self.weights[leaves] = max(gamma_q / alpha[pivot_row] ** 2, 1)
+
+
+PRICINGS = {
+    'dantzig': Dantzig,
+    'bland': Bland,
+    'partial': PartialPricing,
+    'multiple': MultiplePricing,
+    'devex': Devex,
+    'steepest': SteepestEdge,
+}
+
+
+def make_pricing(name):
+    """
+    Creates a pricing strategy by name.
+
+    Parameters: name: str -> could be ['dantzig', 'bland', 'partial', 'multiple', 'devex', 'steepest']
+
+    Returns: Dantzig, Bland, PartialPricing, MultiplePricing, Devex or SteepestEdge
+    """
+
+    if name not in PRICINGS:
+        raise ValueError("Unknown pricing: {}".format(name))
+
+    return PRICINGS[name]()
@@ -0,0 +1,936 @@
+import contextlib
+import gzip
+import io
+import os
+import re
+
+import numpy as np
+import scipy.sparse as sp
+
+from .solver import LpProblem
+
+# entries the COO arrays start with, they double when full
+INITIAL_CAPACITY = 4096
+
+# characters read at once, memory use while reading is bounded by a chunk and the COO arrays
+CHUNK_SIZE = 2 ** 20
+
+# row senses are stored as codes while reading
+SENSES = ['<=', '>=', '==']
+LE, GE, EQ = range(3)
+
+MPS_SENSES = {'L': LE, 'G': GE, 'E': EQ}
+MPS_SECTIONS = ['NAME', 'OBJSENSE', 'ROWS', 'COLUMNS', 'RHS', 'RANGES', 'BOUNDS', 'ENDATA']
+MPS_VALUED_BOUNDS = ['UP', 'LO', 'FX', 'LI', 'UI']
+
+LP_OPERATORS = {'<': LE, '<=': LE, '=<': LE, '>': GE, '>=': GE, '=>': GE, '=': EQ, '==': EQ}
+LP_INFINITY = ['inf', 'infinity']
+
+# section headers start in the first column, data lines with a space
+_MPS_HEADER = re.compile(r'^\S.*$', re.MULTILINE)
+
+_LP_SECTION = re.compile(r'\s*(?P<section>maximi[sz]e|maximum|max|minimi[sz]e|minimum|min|subject\s+to|such\s+that|'
+                         r's\.t\.|st|bounds?|generals?|gen|integers?|binary|binaries|bin|'
+                         r'semi-continuous|semis?|sos|end)(?=\s|$)', re.IGNORECASE)
+
+_NUMBER = r'(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+_NAME = r'[^\s\d.+\-<>=:\[\]*^][^\s+\-<>=:\[\]*^]*(?![^\s+\-<>=:\[\]*^])'
+
+_LP_TOKEN = re.compile(r'\s*(?:(?P<number>{number})|(?P<operator>=[<>]|[<>=]=?)|(?P<sign>[+-])|(?P<colon>:)|'
+                       r'(?P<name>{name})|(?P<other>\S))'.format(number=_NUMBER, name=_NAME))
+
+# objective lines of only terms and whole constraints on one line are read without the token loop
+_LP_TERMS = r'\s*(?:(?P<label>{name})\s*:\s*)?(?P<terms>(?:[+-]?\s*(?:{number}\s*)?{name}\s*)+)'.format(
+    number=_NUMBER, name=_NAME)
+_LP_OBJECTIVE = re.compile(_LP_TERMS + r'$')
+_LP_ROW = re.compile(_LP_TERMS + r'(?P<operator>=[<>]|[<>=]=?)\s*(?P<rhs>[+-]?\s*{number})\s*$'.format(number=_NUMBER))
+
+# terms of a matched line, a name there always runs to its end
+_LP_TERM = re.compile(r'([+-]?)\s*({number})?\s*([^\s\d.+\-<>=:\[\]*^][^\s+\-<>=:\[\]*^]*)'.format(number=_NUMBER))
+
+
+class _Growable():
+    """
+    Preallocated numpy array that doubles when full, so values
+    are added without building Python lists.
+    """
+
+    def __init__(self, dtype, fill=0, capacity=INITIAL_CAPACITY):
+        self.values = np.full(capacity, fill, dtype=dtype)
+        self.fill = fill
+        self.size = 0
+
+    def resize(self, size):
+        """
+        New entries hold `fill`.
+        """
+        if size > len(self.values):
+            values = np.full(max(2 * len(self.values), size), self.fill, dtype=self.values.dtype)
+            values[:self.size] = self.values[:self.size]
+            self.values = values
+
+        self.size = size
+
+    def extend(self, values):
+        start = self.size
+        self.resize(start + len(values))
+        self.values[start:self.size] = values
+
+    def array(self):
+        """
+        Gives up the buffer trimmed to the added values.
+        """
+        values = self.values[:self.size].copy()
+        self.values = None
+
+        return values
+
+
+class _Coo():
+    """
+    Constraint matrix entries as three preallocated arrays.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.rows = np.empty(capacity, dtype=np.int32)
+        self.cols = np.empty(capacity, dtype=np.int32)
+        self.data = np.empty(capacity, dtype=float)
+        self.size = 0
+
+    def add(self, i, j, value):
+        if self.size == len(self.data):
+            self._grow(self.size + 1)
+
+        self.rows[self.size] = i
+        self.cols[self.size] = j
+        self.data[self.size] = value
+        self.size += 1
+
+    def extend(self, i, j, values):
+        size = self.size + len(values)
+
+        if size > len(self.data):
+            self._grow(size)
+
+        self.rows[self.size:size] = i
+        self.cols[self.size:size] = j
+        self.data[self.size:size] = values
+        self.size = size
+
+    def _grow(self, size):
+        capacity = max(2 * len(self.data), size)
+
+        self.rows = np.resize(self.rows, capacity)
+        self.cols = np.resize(self.cols, capacity)
+        self.data = np.resize(self.data, capacity)
+
+    def tocsr(self, shape):
+        """
+        Duplicate entries are summed, explicit zeros dropped.
+        """
+        A = sp.coo_matrix((self.data[:self.size], (self.rows[:self.size], self.cols[:self.size])),
+                          shape=shape).tocsr()
+        A.eliminate_zeros()
+
+        return A
+
+
+class _Builder():
+    """
+    Collects rows, columns and entries of a model file in reading order.
+    """
+
+    def __init__(self):
+        self.row_index = dict()
+        self.row_names = list()
+        self.senses = _Growable(np.int8)
+        self.rhs = _Growable(float)
+
+        self.column_index = dict()
+        self.column_names = list()
+        self.obj = _Growable(float)
+        self.lower = _Growable(float)
+        self.upper = _Growable(float, fill=np.inf)
+
+        self.entries = _Coo()
+        self.offset = 0.0
+
+    def row(self, name, sense=EQ):
+        i = len(self.row_names)
+
+        self.row_index[name] = i
+        self.row_names.append(name)
+        self.senses.extend([sense])
+        self.rhs.resize(i + 1)
+
+        return i
+
+    def rows(self, names, senses):
+        start = len(self.row_names)
+
+        self.row_index.update(zip(names, range(start, start + len(names))))
+        self.row_names.extend(names)
+        self.senses.extend(senses)
+        self.rhs.resize(start + len(names))
+
+    def column(self, name):
+        """
+        Gets the index of a column, adds the column if it is new.
+        """
+        j = self.column_index.get(name)
+
+        if j is None:
+            j = len(self.column_names)
+
+            self.column_index[name] = j
+            self.column_names.append(name)
+
+            for values in (self.obj, self.lower, self.upper):
+                values.resize(j + 1)
+
+        return j
+
+    def columns(self, names):
+        """
+        Adds the new ones of `names` as columns, in order of appearance.
+        """
+        names = [name for name in dict.fromkeys(names) if name not in self.column_index]
+        start = len(self.column_names)
+
+        self.column_index.update(zip(names, range(start, start + len(names))))
+        self.column_names.extend(names)
+
+        for values in (self.obj, self.lower, self.upper):
+            values.resize(start + len(names))
+
+    def indexes(self, index, names, kind):
+        """
+        Looks up row or column names.
+
+        Returns: np.array
+        """
+
+        try:
+            return np.fromiter(map(index.__getitem__, names), dtype=np.int32, count=len(names))
+        except KeyError as error:
+            raise ValueError('Unknown {} {}'.format(kind, error.args[0]))
+
+    def model(self, name, sense, ranges=None):
+        """
+        Parameters: name: str
+                    sense: str -> could be ['max', 'min']
+                    ranges: dict[int, float] -> MPS RANGES of rows
+
+        Returns: LpModel
+        """
+
+        shape = (len(self.row_names), len(self.column_names))
+        A = self.entries.tocsr(shape)
+        self.entries = None
+
+        senses = self.senses.array()
+        rhs = self.rhs.array()
+        row_names = self.row_names
+
+        if ranges:
+            A, senses, rhs, row_names = _add_ranges(A, senses, rhs, row_names, ranges)
+
+        return LpModel(name, sense, self.obj.array(), A, np.array(SENSES)[senses].tolist(), rhs,
+                       self.lower.array(), self.upper.array(), row_names, self.column_names, self.offset)
+
+
+def _add_ranges(A, senses, rhs, row_names, ranges):
+    """
+    Splits ranged rows into a '>=' and a '<=' row, the second
+    side is added below the other rows.
+    """
+    rows = np.array(sorted(ranges), dtype=int)
+    R = np.array([ranges[i] for i in rows], dtype=float)
+
+    lower = np.where(senses[rows] == LE, rhs[rows] - np.abs(R), rhs[rows])
+    lower = np.where((senses[rows] == EQ) & (R < 0), rhs[rows] + R, lower)
+    upper = np.where(senses[rows] == GE, rhs[rows] + np.abs(R), rhs[rows])
+    upper = np.where((senses[rows] == EQ) & (R > 0), rhs[rows] + R, upper)
+
+    senses, rhs = senses.copy(), rhs.copy()
+    senses[rows] = GE
+    rhs[rows] = lower
+
+    A = sp.vstack([A, A[rows]], format='csr')
+    senses = np.concatenate([senses, np.full(len(rows), LE, dtype=senses.dtype)])
+    rhs = np.concatenate([rhs, upper])
+    row_names = row_names + [row_names[i] + '_range' for i in rows]
+
+    return A, senses, rhs, row_names
+
+
+class LpModel():
+    """
+    A lp problem read from a MPS or LP file. Constraints are kept
+    in a CSR matrix, rows and columns keep their names from the file.
+    """
+
+    def __init__(self, name, sense, obj, A, senses, rhs, lower, upper, row_names, column_names, offset=0.0):
+        """
+        Parameters: name: str
+                    sense: str -> could be ['max', 'min']
+                    obj: np.array len: n
+                    A: scipy.sparse.csr_matrix (m, n)
+                    senses: list[str] len: m -> could be ['<=', '>=', '==']
+                    rhs: np.array len: m
+                    lower: np.array len: n, -inf for free columns
+                    upper: np.array len: n, inf for unbounded columns
+                    row_names: list[str] len: m
+                    column_names: list[str] len: n
+                    offset: float -> objective constant
+
+        Returns: None
+        """
+
+        self.name = name
+        self.sense = sense
+        self.obj = obj
+        self.A = A
+        self.senses = senses
+        self.rhs = rhs
+        self.lower = lower
+        self.upper = upper
+        self.row_names = row_names
+        self.column_names = column_names
+        self.offset = offset
+
+    @property
+    def shape(self):
+        return self.A.shape
+
+    @property
+    def nonzeros(self):
+        return self.A.nnz
+
+    def objective_value(self, x):
+        return float(self.obj.dot(x)) + self.offset
+
+    def lp_problem(self, **kwargs):
+        """
+        Builds a LpProblem ready to solve, the CSR matrix is passed
+        as it is so the sparse tableau is used.
+
+        Parameters: kwargs: LpProblem arguments
+
+        Returns: LpProblem
+        """
+
+        lp = LpProblem(self.sense, **kwargs)
+        lp.objective(self.obj.tolist())
+        lp.constraints(self.A)
+        lp.constraint_senses(list(self.senses))
+
+        if np.any(self.lower != 0) or np.any(np.isfinite(self.upper)):
+            lp.bounds(self.lower, self.upper)
+
+        lp.rhs(self.rhs.tolist())
+        lp._tableau_format()
+
+        return lp
+
+
+@contextlib.contextmanager
+def _open(source):
+    """
+    Opens a path or file object (.gz is decompressed), binary files are read as utf-8 text.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        opener = gzip.open if os.fspath(source).endswith('.gz') else open
+
+        with opener(source, 'rt', encoding='utf-8', errors='replace') as file:
+            yield file
+        return
+
+    if not isinstance(source.read(0), bytes):
+        yield source
+        return
+
+    if str(getattr(source, 'name', '') or '').endswith('.gz'):
+        source = gzip.GzipFile(fileobj=source, mode='rb')
+
+    text = io.TextIOWrapper(source, encoding='utf-8', errors='replace')
+
+    try:
+        yield text
+    finally:
+        # keep the caller's file open
+        text.detach()
+
+
+def _chunks(source):
+    """
+    Yields whole lines, about CHUNK_SIZE characters at a time.
+    """
+    with _open(source) as file:
+        rest = ''
+
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+
+            if not chunk:
+                break
+
+            chunk = rest + chunk
+            end = chunk.rfind('\n') + 1
+            rest = chunk[end:]
+
+            if end:
+                yield chunk[:end]
+
+        if rest:
+            yield rest + '\n'
+
+
+class _MpsReader():
+    """
+    Fixed and free MPS reader. Data lines between two section headers
+    are split at once and their names and values converted with numpy,
+    lines are only read one by one when their layout varies.
+    """
+
+    # row_index entries of the objective and of other free rows
+    OBJECTIVE, FREE = -1, -2
+
+    def __init__(self):
+        self.builder = _Builder()
+        self.name = ''
+        self.sense = 'min'
+        self.section = None
+        self.objective_row = None
+        self.ranges = dict()
+
+    def read(self, source):
+        line_number = 1
+
+        with contextlib.closing(_chunks(source)) as chunks:
+            for chunk in chunks:
+                if self._chunk(chunk, line_number):
+                    break
+
+                line_number += chunk.count('\n')
+
+        if self.objective_row is None:
+            raise ValueError('MPS file has no objective row')
+
+        return self.builder.model(self.name, self.sense, self.ranges)
+
+    def _chunk(self, chunk, line_number):
+        """
+        Returns: bool -> True at ENDATA
+        """
+
+        start = 0
+
+        for match in _MPS_HEADER.finditer(chunk):
+            if start < match.start():
+                self._data(chunk[start:match.start()], line_number)
+
+            line_number += chunk.count('\n', start, match.start())
+            start = match.end() + 1
+
+            if match.group()[0] != '*' and self._header(match.group().split(), line_number):
+                return True
+
+            line_number += 1
+
+        if start < len(chunk):
+            self._data(chunk[start:], line_number)
+
+        return False
+
+    def _header(self, fields, line_number):
+        """
+        Returns: bool -> True at ENDATA
+        """
+
+        self.section = fields[0].upper()
+
+        if self.section not in MPS_SECTIONS:
+            raise ValueError('Unknown MPS section {} on line {}'.format(fields[0], line_number))
+
+        if self.section == 'NAME':
+            self.name = fields[1] if len(fields) > 1 else ''
+        elif self.section == 'OBJSENSE' and len(fields) > 1:
+            self.sense = 'max' if fields[1].upper().startswith('MAX') else 'min'
+
+        return self.section == 'ENDATA'
+
+    def _data(self, text, first_line):
+        fields = text.split()
+        lines = text.count('\n')
+
+        if self.section == 'COLUMNS':
+            self._columns(fields, lines, text)
+        elif self.section == 'ROWS' and len(fields) == 2 * lines and set(fields[0::2]) <= set('NLGE'):
+            rows = [(row, MPS_SENSES[kind]) for kind, row in zip(fields[0::2], fields[1::2]) if kind != 'N']
+
+            # N rows take no row index, the rest of the section keeps its order without them
+            for k in range(len(fields) // 2):
+                if fields[2 * k] == 'N':
+                    self._row(fields[2 * k:2 * k + 2], first_line + k)
+
+            self.builder.rows([row for row, _ in rows], [sense for _, sense in rows])
+        elif self.section in ('RHS', 'RANGES') and len(fields) == 3 * lines and len(set(fields[0::3])) == 1:
+            self._rhs(fields[1::3], fields[2::3])
+        else:
+            for line_number, line in enumerate(text.splitlines(), first_line):
+                self._line(line.split(), line_number)
+
+    def _line(self, fields, line_number):
+        if not fields:
+            return
+        elif self.section == 'ROWS':
+            self._row(fields, line_number)
+        elif self.section in ('RHS', 'RANGES'):
+            # the set name is optional
+            self._rhs(fields[len(fields) % 2::2], fields[len(fields) % 2 + 1::2])
+        elif self.section == 'BOUNDS':
+            self._bound(fields, line_number)
+        elif self.section == 'OBJSENSE':
+            self.sense = 'max' if fields[0].upper().startswith('MAX') else 'min'
+        else:
+            raise ValueError('Data outside of a section on line {}'.format(line_number))
+
+    def _row(self, fields, line_number):
+        kind, row = fields[0].upper(), fields[1]
+
+        if kind == 'N':
+            self.builder.row_index[row] = self.OBJECTIVE if self.objective_row is None else self.FREE
+            self.objective_row = self.objective_row or row
+        elif kind in MPS_SENSES:
+            self.builder.row(row, MPS_SENSES[kind])
+        else:
+            raise ValueError('Unknown row type {} on line {}'.format(fields[0], line_number))
+
+    def _columns(self, fields, lines, text):
+        builder = self.builder
+
+        # lines with one entry each, the common layout, are read as a whole
+        if len(fields) == 3 * lines and "'MARKER'" not in fields[1::3]:
+            columns, rows, values = fields[0::3], fields[1::3], fields[2::3]
+        else:
+            columns, rows, values = list(), list(), list()
+
+            for fields in map(str.split, text.splitlines()):
+                if not fields or (len(fields) > 2 and fields[1] == "'MARKER'"):
+                    continue
+
+                for k in range(1, len(fields) - 1, 2):
+                    columns.append(fields[0])
+                    rows.append(fields[k])
+                    values.append(fields[k + 1])
+
+        builder.columns(columns)
+
+        j = builder.indexes(builder.column_index, columns, 'column')
+        i = builder.indexes(builder.row_index, rows, 'row')
+        values = np.array(values, dtype=float)
+
+        constraint = i >= 0
+        builder.entries.extend(i[constraint], j[constraint], values[constraint])
+
+        objective = i == self.OBJECTIVE
+        np.add.at(builder.obj.values, j[objective], values[objective])
+
+    def _rhs(self, rows, values):
+        i = self.builder.indexes(self.builder.row_index, rows, 'row')
+        values = np.array(values, dtype=float)
+        constraint = i >= 0
+
+        if self.section == 'RANGES':
+            self.ranges.update(zip(i[constraint].tolist(), values[constraint].tolist()))
+            return
+
+        self.builder.rhs.values[i[constraint]] = values[constraint]
+
+        # the objective constant is minus its rhs
+        if np.any(i == self.OBJECTIVE):
+            self.builder.offset = -values[i == self.OBJECTIVE][-1]
+
+    def _bound(self, fields, line_number):
+        # the bound set name is optional too
+        kind, rest = fields[0].upper(), fields[1:]
+        column_index = self.builder.column_index
+        value = None
+
+        if kind in MPS_VALUED_BOUNDS:
+            if len(rest) not in (2, 3):
+                raise ValueError('Bound on line {} should have a column and a value'.format(line_number))
+
+            column, value = rest[-2], float(rest[-1])
+        elif len(rest) == 1 or rest[1] not in column_index:
+            column = rest[0]
+        else:
+            column = rest[1]
+
+        if column not in column_index:
+            raise ValueError('Unknown column {} on line {}'.format(column, line_number))
+
+        _set_mps_bound(self.builder, column_index[column], kind, value, line_number)
+
+
+def _set_mps_bound(builder, j, kind, value, line_number):
+    lower, upper = builder.lower.values, builder.upper.values
+
+    if kind in ('UP', 'UI'):
+        # a negative upper bound on a column without lower bound makes it free below
+        if value < 0 and lower[j] == 0:
+            lower[j] = -np.inf
+        upper[j] = value
+    elif kind in ('LO', 'LI'):
+        lower[j] = value
+    elif kind == 'FX':
+        lower[j] = upper[j] = value
+    elif kind == 'FR':
+        lower[j], upper[j] = -np.inf, np.inf
+    elif kind == 'MI':
+        lower[j] = -np.inf
+    elif kind == 'PL':
+        upper[j] = np.inf
+    elif kind == 'BV':
+        lower[j], upper[j] = 0, 1
+    else:
+        raise ValueError('Unknown bound type {} on line {}'.format(kind, line_number))
+
+
+def read_mps(source):
+    """
+    Reads a fixed or free MPS file a chunk at a time. Integer markers
+    are skipped, the LP relaxation is read. Names may not contain spaces.
+
+    Parameters: source: str, path or file object
+
+    Returns: LpModel
+    """
+
+    return _MpsReader().read(source)
+
+
+class _LpReader():
+    """
+    CPLEX LP format reader. Terms go into the builder as they are
+    read, a statement is never kept as a whole. Constraints written
+    on one line are collected per chunk and added with numpy.
+    """
+
+    def __init__(self):
+        self.builder = _Builder()
+        self.sense = 'min'
+        self.section = None
+        self.line_number = 0
+        self._rows = list()
+        self._terms = list()
+        self._new_statement()
+
+    def _new_statement(self):
+        self.row = None
+        self.sign = 1.0
+        self.coefficient = None
+        self.constant = 0.0
+        self.operator = None
+        self.rhs_sign = 1.0
+
+    def _error(self, message):
+        return ValueError('{} on line {}'.format(message, self.line_number))
+
+    def read(self, source):
+        with contextlib.closing(_chunks(source)) as chunks:
+            for chunk in chunks:
+                ended = any(map(self._line, chunk.splitlines()))
+                self._flush()
+
+                if ended:
+                    break
+
+        self._end_statement()
+
+        return self.builder.model('', self.sense)
+
+    def _line(self, line):
+        """
+        Returns: bool -> True at End
+        """
+
+        self.line_number += 1
+
+        if '\\' in line:
+            line = line.split('\\', 1)[0]
+
+        if self.section == 'constraints' and self.row is None and self.coefficient is None:
+            match = _LP_ROW.match(line)
+
+            if match:
+                self._one_line_row(match)
+                return False
+        elif (self.section == 'objective' and self.coefficient is None and self.sign == 1.0
+              and 'inf' not in line.lower() and not _LP_SECTION.match(line)):
+            match = _LP_OBJECTIVE.match(line)
+
+            if match:
+                self._objective_terms(match)
+                return False
+
+        self._flush()
+        match = _LP_SECTION.match(line)
+
+        if match:
+            self._start_section(match.group('section').lower())
+
+            if self.section == 'end':
+                return True
+
+            line = line[match.end():]
+
+        if self.section is None and line.strip():
+            raise self._error('Text before the objective')
+
+        tokens = [(match.lastgroup, match.group(match.lastgroup)) for match in _LP_TOKEN.finditer(line)]
+
+        if self.section == 'bounds':
+            self._bound(tokens)
+        elif self.section in ('generals', 'binaries'):
+            self._integers(tokens)
+        elif tokens:
+            self._expression(tokens)
+
+        return False
+
+    def _one_line_row(self, match):
+        builder = self.builder
+        label = match.group('label') or 'c{}'.format(len(builder.row_names) + 1)
+
+        i = builder.row(label, LP_OPERATORS[match.group('operator')])
+        builder.rhs.values[i] = float(match.group('rhs').replace(' ', ''))
+
+        terms = _LP_TERM.findall(match.group('terms'))
+        self._rows.extend([i] * len(terms))
+        self._terms.extend(terms)
+
+    def _objective_terms(self, match):
+        builder = self.builder
+        signs, coefficients, names = zip(*_LP_TERM.findall(match.group('terms')))
+
+        builder.columns(names)
+        np.add.at(builder.obj.values, builder.indexes(builder.column_index, names, 'column'),
+                  _term_values(signs, coefficients))
+
+    def _flush(self):
+        """
+        Adds the collected one line constraints to the builder.
+        """
+        if not self._terms:
+            return
+
+        builder = self.builder
+        signs, coefficients, names = zip(*self._terms)
+
+        builder.columns(names)
+
+        builder.entries.extend(self._rows, builder.indexes(builder.column_index, names, 'column'),
+                               _term_values(signs, coefficients))
+
+        self._rows, self._terms = list(), list()
+
+    def _start_section(self, keyword):
+        self._end_statement()
+
+        if keyword.startswith('max'):
+            self.section, self.sense = 'objective', 'max'
+        elif keyword.startswith('min'):
+            self.section, self.sense = 'objective', 'min'
+        elif keyword[0] == 's' and not keyword.startswith('se') and keyword != 'sos':
+            self.section = 'constraints'
+        elif keyword.startswith('bound'):
+            self.section = 'bounds'
+        elif keyword.startswith(('gen', 'int')):
+            self.section = 'generals'
+        elif keyword.startswith('bin'):
+            self.section = 'binaries'
+        elif keyword == 'end':
+            self.section = 'end'
+        else:
+            raise self._error('{} sections are not supported'.format(keyword))
+
+    def _end_statement(self):
+        if self.section == 'objective':
+            if self.coefficient is not None:
+                self.constant += self.sign * self.coefficient
+            self.builder.offset = self.constant
+        elif self.section == 'constraints' and (self.row is not None or self.coefficient is not None):
+            raise self._error('Constraint without right hand side')
+
+        self._new_statement()
+
+    def _expression(self, tokens):
+        builder = self.builder
+        objective = self.section == 'objective'
+        skip = False
+
+        for k, (kind, text) in enumerate(tokens):
+            if skip:
+                skip = False
+                continue
+
+            if kind == 'name' and k + 1 < len(tokens) and tokens[k + 1][0] == 'colon':
+                # label of the objective or of a constraint
+                if not objective:
+                    self.row = builder.row(text)
+                skip = True
+            elif kind == 'name' and text.lower() not in LP_INFINITY:
+                if self.operator is not None:
+                    raise self._error('Variable {} on the right hand side'.format(text))
+
+                value = self.sign * (1.0 if self.coefficient is None else self.coefficient)
+                j = builder.column(text)
+
+                if objective:
+                    builder.obj.values[j] += value
+                else:
+                    if self.row is None:
+                        self.row = builder.row('c{}'.format(len(builder.row_names) + 1))
+                    builder.entries.add(self.row, j, value)
+
+                self.sign, self.coefficient = 1.0, None
+            elif kind in ('number', 'name'):
+                value = float(text) if kind == 'number' else np.inf
+
+                if self.operator is not None:
+                    self._end_constraint(self.rhs_sign * value)
+                elif self.coefficient is None:
+                    self.coefficient = value
+                else:
+                    self.coefficient *= value
+            elif kind == 'sign':
+                if self.operator is not None:
+                    self.rhs_sign *= -1.0 if text == '-' else 1.0
+                    continue
+
+                if self.coefficient is not None:
+                    self.constant += self.sign * self.coefficient
+                    self.sign, self.coefficient = 1.0, None
+
+                self.sign *= -1.0 if text == '-' else 1.0
+            elif kind == 'operator' and not objective and text in LP_OPERATORS:
+                if self.coefficient is not None:
+                    self.constant += self.sign * self.coefficient
+                    self.sign, self.coefficient = 1.0, None
+
+                if self.row is None:
+                    self.row = builder.row('c{}'.format(len(builder.row_names) + 1))
+
+                self.operator = LP_OPERATORS[text]
+            elif text == '[':
+                raise self._error('Quadratic terms are not supported')
+            else:
+                raise self._error('Unexpected {}'.format(text))
+
+    def _end_constraint(self, rhs):
+        if not np.isfinite(rhs):
+            raise self._error('Infinite right hand side')
+
+        self.builder.senses.values[self.row] = self.operator
+        self.builder.rhs.values[self.row] = rhs - self.constant
+        self._new_statement()
+
+    def _bound(self, tokens):
+        """
+        One bound per line: x <= 4, 2 <= x <= 4, x >= -inf, x = 3, x free
+        """
+        items = list()
+        sign = 1.0
+
+        for kind, text in tokens:
+            if kind == 'sign':
+                sign *= -1.0 if text == '-' else 1.0
+            elif kind == 'number' or (kind == 'name' and text.lower() in LP_INFINITY):
+                items.append(sign * (float(text) if kind == 'number' else np.inf))
+                sign = 1.0
+            elif kind == 'name' or (kind == 'operator' and text in LP_OPERATORS):
+                items.append(text)
+            else:
+                raise self._error('Unexpected {}'.format(text))
+
+        if not items:
+            return
+
+        kinds = ''.join('o' if item in LP_OPERATORS else 'x' if isinstance(item, str) else 'v' for item in items)
+
+        if kinds == 'xx' and items[1].lower() == 'free':
+            j = self.builder.column(items[0])
+            self.builder.lower.values[j], self.builder.upper.values[j] = -np.inf, np.inf
+        elif kinds == 'xov':
+            self._set_bound(items[0], LP_OPERATORS[items[1]], items[2])
+        elif kinds in ('vox', 'voxov'):
+            # value <= x is x >= value
+            self._set_bound(items[2], {LE: GE, GE: LE, EQ: EQ}[LP_OPERATORS[items[1]]], items[0])
+
+            if kinds == 'voxov':
+                self._set_bound(items[2], LP_OPERATORS[items[3]], items[4])
+        else:
+            raise self._error('Bound should look like x <= 4, 0 <= x <= 4 or x free')
+
+    def _set_bound(self, name, operator, value):
+        j = self.builder.column(name)
+
+        if operator in (LE, EQ):
+            self.builder.upper.values[j] = value
+        if operator in (GE, EQ):
+            self.builder.lower.values[j] = value
+
+    def _integers(self, tokens):
+        for kind, text in tokens:
+            if kind != 'name':
+                raise self._error('Unexpected {}'.format(text))
+
+            j = self.builder.column(text)
+
+            if self.section == 'binaries':
+                self.builder.lower.values[j], self.builder.upper.values[j] = 0, 1
+
+
+def _term_values(signs, coefficients):
+    values = np.array([coefficient or 1 for coefficient in coefficients], dtype=float)
+    values[np.array(signs) == '-'] *= -1
+
+    return values
+
+
+def read_lp(source):
+    """
+    Reads a CPLEX LP file a chunk at a time. Integrality is dropped,
+    binaries become 0 <= x <= 1.
+
+    Parameters: source: str, path or file object
+
+    Returns: LpModel
+    """
+
+    return _LpReader().read(source)
+
+
+def read_model(source, format=None):
+    """
+    Reads a MPS or LP file, the format defaults to the file extension.
+
+    Parameters: source: str, path or file object
+                format: str -> could be [None, 'mps', 'lp']
+
+    Returns: LpModel
+    """
+
+    if format is None:
+        name = os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '') or ''
+        name = name.lower()[:-3] if name.lower().endswith('.gz') else name.lower()
+        format = os.path.splitext(name)[1].lstrip('.')
+
+    if format == 'mps':
+        return read_mps(source)
+    elif format == 'lp':
+        return read_lp(source)
+
+    raise ValueError("Model file format should be 'mps' or 'lp'")
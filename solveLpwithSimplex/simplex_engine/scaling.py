@@ -0,0 +1,124 @@
+import numpy as np
+import scipy.sparse as sp
+
+# geometric mean passes, stops earlier when the spread stops improving
+GEOMETRIC_PASSES = 8
+
+# a pass has to shrink max|a| / min|a| by this factor to continue
+GEOMETRIC_IMPROVEMENT = 0.9
+
+
+def _abs(A):
+    A = sp.csr_matrix(A, dtype=float)
+    A.eliminate_zeros()
+    return abs(A)
+
+
+def _extremes(B, axis):
+    """
+    Gets largest and smallest nonzero magnitude of every row (axis=1) or column (axis=0).
+    Empty rows and columns get 1.
+
+    Returns: (np.ndarray, np.ndarray)
+    """
+
+    largest = np.asarray(B.max(axis=axis).todense()).ravel()
+
+    inverse = B.copy()
+    inverse.data = 1 / inverse.data
+    smallest = np.asarray(inverse.max(axis=axis).todense()).ravel()
+
+    empty = largest == 0
+    largest[empty] = 1
+    smallest[empty] = 1
+
+    return largest, 1 / smallest
+
+
+def _spread(B):
+    if B.nnz == 0:
+        return 1
+    return B.data.max() / B.data.min()
+
+
+def _power_of_two(scale):
+    # scaling by powers of 2 only changes exponents, no rounding error
+    return np.exp2(np.round(np.log2(scale)))
+
+
+def equilibration(A):
+    """
+    Scales every row, then every column, so its largest magnitude is 1.
+
+    Parameters: A: list[list[float]], np.ndarray or scipy.sparse matrix (m, n)
+
+    Returns: (np.ndarray(m), np.ndarray(n)) -> row and column scale factors
+    """
+
+    B = _abs(A)
+
+    row = 1 / _extremes(B, axis=1)[0]
+    B = sp.diags(row).dot(B).tocsc()
+
+    col = 1 / _extremes(B, axis=0)[0]
+
+    return _power_of_two(row), _power_of_two(col)
+
+
+def geometric(A):
+    """
+    Alternates row and column scaling by 1 / sqrt(max|a| * min|a|) until
+    the spread of magnitudes stops shrinking, then equilibrates.
+
+    Parameters: A: list[list[float]], np.ndarray or scipy.sparse matrix (m, n)
+
+    Returns: (np.ndarray(m), np.ndarray(n)) -> row and column scale factors
+    """
+
+    B = _abs(A)
+    m, n = B.shape
+
+    row, col = np.ones(m), np.ones(n)
+    spread = _spread(B)
+
+    for _ in range(GEOMETRIC_PASSES):
+        largest, smallest = _extremes(B, axis=1)
+        r = 1 / np.sqrt(largest * smallest)
+        B = sp.diags(r).dot(B).tocsr()
+
+        largest, smallest = _extremes(B, axis=0)
+        c = 1 / np.sqrt(largest * smallest)
+        B = B.dot(sp.diags(c)).tocsr()
+
+        row, col = row * r, col * c
+
+        previous, spread = spread, _spread(B)
+
+        if spread > GEOMETRIC_IMPROVEMENT * previous:
+            break
+
+    r, c = equilibration(B)
+
+    return _power_of_two(row * r), _power_of_two(col * c)
+
+
+SCALINGS = {
+    'geometric': geometric,
+    'equilibration': equilibration,
+}
+
+
+def scale_factors(A, method):
+    """
+    Computes row and column scale factors, the scaled matrix is R * A * S.
+
+    Parameters: A: list[list[float]], np.ndarray or scipy.sparse matrix (m, n)
+                method: str -> could be ['geometric', 'equilibration']
+
+    Returns: (np.ndarray(m), np.ndarray(n))
+    """
+
+    if method not in SCALINGS:
+        raise ValueError("Unknown scaling: {}".format(method))
+
+    return SCALINGS[method](A)
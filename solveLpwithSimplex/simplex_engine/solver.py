@@ -0,0 +1,2213 @@
+import copy
+import functools
+import hashlib
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+from .factorization import make_factorization
+from .presolve import presolve
+from .pricing import OPTIMALITY_TOL, Bland, make_pricing
+from .scaling import scale_factors
+from .storage import memmap_block, transposed_dot
+
+# smallest pivot element accepted by the ratio test
+PIVOT_TOL = 1e-9
+
+# basic values above -FEASIBILITY_TOL are treated as non-negative
+FEASIBILITY_TOL = 1e-9
+
+# statuses of a solve stopped by max_iterations, time_limit or progress
+STOP_STATUSES = ("IterationLimit", "TimeLimit", "Cancelled")
+
+# progress is called every PROGRESS_EVERY pivots
+PROGRESS_EVERY = 10
+
+# storage='auto' switches to sparse tableau below this density
+SPARSE_DENSITY = 0.05
+
+# and only when constraint matrix has at least this many entries
+SPARSE_MIN_SIZE = 10000
+
+
+def _dense_column(A, j):
+    if sp.issparse(A):
+        return A[:, j].toarray().ravel()
+    return A[:, j]
+
+
+def _memmap(shape, work_dir=None):
+    """
+    Creates a zeroed column-major array backed by an unnamed file in work_dir,
+    the file goes away with the array.
+    """
+    with tempfile.TemporaryFile(dir=work_dir) as file:
+        return np.memmap(file, dtype=float, mode='w+', shape=shape, order='F')
+
+
+def _step_range(x, direction, upper):
+    """
+    Gets the interval of t keeping 0 <= x + t * direction <= upper,
+    ends are -inf and inf when nothing blocks the step.
+    """
+    up = direction > PIVOT_TOL
+    down = direction < -PIVOT_TOL
+    bounded = np.isfinite(upper)
+
+    low = max(np.max(-x[up] / direction[up], initial=-np.inf),
+              np.max((upper - x)[down & bounded] / direction[down & bounded], initial=-np.inf))
+    high = min(np.min(-x[down] / direction[down], initial=np.inf),
+               np.min((upper - x)[up & bounded] / direction[up & bounded], initial=np.inf))
+
+    # round off may leave x slightly out of its bounds
+    return min(low, 0.0), max(high, 0.0)
+
+
+def _finite(value):
+    return float(value) if np.isfinite(value) else None
+
+
+def _timed(phase):
+    """
+    Decorates a simplex run of LpProblem, its seconds are added to timings
+    under phase and reported to on_phase. 'primal' is 'phase_one' or
+    'phase_two' by phase_one.
+    """
+    
+    def decorate(method):
+        
+        @functools.wraps(method)
+        def timed(self):
+            start, iterations = time.perf_counter(), self.iterations
+            
+            try:
+                return method(self)
+            finally:
+                name = phase if phase != 'primal' else 'phase_one' if self.phase_one else 'phase_two'
+                self._phase_ended(name, start, self.iterations - iterations)
+            
+        return timed
+    
+    return decorate
+
+
+def _lowest(positions, variables):
+    # Bland's tie break, position holding the smallest variable index
+    return positions[np.argmin(np.asarray(variables)[positions])]
+
+
+class _CycleDetector():
+    """
+    Remembers bases left by degenerate pivots since the objective last
+    moved. Leaving one of them again means the pivoting rule cycles.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.seen = set()
+        self.cycling = False
+
+    def pivot(self, basics, degenerate):
+        if not self.enabled:
+            return
+
+        if not degenerate:
+            self.seen.clear()
+            self.cycling = False
+            return
+
+        key = hash(np.sort(basics).tobytes())
+        self.cycling = self.cycling or key in self.seen
+        self.seen.add(key)
+
+
+class LpProblem():
+
+    def __init__(self, sense='max', factorization=None, refactor_every=None, storage='auto', method=None, pricing='dantzig',
+                 presolve=False, scaling=None, anti_cycling=True, max_iterations=None, time_limit=None,
+                 progress=None, on_phase=None, work_dir=None):
+        """
+        Initializes a lp problem. 
+
+        Parameters: sense: str -> could be ['max', 'min']
+                    factorization: str -> could be ['explicit', 'lu']
+                                   'explicit' keeps a dense B inverse,
+                                   'lu' keeps LU of the starting basis and an eta file
+                                   defaults to 'explicit' for dense and 'lu' for sparse and memmap storage
+                    refactor_every: int -> refactorize basis after this many pivots
+                    storage: str -> could be ['auto', 'dense', 'sparse', 'memmap']
+                             'auto' uses sparse CSC tableau for large problems
+                             with density below SPARSE_DENSITY
+                             'memmap' keeps the dense tableau in a file under work_dir,
+                             columns are read in blocks and never copied as a whole
+                    method: str -> could be ['primal', 'dual']
+                            'primal' uses two phase method with artificials,
+                            min problems are transposed by find_dual
+                            'dual' rewrites rows as '<=' and uses dual simplex,
+                            no artificials or transposition
+                            defaults to 'dual' for min and 'primal' for max
+                    pricing: str -> could be ['dantzig', 'partial', 'multiple', 'devex', 'steepest']
+                             entering variable rule of primal simplex
+                    presolve: bool -> reduces the problem in rhs, solution then
+                              only holds the original variables
+                    scaling: str -> could be [None, 'geometric', 'equilibration']
+                             scales rows and columns before the tableau is built,
+                             solution, Z and duals are unscaled
+                    anti_cycling: bool -> switches to Bland's rule while degenerate
+                                  pivots return to an already visited basis
+                    max_iterations: int -> pivots per solve over both phases,
+                                    default 50 * (m + n), status is 'IterationLimit' when reached
+                    time_limit: float -> seconds per solve, status is 'TimeLimit' when reached
+                    progress: callable(iterations, objective) -> called every PROGRESS_EVERY pivots,
+                              objective is None in the 1st phase, returning False
+                              stops the solve with status 'Cancelled'
+                    on_phase: callable(phase, seconds, iterations) -> called when 'presolve', 'build'
+                              (tableau layout and scaling), 'phase_one', 'phase_two' or 'dual' ends,
+                              iterations is None for presolve and build
+                    work_dir: str -> directory of the memmap tableau file, defaults to the temp directory
+
+        Returns: None
+        """
+        self.Z = 0
+        self.sense = sense
+        self.factorization = factorization
+        self.refactor_every = refactor_every
+        self.storage = storage
+        self.method = method
+        self.pricing = pricing
+        self.presolve = presolve
+        self.presolved = None
+        self.scaling = scaling
+        self.row_scale = None
+        self.col_scale = None
+        self.duals = None
+        self.anti_cycling = anti_cycling
+        self.max_iterations = max_iterations
+        self.time_limit = time_limit
+        self.deadline = None
+        self.progress = progress
+        self.on_phase = on_phase
+        self.work_dir = work_dir
+        self.phase_one = False
+        self.iterations = 0
+        self.pivots = 0
+        self.refactorizations = 0
+        self.timings = {}
+        self.table = []
+        self.tableau = None
+        self.factor = None
+        self.artificials = None
+        self.two_phase = False
+        self.transposed = False
+        self.negated = False
+        self.lower = None
+        self.upper = None
+        self.flipped = None
+        self.status = "Unsolved"
+
+
+    def objective(self, obj):
+        """
+        Set objective parameters.
+
+        Parameters: obj: list[float] 
+                         len: n
+
+        Returns: None
+        """
+
+        self.objective = obj
+        self.n = len(obj)
+        self.table.append(obj)
+
+
+    def constraints(self, constraints):
+        """
+        Set constraint parameters.
+
+        Parameters: constraints: list[list[float]] or scipy.sparse matrix
+                                 len: m
+                                 len: n
+
+        Returns: None
+        """
+
+        self.constraints = constraints
+        self.m = constraints.shape[0] if sp.issparse(constraints) else len(constraints)
+        
+
+    def constraint_senses(self, senses):
+        """
+        Set constraint senses.
+
+        Parameters: senses: list[str]
+                            len: m
+
+        Returns: None
+        """
+        
+        self.const_senses = senses
+
+
+    def bounds(self, lower=None, upper=None):
+        """
+        Set variable bounds, lower <= x <= upper. Must be set before rhs,
+        lower bounds are shifted into the right hand side. Upper bounds
+        are not added as rows, simplex complements a variable between
+        its bounds instead.
+
+        Parameters: lower: list[float] len: n, defaults to 0
+                    upper: list[float] len: n, None or inf entries are unbounded
+
+        Returns: None
+        """
+        
+        lower = np.zeros(self.n) if lower is None else np.array(lower, dtype=float)
+        upper = [np.inf] * self.n if upper is None else upper
+        upper = np.array([np.inf if u is None else u for u in upper], dtype=float)
+        
+        if not np.all(np.isfinite(lower)):
+            raise ValueError("Lower bounds must be finite")
+        
+        if np.any(upper < lower):
+            raise ValueError("Lower bound is above upper bound")
+        
+        self.lower = lower
+        self.upper = upper
+
+
+    def rhs(self, rhs):
+        """
+        Set right hand side values for constraints.
+
+        Parameters: rhs: list[float]
+                         len: m
+
+        Return: None
+        """
+        
+        if self.presolve:
+            start = time.perf_counter()
+            rhs = self._presolve(rhs)
+            self._phase_ended('presolve', start)
+            
+            if rhs is None:
+                return
+
+        self.rhs_values = list(rhs)
+
+        # x = lower + x', rhs becomes b - A * lower
+        self.rhs_shift = np.zeros(len(rhs))
+        
+        if self.lower is not None and np.any(self.lower != 0):
+            if sp.issparse(self.constraints):
+                self.rhs_shift = self.constraints.dot(self.lower)
+            else:
+                self.rhs_shift = np.dot(np.array(self.constraints, dtype=float), self.lower)
+            rhs = [r - shift for r, shift in zip(rhs, self.rhs_shift)]
+
+        self.RHS = rhs
+        signs = np.ones(len(rhs))
+        
+        for i in range(len(rhs)):
+            if rhs[i] < 0:
+                signs[i] = -1
+                self.RHS[i] = rhs[i] * -1
+                
+                if not sp.issparse(self.constraints):
+                    self.constraints[i] = [r * -1 for r in self.constraints[i]]
+                
+                if self.const_senses[i] == '<=':
+                    self.const_senses[i] = '>='
+                elif self.const_senses[i] == '>=':
+                    self.const_senses[i] = '<='
+                    
+        if sp.issparse(self.constraints) and np.any(signs < 0):
+            self.constraints = sp.diags(signs).dot(self.constraints)
+            
+        # original row and sign of every tableau row
+        self.row_map = [(i, signs[i]) for i in range(len(rhs))]
+                    
+        self.RHS.insert(0, self.Z)
+                
+
+    def _presolve(self, rhs):
+        """
+        Replaces the problem with its presolved form.
+
+        Parameters: rhs: list[float]
+                         len: m
+
+        Return: list[float] -> rhs of the reduced problem,
+                               None if presolve solved or rejected the problem
+        """
+        
+        self.presolved = presolve(self.objective, self.constraints, self.const_senses, rhs,
+                                  self.lower, self.upper, self.sense)
+        
+        if self.presolved.status != "Reduced":
+            return None
+        
+        obj, constraints, senses, rhs, lower, upper = self.presolved.reduced()
+        
+        if not sp.issparse(self.constraints):
+            constraints = constraints.toarray().tolist()
+        
+        self.objective = obj
+        self.n = len(obj)
+        self.table = [obj]
+        self.constraints = constraints
+        self.m = len(rhs)
+        self.const_senses = senses
+        self.bounds(lower, upper)
+        
+        return rhs
+    
+    
+    def _tableau_format(self):
+        """
+        Adds slack variables. Surplus columns of '>=' rows are laid out
+        with them, so the 1st phase needs no new columns.
+
+        Parameters: None
+
+        Return: None
+        """
+        
+        # presolve solved or rejected the problem, there is nothing to build
+        if self.presolved is not None and self.presolved.status != "Reduced":
+            return
+        
+        start = time.perf_counter()
+        
+        if self.method is None:
+            self.method = 'dual' if self.sense == 'min' else 'primal'
+            
+        if self.method == 'dual':
+            self._dual_rows()
+            
+        self.row_scale, self.col_scale = np.ones(self.m), np.ones(self.n)
+        
+        if self.scaling is not None:
+            self._scale()
+            
+        # bounded or scaled min problems are not transposed, bounds and scales belong to columns,
+        # a memmap tableau is not copied into a transposed one
+        transpose = self.sense == 'min' and not (self.method == 'dual' or self.lower is not None
+                                                 or self.scaling is not None or self.storage == 'memmap')
+        
+        # rows of the surplus columns, find_dual turns '>=' rows into '<=' ones
+        surplus = [] if transpose else [i for i, sense in enumerate(self.const_senses) if sense == '>=']
+        
+        if self._use_sparse():
+            self._sparse_tableau_format(surplus)
+        elif self.storage == 'memmap':
+            self.RHS = np.array(self.RHS, dtype=float)
+            self.tableau = _memmap((self.m + 1, self.n + len(surplus) + self.m + 1), self.work_dir)
+            self._fill_tableau(surplus)
+        else:
+            self.RHS = np.array(self.RHS, dtype=float)
+            self.tableau = np.zeros((self.m + 1, self.n + len(surplus) + self.m + 1))
+            self._fill_tableau(surplus)
+        
+        self.flipped = np.zeros(self.n, dtype=bool)
+        self.n += len(surplus)
+        self.nonbasics = list(range(self.n)) 
+        self.basics = list(range(self.n, self.n + self.m))
+        
+        if self.sense == 'min' and not transpose:
+            # min c * x as max -c * x
+            self._set_row(0, -self._row(0))
+            self.negated = True
+        elif self.sense == 'min':
+            self.find_dual()
+   
+        if not all(sense == '<=' for sense in self.const_senses):
+            self.two_phase = True
+            
+        self._phase_ended('build', start)
+            
+            
+    def _dual_rows(self):
+        """
+        Rewrites constraints as '<=' rows for dual simplex.
+        '>=' rows are negated and '==' rows are split into two rows.
+
+        Parameters: None
+
+        Return: None
+        """
+        
+        rows = []
+        
+        for i, sense in enumerate(self.const_senses):
+            if sense in ('<=', '=='):
+                rows.append((i, 1))
+            if sense in ('>=', '=='):
+                rows.append((i, -1))
+                
+        if sp.issparse(self.constraints):
+            index = [i for i, sign in rows]
+            signs = np.array([sign for i, sign in rows], dtype=float)
+            self.constraints = sp.diags(signs).dot(sp.csr_matrix(self.constraints)[index])
+        else:
+            self.constraints = [[sign * a for a in self.constraints[i]] for i, sign in rows]
+            
+        self.RHS = [self.RHS[0]] + [sign * self.RHS[i+1] for i, sign in rows]
+        self.row_map = [(self.row_map[i][0], self.row_map[i][1] * sign) for i, sign in rows]
+        self.const_senses = ['<='] * len(rows)
+        self.m = len(rows)
+        
+        
+    def _scale(self):
+        """
+        Replaces constraints, rhs and objective row with R * A * S, R * b and c * S.
+        self.objective keeps the unscaled costs.
+
+        Parameters: None
+
+        Return: None
+        """
+        
+        self.row_scale, self.col_scale = scale_factors(self.constraints, self.scaling)
+        
+        if sp.issparse(self.constraints):
+            self.constraints = sp.diags(self.row_scale).dot(self.constraints).dot(sp.diags(self.col_scale))
+        else:
+            A = np.array(self.constraints, dtype=float).reshape(self.m, self.n)
+            self.constraints = (A * self.row_scale[:, np.newaxis] * self.col_scale).tolist()
+            
+        self.RHS = [self.RHS[0]] + list(np.array(self.RHS[1:], dtype=float) * self.row_scale)
+        self.table[0] = list(np.array(self.objective, dtype=float) * self.col_scale)
+        
+        
+    def _use_sparse(self):
+        """
+        Decides tableau storage from `storage` and constraint density.
+
+        Parameters: None
+
+        Returns: bool
+        """
+        
+        if self.storage != 'auto':
+            return self.storage == 'sparse'
+        
+        if sp.issparse(self.constraints):
+            return True
+        
+        size = self.m * self.n
+        
+        if size < SPARSE_MIN_SIZE:
+            return False
+        
+        return np.count_nonzero(self.constraints) / size < SPARSE_DENSITY
+    
+    
+    def _sparse_tableau_format(self, surplus):
+        """
+        Builds tableau as a CSC matrix: [c 0 0 Z; A S I b],
+        S holds the surplus columns of '>=' rows.
+
+        Parameters: surplus: list[int] -> rows of the surplus columns
+
+        Return: None
+        """
+        
+        c = sp.csc_matrix(np.array(self.table[0], dtype=float))
+        A = sp.csc_matrix(self.constraints, dtype=float)
+        
+        self.RHS = np.array(self.RHS, dtype=float)
+        
+        S = sp.csc_matrix((-np.ones(len(surplus)), (surplus, np.arange(len(surplus)))),
+                          shape=(self.m, len(surplus)))
+        
+        self.tableau = sp.bmat([[c, sp.csc_matrix((1, len(surplus))), None, sp.csc_matrix(self.RHS[:1, np.newaxis])],
+                                [A, S, sp.identity(self.m, format='csc'), sp.csc_matrix(self.RHS[1:, np.newaxis])]],
+                               format='csc')
+        
+        
+    def _fill_tableau(self, surplus):
+        """
+        Writes [c 0 0 Z; A S I b] into a zeroed dense or memmap tableau,
+        constraint rows are converted one block at a time.
+
+        Parameters: surplus: list[int] -> rows of the surplus columns
+
+        Return: None
+        """
+        
+        m, n, k = self.m, self.n, len(surplus)
+        
+        self.tableau[0, :n] = self.table[0]
+        self.tableau[0, -1] = self.RHS[0]
+        
+        block = memmap_block(n)
+        
+        for start in range(0, m, block):
+            end = min(start + block, m)
+            
+            if sp.issparse(self.constraints):
+                rows = self.constraints[start:end].toarray()
+            else:
+                rows = np.array(self.constraints[start:end], dtype=float).reshape(end - start, n)
+                
+            self.tableau[start+1:end+1, :n] = rows
+            
+        self.tableau[np.array(surplus, dtype=int) + 1, n + np.arange(k)] = -1
+        
+        rows = np.arange(m)
+        self.tableau[rows + 1, n + k + rows] = 1
+        self.tableau[1:, -1] = self.RHS[1:]
+        
+        
+    def _row_sum(self, rows):
+        """
+        Sums tableau rows, dense and memmap tableaus one column block at a time.
+
+        Parameters: rows: list[int]
+
+        Returns: np.ndarray
+        """
+        
+        if sp.issparse(self.tableau):
+            return np.asarray(self.tableau[rows].sum(axis=0)).ravel()
+        
+        total = np.zeros(self.tableau.shape[1])
+        block = memmap_block(max(len(rows), 1))
+        
+        for start in range(0, len(total), block):
+            total[start:start+block] = self.tableau[rows, start:start+block].sum(axis=0)
+            
+        return total
+        
+        
+    def _row(self, i):
+        if sp.issparse(self.tableau):
+            return self.tableau[i].toarray().ravel()
+        return self.tableau[i]
+    
+    
+    def _set_row(self, i, values):
+        if sp.issparse(self.tableau):
+            rows = [self.tableau[:i], sp.csr_matrix(values), self.tableau[i+1:]]
+            self.tableau = sp.vstack([r for r in rows if r.shape[0] > 0], format='csc')
+        else:
+            self.tableau[i] = values
+            
+            
+    def _set_rhs_column(self, b):
+        if sp.issparse(self.tableau):
+            rhs = sp.csc_matrix(np.concatenate((self._row(0)[-1:], b))[:, np.newaxis])
+            self.tableau = sp.hstack([self.tableau[:, :-1], rhs], format='csc')
+        else:
+            self.tableau[1:, -1] = b
+            
+            
+    def _column_upper(self):
+        """
+        Gets upper bounds of tableau columns after the lower bound shift,
+        inf for slack, surplus and artificial columns.
+
+        Parameters: None
+
+        Returns: np.ndarray
+        """
+        
+        upper = np.full(self.tableau.shape[1] - 1, np.inf)
+        
+        if self.upper is not None:
+            upper[:len(self.upper)] = (self.upper - self.lower) / self.col_scale
+            
+        return upper
+    
+    
+    def _flip(self, j):
+        """
+        Complements nonbasic column j between its bounds, x_j = u_j - x_j'.
+        Column j and its cost change sign and b becomes b - a_j * u_j.
+
+        Parameters: j: int
+
+        Returns: None
+        """
+        
+        column = _dense_column(self.tableau, j)
+        b = _dense_column(self.tableau[1:], -1) - column[1:] * self._column_upper()[j]
+        
+        if sp.issparse(self.tableau):
+            signs = np.ones(self.tableau.shape[1])
+            signs[j] = -1
+            self.tableau = self.tableau.dot(sp.diags(signs)).tocsc()
+            self._set_rhs_column(b)
+        else:
+            self.tableau[:, j] = -column
+            self.tableau[1:, -1] = b
+            
+        self.flipped[j] = not self.flipped[j]
+        
+        
+    def _flip_signs(self):
+        """
+        Gets -1 for complemented structural columns, 1 for the others.
+
+        Parameters: None
+
+        Returns: np.ndarray
+        """
+        
+        return np.where(self.flipped, -1.0, 1.0)
+        
+        
+    def _mark_artificials(self):
+        """
+        Marks the unit columns of '>=' and '==' rows as artificials
+        and starts from the basis of all unit columns.
+
+        Parameters: None
+
+        Returns: None
+        """
+        
+        self.artificials = np.zeros(self.tableau.shape[1] - 1, dtype=bool)
+        self.artificials[[self.n + i for i, sense in enumerate(self.const_senses) if sense != '<=']] = True
+        
+        self.nonbasics = list(range(self.n)) 
+        self.basics = list(range(self.n, self.n + self.m))
+        
+        
+    def _add_artificials(self):
+        """
+        Adds artificals if initial basic solution is not feasible.
+        They are the unit columns of '>=' and '==' rows already in
+        the tableau, only row 0 changes.
+
+        Parameters: None
+
+        Returns: None
+    
+        """
+        
+        self._mark_artificials()
+        
+        # 1st phase maximizes -(sum of artificials)
+        row0 = self._row(0).copy()
+        row0[:-1] = self.artificials
+        
+        # eliminate artificial ones in the row 0
+        row0 -= self._row_sum(list(np.flatnonzero(self.artificials[self.n:]) + 1))
+            
+        # convert to -Z to Z 
+        row0 *= -1
+        self._set_row(0, row0)
+            
+            
+    def remove_artificials(self):
+        """
+        Removes artificals variables from the nonbasics, their columns stay in
+        the tableau but never enter again. Artificials still basic at zero
+        level are pivoted out first, those of redundant rows stay basic.
+        
+        Parameters: None
+        
+        Returns: None
+        """
+        
+        A = self.tableau[1:, :-1]
+        
+        for row in np.flatnonzero(self.artificials[self.basics]):
+            for k, j in enumerate(self.nonbasics):
+                if self.artificials[j]:
+                    continue
+                
+                alpha = self.factor.ftran(_dense_column(A, j))
+                
+                if abs(alpha[row]) > PIVOT_TOL:
+                    self.factor.update(row, alpha)
+                    self.basics[row], self.nonbasics[k] = j, self.basics[row]
+                    break
+        
+        self.nonbasics = [j for j in self.nonbasics if not self.artificials[j]]
+              
+           
+        
+    def remove_inconsistency(self, obj):
+        """
+        Sets obj values to row 0 in tableau. 
+        Revised simplex prices from c_b * B_inv, so row 0 only needs
+        the original costs with zeros for slack and surplus columns.
+        
+        Parameters: obj: np.ndarray((n, m), dtype='float')
+        
+        Returns: bool -> False if 1st phase left an artificial positive
+        """
+        
+        if self.phase_one_infeasible:
+            return False
+        
+        self._set_row(0, np.array(obj, dtype=float))
+        
+        return True
+    
+    
+    def find_dual(self):
+        
+        if sp.issparse(self.tableau):
+            self._sparse_find_dual()
+            return
+            
+        for i in range(len(self.const_senses)):
+            if self.const_senses[i] == '>=':
+                self.const_senses[i] = '<='
+            elif self.const_senses[i] == '<=':
+                self.tableau[i+1] = -self.tableau[i+1]
+                self.const_senses[i] = "<="
+                                            
+        self.transposed = True
+        
+        tableu_copy = np.zeros((self.n + 1, self.m + self.n + 1))
+    
+        tableu_copy[0, :self.m] = self.tableau[1:, -1]    
+        tableu_copy[1:, :self.m] = np.transpose(self.tableau[1:, :self.n])
+        tableu_copy[1:, -1] = np.transpose(self.tableau[0, :self.n])
+        tableu_copy[1:, self.m:self.m+self.n] = np.eye(self.n)
+        
+        self.tableau = tableu_copy
+        self.m, self.n = self.n, self.m
+        
+        self.nonbasics = list(range(self.n)) 
+        self.basics = list(range(self.n, self.n + self.m))
+        
+        
+    def _sparse_find_dual(self):
+        
+        signs = np.ones(self.m + 1)
+        
+        for i in range(len(self.const_senses)):
+            if self.const_senses[i] == '>=':
+                self.const_senses[i] = '<='
+            elif self.const_senses[i] == '<=':
+                signs[i+1] = -1
+                self.const_senses[i] = "<="
+                
+        self.transposed = True
+        
+        tableau = sp.diags(signs).dot(self.tableau).tocsc()
+        
+        b = tableau[1:, -1].T
+        A = tableau[1:, :self.n]
+        c = tableau[0, :self.n].T
+        
+        self.tableau = sp.bmat([[b, None, None],
+                                [A.T, sp.identity(self.n, format='csc'), c]], format='csc')
+            
+        self.m, self.n = self.n, self.m
+        
+        self.nonbasics = list(range(self.n)) 
+        self.basics = list(range(self.n, self.n + self.m))
+          
+            
+    def _B_inv(self):
+        return self.factor.inverse()
+    
+    
+    def _A(self):
+        return self.tableau[1:, self.nonbasics]
+    
+    
+    def _c_b(self):
+        return self.tableau[0, self.basics]
+    
+    
+    def _c_n(self):
+        return self.tableau[0, self.nonbasics]
+
+         
+    def _factorize(self, A):
+        """
+        Factorizes current basis, unless the factorization of the
+        previous phase or solve still describes it.
+
+        Parameters: A: constraint block of tableau
+
+        Returns: None
+        """
+        
+        if self.factor is not None:
+            return
+        
+        factorization = self.factorization
+        if factorization is None:
+            factorization = 'lu' if sp.issparse(self.tableau) or isinstance(self.tableau, np.memmap) else 'explicit'
+ 
+        # factorize initial basis
+        self.factor = make_factorization(factorization, self.refactor_every)
+        self.factor.factorize(self._basis(A))
+        
+        
+    def _basis(self, A):
+        """
+        Gets basis columns of A, as CSC for a memmap tableau
+        so the basis is never held densely.
+
+        Parameters: A: constraint block of tableau
+
+        Returns: np.ndarray or scipy.sparse.csc_matrix
+        """
+        
+        if not isinstance(A, np.memmap):
+            return A[:, self.basics]
+        
+        block = memmap_block(self.m)
+        
+        return sp.hstack([sp.csc_matrix(A[:, self.basics[k:k+block]]) for k in range(0, self.m, block)],
+                         format='csc')
+        
+        
+    @_timed('primal')
+    def _simplex(self):
+        """
+        Applys revised simplex method until Optimal point found or solution infeasible.
+
+        Parameters: None
+
+        Returns: None
+        """
+ 
+        # row 0, constraint block and rhs are read once per phase,
+        # A is a view for dense storage and a CSC slice for sparse storage
+        cost = self._row(0).copy()
+        A = self.tableau[1:, :-1]
+        b = _dense_column(self.tableau[1:], -1).copy()
+        upper = self._column_upper()
+        
+        self._factorize(A)
+        iteration = 0
+        
+        pricer = make_pricing(self.pricing)
+        pricer.reset(A, self.factor, self.basics, self.nonbasics)
+        
+        # Bland's rule is used while degenerate pivots cycle
+        cycle = _CycleDetector(self.anti_cycling)
+        bland = Bland()
+        
+        while True:
+            
+            limit = self._limit_reached(iteration)
+            
+            if limit is not None:
+                self.status = limit
+                self.iterations += iteration
+                return
+            
+            # drop eta file and factorize current basis
+            if self.factor.needs_refactor():
+                self.factor.factorize(self._basis(A))
+                self.refactorizations += 1
+        
+            # update RHS
+            x_b = self.factor.ftran(b)
+            
+            if not self._report(iteration, x_b):
+                self.iterations += iteration
+                return
+            
+            c_b = cost[self.basics]
+            
+            # w = c_b * B_inv
+            w = self.factor.btran(c_b)
+                        
+            # find entering variable, None if no z_n - c_n is positive
+            rule = bland if cycle.cycling else pricer
+            pivot_col = rule.select(cost, A, w, self.nonbasics)
+            
+            if pivot_col is None:
+                self.status = "Optimal"
+                break
+            
+            enters = self.nonbasics[pivot_col]
+            
+            # B_inv * entering column
+            alpha = self.factor.ftran(_dense_column(A, enters))
+            
+            # entries below PIVOT_TOL are round-off, not pivot candidates,
+            # basics decrease to 0 on positive and increase to their upper bound on negative entries
+            upper_b = upper[self.basics]
+            positive = alpha > PIVOT_TOL
+            negative = (alpha < -PIVOT_TOL) & np.isfinite(upper_b)
+            
+            if not np.any(positive | negative) and np.isinf(upper[enters]):
+                self.status = 'Unbounded'
+                self.iterations += iteration
+                return
+                       
+            # rhs / pivot_col
+            theta = np.full(self.m, np.inf)
+            theta[positive] = x_b[positive] / alpha[positive]
+            theta[negative] = np.maximum((x_b[negative] - upper_b[negative]) / alpha[negative], 0)
+            
+            # entering variable reaches its own upper bound first, basis does not change
+            if upper[enters] <= np.min(theta):
+                self._flip(enters)
+                cost, A, b = self._row(0).copy(), self.tableau[1:, :-1], _dense_column(self.tableau[1:], -1).copy()
+                cycle.pivot(self.basics, False)
+                iteration += 1
+                continue
+                
+            # find leaving variable, ties go to the smallest basic index under Bland's rule
+            pivot_row = np.argmin(theta)
+            
+            if cycle.cycling:
+                pivot_row = _lowest(np.flatnonzero(theta <= theta[pivot_row] + PIVOT_TOL), self.basics)
+                
+            cycle.pivot(self.basics, theta[pivot_row] <= PIVOT_TOL)
+            
+            # weights are updated against the old basis
+            pricer.update(A, self.factor, self.basics, self.nonbasics, pivot_row, pivot_col, alpha)
+            
+            self.factor.update(pivot_row, alpha)
+                        
+            leaves = self.basics[pivot_row]
+            
+            self.basics[pivot_row] = enters
+                        
+            self.nonbasics[pivot_col] = leaves
+            
+            # leaving variable stays nonbasic at its upper bound
+            if negative[pivot_row]:
+                self._flip(leaves)
+                cost, A, b = self._row(0).copy(), self.tableau[1:, :-1], _dense_column(self.tableau[1:], -1).copy()
+            
+            self.pivots += 1
+            iteration += 1
+
+        self.iterations += iteration
+        
+        self._store_solution(cost, b)
+        
+        
+    @_timed('dual')
+    def _dual_simplex(self):
+        """
+        Applys dual simplex method from a dual feasible basis
+        until primal feasible point found or solution infeasible.
+
+        Parameters: None
+
+        Returns: None
+        """
+        
+        cost = self._row(0).copy()
+        A = self.tableau[1:, :-1]
+        b = _dense_column(self.tableau[1:], -1).copy()
+        
+        upper = self._column_upper()
+        
+        self._factorize(A)
+        iteration = 0
+        
+        # Bland's rule is used while dual degenerate pivots cycle
+        cycle = _CycleDetector(self.anti_cycling)
+        
+        while True:
+            
+            limit = self._limit_reached(iteration)
+            
+            if limit is not None:
+                self.status = limit
+                self.iterations += iteration
+                return
+            
+            # drop eta file and factorize current basis
+            if self.factor.needs_refactor():
+                self.factor.factorize(self._basis(A))
+                self.refactorizations += 1
+                
+            x_b = self.factor.ftran(b)
+            
+            if not self._report(iteration, x_b):
+                self.iterations += iteration
+                return
+            
+            # find leaving variable, basic with largest bound violation
+            # or the smallest infeasible basic index under Bland's rule
+            upper_b = upper[self.basics]
+            violation = np.maximum(-x_b, x_b - upper_b)
+            pivot_row = np.argmax(violation)
+            
+            if violation[pivot_row] <= FEASIBILITY_TOL:
+                break
+            
+            if cycle.cycling:
+                pivot_row = _lowest(np.flatnonzero(violation > FEASIBILITY_TOL), self.basics)
+            
+            to_upper = x_b[pivot_row] > upper_b[pivot_row]
+            
+            # pivot row of B_inv * A
+            e = np.zeros(self.m)
+            e[pivot_row] = 1
+            alpha_r = transposed_dot(A, self.factor.btran(e))[self.nonbasics]
+            
+            # z_n - c_n, non-positive in a dual feasible basis
+            w = self.factor.btran(cost[self.basics])
+            z_n_c_n = (cost[:-1] - transposed_dot(A, w))[self.nonbasics]
+            
+            # a variable above its upper bound leaves through the negated row
+            if to_upper:
+                alpha_r = -alpha_r
+            
+            negative = alpha_r < -PIVOT_TOL
+            
+            if not np.any(negative):
+                self.status = "infeasible"
+                self.iterations += iteration
+                return
+            
+            # dual ratio test
+            ratios = np.full(len(self.nonbasics), np.inf)
+            ratios[negative] = z_n_c_n[negative] / alpha_r[negative]
+            
+            # find entering variable
+            pivot_col = np.argmin(ratios)
+            
+            if cycle.cycling:
+                pivot_col = _lowest(np.flatnonzero(ratios <= ratios[pivot_col] + OPTIMALITY_TOL), self.nonbasics)
+                
+            cycle.pivot(self.basics, ratios[pivot_col] <= OPTIMALITY_TOL)
+            
+            alpha = self.factor.ftran(_dense_column(A, self.nonbasics[pivot_col]))
+            
+            self.factor.update(pivot_row, alpha)
+            
+            enters = self.nonbasics[pivot_col]
+            leaves = self.basics[pivot_row]
+            
+            self.basics[pivot_row] = enters
+            self.nonbasics[pivot_col] = leaves
+            
+            if to_upper:
+                self._flip(leaves)
+                cost, A, b = self._row(0).copy(), self.tableau[1:, :-1], _dense_column(self.tableau[1:], -1).copy()
+            
+            self.pivots += 1
+            iteration += 1
+            
+        self.iterations += iteration
+        
+        self._store_solution(cost, b)
+        
+        
+    def _store_solution(self, cost, b):
+        """
+        Sets x_b, Z and solution from the current basis.
+
+        Parameters: cost: np.ndarray -> row 0
+                    b: np.ndarray -> rhs
+
+        Returns: None
+        """
+
+        # update RHS, b stays in tableau for the next phase
+        x_b = self.factor.ftran(b)
+        self.x_b = x_b
+
+        # update Z
+        self.Z = np.dot(cost[self.basics], x_b)
+        
+        if self.negated:
+            self.Z = -self.Z
+        
+        sol = {}
+        
+        for i in range(self.m):
+            sol[self.basics[i]] = x_b[i]
+        
+        self.solution = list(range(self.n + self.m))
+        
+        for i in range(len(self.solution)):
+            if i in sol.keys():
+                self.solution[i] = sol[i]
+            else:
+                self.solution[i] = 0
+                
+        if self.lower is not None or self.scaling is not None:
+            self._unscale_solution()
+            
+        self._store_duals(cost)
+            
+        if self.presolved is not None:
+            self._postsolve(self.solution[:len(self.lower)])
+            
+        self.status = "Optimal"
+        
+        
+    def _unscale_solution(self):
+        """
+        Undoes complements, scaling and the lower bound shift in solution.
+
+        Parameters: None
+
+        Returns: None
+        """
+        
+        n = len(self.flipped)
+        x = np.array(self.solution, dtype=float)
+        
+        if self.lower is not None:
+            upper = self._column_upper()[:n]
+            x[:n][self.flipped] = upper[self.flipped] - x[:n][self.flipped]
+            
+        if self.scaling is not None:
+            x[:n] *= self.col_scale
+            
+            # slack, surplus and artificial columns have a single nonzero in their row,
+            # solution may run past the last tableau column after '==' artificials are removed
+            end = min(len(x), self.tableau.shape[1] - 1)
+            
+            if end > n:
+                x[n:end] /= self.row_scale[self._column_rows(n, end)]
+                
+        if self.lower is not None:
+            x[:n] += self.lower
+            self.Z = np.dot(self.objective[:n], x[:n])
+            
+        self.solution = list(x)
+        
+        
+    def _column_rows(self, start, end):
+        """
+        Gets the constraint row of the largest entry of each tableau column
+        in start:end. A memory-mapped tableau is read in column blocks.
+
+        Parameters: start: int -> first column
+                    end: int -> column after the last
+
+        Returns: np.ndarray(dtype='int')
+        """
+
+        if not isinstance(self.tableau, np.memmap):
+            return np.asarray(abs(self.tableau[1:, start:end]).argmax(axis=0)).ravel()
+
+        rows = np.empty(end - start, dtype=int)
+        block = memmap_block(self.tableau.shape[0] - 1)
+
+        for first in range(start, end, block):
+            last = min(first + block, end)
+            rows[first-start:last-start] = abs(self.tableau[1:, first:last]).argmax(axis=0)
+
+        return rows
+
+
+    def _store_duals(self, cost):
+        """
+        Sets duals, one shadow price per original constraint.
+        Left as None for transposed and presolved problems.
+
+        Parameters: cost: np.ndarray -> row 0
+
+        Returns: None
+        """
+        
+        if self.transposed or self.presolved is not None:
+            return
+        
+        w = self.factor.btran(cost[self.basics]) * self.row_scale
+        
+        if self.negated:
+            w = -w
+            
+        self.duals = np.zeros(len(self.rhs_shift))
+        
+        # split rows add up, flipped rows change sign
+        for k, (i, sign) in enumerate(self.row_map):
+            self.duals[i] += sign * w[k]
+        
+        
+    def _postsolve(self, x):
+        """
+        Sets solution and Z of the original problem from a reduced solution.
+
+        Parameters: x: list[float] -> reduced problem variables
+
+        Returns: None
+        """
+        
+        self.solution = list(self.presolved.postsolve(x))
+        self.Z = self.presolved.objective_value(self.solution)
+
+    def solve(self, warm_start=None):
+        """
+        Solves lp problem. Applies two phase method if needed.
+
+        Parameters: warm_start: BasisStore -> starts from the stored optimal basis
+                                of a problem with the same structure and saves
+                                the new optimal basis
+
+        Returns: None
+        """
+        
+        if self.presolved is not None and self.presolved.status != "Reduced":
+            self.status = self.presolved.status
+            
+            if self.status == "Optimal":
+                self._postsolve([])
+            return
+        
+        self._start_clock()
+        
+        if warm_start is not None:
+            basis = warm_start.load(self)
+            
+            if basis is not None:
+                self._start_from(basis)
+            else:
+                self._solve()
+                
+            warm_start.save(self)
+            return
+        
+        self._solve()
+        
+        
+    def resolve(self, rhs=None, objective=None):
+        """
+        Re-solves after changing rhs and/or objective, starting from the
+        current optimal basis and factorization. A rhs change runs dual
+        simplex, an objective change runs primal simplex, both run one
+        after the other.
+
+        Parameters: rhs: list[float] len: m
+                    obj: list[float] len: n
+
+        Returns: None
+        """
+        
+        if self.transposed:
+            raise ValueError("Warm start is not available for problems solved through find_dual")
+        
+        if self.presolved is not None:
+            raise ValueError("Warm start is not available for presolved problems")
+        
+        self.iterations = 0
+        self.pivots = 0
+        self.refactorizations = 0
+        self.timings = {}
+        self._start_clock()
+        
+        if rhs is not None:
+            self.rhs_values = list(rhs)
+            b = np.array([sign * (rhs[i] - self.rhs_shift[i]) for i, sign in self.row_map], dtype=float)
+            b *= self.row_scale
+            
+            # complemented columns keep b - a_j * u_j
+            for j in np.flatnonzero(self.flipped):
+                b += _dense_column(self.tableau[1:], j) * self._column_upper()[j]
+                
+            self._set_rhs_column(b)
+            
+            # with both changed, dual simplex first restores feasibility under
+            # the old costs, then primal simplex prices the new costs
+            if objective is not None:
+                self._warm_solve()
+                
+                if self.status != "Optimal":
+                    return
+            
+        if objective is not None:
+            self._set_costs(objective)
+            
+        self._warm_solve()
+        
+        
+    def _set_costs(self, objective):
+        """
+        Replaces the costs of the structural columns in row 0.
+
+        Parameters: objective: list[float] len: n
+
+        Returns: None
+        """
+        
+        self.objective = list(objective)
+        row0 = self._row(0).copy()
+        row0[:len(objective)] = (-np.array(objective) if self.negated else np.array(objective)) * self.col_scale
+        row0[:len(self.flipped)] *= self._flip_signs()
+        self._set_row(0, row0)
+        
+        
+    def sweep(self, scenarios, chain=False, time_limit=None):
+        """
+        Solves what-if scenarios of the solved problem one after another
+        with resolve, each warm started from this problem's optimal basis.
+        The problem is left at the last scenario.
+
+        Parameters: scenarios: list[dict] -> {'rhs': list[float], 'objective': list[float]},
+                               a missing key keeps the base value
+                    chain: bool -> starts each scenario from the optimal basis of the
+                           previous one instead, fewer pivots when neighbouring
+                           scenarios are close as in a parametric sweep
+                    time_limit: float -> seconds for the whole sweep, scenarios left
+                                when it is reached get status 'TimeLimit'
+
+        Returns: list[dict] -> {'status', 'Z', 'solution', 'iterations'} per scenario,
+                 Z and solution are None unless 'Optimal'
+        """
+        
+        if self.status != "Optimal":
+            raise ValueError("Scenarios start from an optimal basis, problem is {}".format(self.status))
+        
+        base = (list(self.basics), list(self.nonbasics), self.flipped.copy())
+        rhs, objective = list(self.rhs_values), list(self.objective)
+        n = len(self.flipped)
+        results = []
+        
+        # every resolve stops at the sweep's deadline, not only at its own time_limit
+        solve_limit = self.time_limit
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        
+        try:
+            for scenario in scenarios:
+                if deadline is not None:
+                    left = deadline - time.perf_counter()
+                    
+                    if left <= 0:
+                        results.append({'status': "TimeLimit", 'Z': None, 'solution': None, 'iterations': 0})
+                        continue
+                    
+                    self.time_limit = left if solve_limit is None else min(solve_limit, left)
+                
+                costs = list(scenario.get('objective', objective))
+                self.resolve(scenario.get('rhs', rhs), costs if costs != self.objective else None)
+                optimal = self.status == "Optimal"
+                
+                results.append({
+                    'status': self.status,
+                    'Z': float(self.Z) if optimal else None,
+                    'solution': [float(x) for x in self.solution[:n]] if optimal else None,
+                    'iterations': self.iterations,
+                })
+                
+                # a basis without an optimum is no start for the next scenario
+                if not (chain and optimal):
+                    self._restore_basis(base)
+                    
+                    if self.objective != objective:
+                        self._set_costs(objective)
+        finally:
+            self.time_limit = solve_limit
+                
+        return results
+    
+    
+    def _restore_basis(self, basis):
+        """
+        Goes back to a basis saved by sweep, columns are complemented
+        back to its bounds and the basis is factorized again if it changed.
+
+        Parameters: basis: (list[int], list[int], np.ndarray) -> basics, nonbasics, flipped
+
+        Returns: None
+        """
+        
+        flips = np.flatnonzero(self.flipped != basis[2])
+        
+        if not len(flips) and self.basics == basis[0]:
+            return
+        
+        for j in flips:
+            self._flip(j)
+            
+        self.basics, self.nonbasics = list(basis[0]), list(basis[1])
+        self.factor = None
+        
+        
+    def sensitivity(self):
+        """
+        Sensitivity analysis of the optimal solution, read from the final
+        basis and its factorization without solving again. A range is the
+        interval one rhs or one objective coefficient can move in, all others
+        fixed, while the basis stays optimal, None ends are unbounded.
+
+        Parameters: None
+
+        Returns: dict -> 'duals': list[float] len: m, shadow prices
+                         'reduced_costs': list[float] len: n
+                         'rhs_ranges': list[(float, float)] len: m
+                         'objective_ranges': list[(float, float)] len: n
+                 None unless solved to 'Optimal', transposed and
+                 presolved problems have no basis of the original rows
+        """
+        
+        if self.status != "Optimal" or self.transposed or self.presolved is not None:
+            return None
+        
+        A = self.tableau[1:, :-1]
+        cost = self._row(0)[:-1]
+        n = len(self.flipped)
+        
+        # c_j - z_j of every column, non-positive for the nonbasics at the optimum
+        d = cost - transposed_dot(A, self.factor.btran(cost[self.basics]))
+        
+        # change of an internal cost per unit change of an original one
+        gain = self.col_scale[:n] * self._flip_signs() * (-1.0 if self.negated else 1.0)
+        position = {j: r for r, j in enumerate(self.basics)}
+        
+        return {
+            'duals': [float(dual) for dual in self.duals],
+            'reduced_costs': [0.0 if j in position else float(d[j] / gain[j]) for j in range(n)],
+            'rhs_ranges': self._rhs_ranges(),
+            'objective_ranges': [self._objective_range(j, gain[j], position.get(j), d, A) for j in range(n)],
+        }
+        
+        
+    def _rhs_ranges(self):
+        """
+        Gets the rhs ranges of sensitivity. Moving an original rhs by t
+        moves x_b by t * B^-1 v, v holding its signed and scaled tableau rows.
+
+        Parameters: None
+
+        Returns: list[(float, float)]
+        """
+        
+        V = np.zeros((self.m, len(self.rhs_shift)))
+        
+        for k, (i, sign) in enumerate(self.row_map):
+            V[k, i] += sign * self.row_scale[k]
+            
+        directions = self.factor.ftran(V)
+        upper = self._column_upper()[self.basics]
+        ranges = []
+        
+        for i, b in enumerate(self.rhs_values):
+            low, high = _step_range(self.x_b, directions[:, i], upper)
+            ranges.append((_finite(b + low), _finite(b + high)))
+            
+        return ranges
+    
+    
+    def _objective_range(self, j, gain, r, d, A):
+        """
+        Gets the objective range of structural column j for sensitivity.
+        A nonbasic column stays out while its c_j - z_j stays non-positive,
+        changing the cost of the basic of row r by t changes every
+        c_k - z_k by -t * (B^-1 A)_rk.
+
+        Parameters: j: int
+                    gain: float -> internal cost change per unit of c_j
+                    r: int -> basis row of j, None if j is nonbasic
+                    d: np.ndarray -> c - z of all columns
+                    A: np.ndarray or scipy.sparse.csc_matrix
+
+        Returns: (float, float)
+        """
+        
+        if r is None:
+            low, high = -np.inf, max(-d[j], 0.0)
+        else:
+            e = np.zeros(self.m)
+            e[r] = 1
+            
+            nonbasics = np.asarray(self.nonbasics)
+            alpha = transposed_dot(A, self.factor.btran(e))[nonbasics]
+            d_n = d[nonbasics]
+            
+            low = min(np.max(d_n[alpha > PIVOT_TOL] / alpha[alpha > PIVOT_TOL], initial=-np.inf), 0.0)
+            high = max(np.min(d_n[alpha < -PIVOT_TOL] / alpha[alpha < -PIVOT_TOL], initial=np.inf), 0.0)
+            
+        low, high = (low / gain, high / gain) if gain > 0 else (high / gain, low / gain)
+        
+        return _finite(self.objective[j] + low), _finite(self.objective[j] + high)
+        
+        
+    def _phase_ended(self, phase, start, iterations=None):
+        """
+        Adds the seconds since start to timings[phase] and calls on_phase.
+
+        Parameters: phase: str -> 'presolve', 'build', 'phase_one', 'phase_two' or 'dual'
+                    start: float -> time.perf_counter() at the start of the phase
+                    iterations: int -> pivots and bound flips of the phase
+
+        Returns: None
+        """
+        
+        seconds = time.perf_counter() - start
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+        
+        if self.on_phase is not None:
+            self.on_phase(phase, seconds, iterations)
+        
+        
+    def _start_clock(self):
+        self.deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        
+        
+    def _limit_reached(self, iteration):
+        """
+        Checks max_iterations and time_limit of the running solve.
+
+        Parameters: iteration: int -> pivots of the running phase
+
+        Returns: str -> 'IterationLimit', 'TimeLimit' or None
+        """
+        
+        limit = self.max_iterations or 50 * (self.m + self.tableau.shape[1])
+        
+        if self.iterations + iteration >= limit:
+            return "IterationLimit"
+        
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return "TimeLimit"
+        
+        return None
+        
+        
+    def _report(self, iteration, x_b):
+        """
+        Calls progress every PROGRESS_EVERY pivots.
+
+        Parameters: iteration: int -> pivots of the running phase
+                    x_b: np.ndarray(m) -> current basic values
+
+        Returns: bool -> False if progress cancelled the solve
+        """
+        
+        if self.progress is None or iteration % PROGRESS_EVERY:
+            return True
+        
+        objective = None if self.phase_one else self._current_objective(x_b)
+        
+        if self.progress(self.iterations + iteration, objective) is False:
+            self.status = "Cancelled"
+            return False
+        
+        return True
+        
+        
+    def _current_objective(self, x_b):
+        """
+        Computes the original objective at the current basis.
+
+        Parameters: x_b: np.ndarray(m)
+
+        Returns: float, None for problems solved through find_dual
+        """
+        
+        if self.transposed:
+            return None
+        
+        n = len(self.flipped)
+        basics = np.asarray(self.basics)
+        structural = basics < n
+        
+        x = np.zeros(n)
+        x[basics[structural]] = x_b[structural]
+        
+        if self.lower is not None:
+            upper = self._column_upper()[:n]
+            x[self.flipped] = upper[self.flipped] - x[self.flipped]
+            
+        x = x * self.col_scale
+        
+        if self.lower is not None:
+            x += self.lower
+            
+        if self.presolved is not None:
+            return float(self.presolved.objective_value(self.presolved.postsolve(x)))
+        
+        return float(np.dot(self.objective[:n], x))
+        
+        
+    def _start_from(self, basis):
+        """
+        Replaces slack basis with a stored basis and solves from it.
+
+        Parameters: basis: (list[int], list[int]) -> basics, nonbasics
+
+        Returns: None
+        """
+        
+        if self.two_phase:
+            self._phase_two_layout()
+            
+        self.basics, self.nonbasics = list(basis[0]), list(basis[1])
+        self.factor = None
+        
+        upper = self._column_upper()
+        
+        for j in np.flatnonzero(basis[2]):
+            if np.isfinite(upper[j]):
+                self._flip(j)
+        
+        self._warm_solve()
+        
+        
+    def _phase_two_layout(self):
+        """
+        Leaves the artificials out of the nonbasics
+        without running the 1st phase.
+
+        Parameters: None
+
+        Returns: None
+        """
+        
+        obj = self._row(0).copy()
+        
+        self._mark_artificials()
+        self.nonbasics = [j for j in self.nonbasics if not self.artificials[j]]
+        
+        self.phase_one_infeasible = False
+        self.remove_inconsistency(obj)
+        
+        
+    def _warm_solve(self):
+        """
+        Chooses primal or dual simplex for the current basis.
+        If the basis is neither primal nor dual feasible, dual simplex
+        with zero costs finds a feasible basis first.
+
+        Parameters: None
+
+        Returns: None
+        """
+        
+        A = self.tableau[1:, :-1]
+        self._factorize(A)
+        
+        cost = self._row(0).copy()
+        x_b = self.factor.ftran(_dense_column(self.tableau[1:], -1).copy())
+        upper = self._column_upper()
+        
+        if np.all(x_b >= -FEASIBILITY_TOL) and np.all(x_b <= upper[self.basics] + FEASIBILITY_TOL):
+            self._simplex()
+            return
+        
+        w = self.factor.btran(cost[self.basics])
+        z_n_c_n = (cost[:-1] - transposed_dot(A, w))[self.nonbasics]
+        
+        # boxed nonbasics with positive z_n - c_n are dual feasible at their upper bound
+        boxed = [j for j, d in zip(self.nonbasics, z_n_c_n) if d > OPTIMALITY_TOL and np.isfinite(upper[j])]
+        
+        if boxed:
+            for j in boxed:
+                self._flip(j)
+            self._warm_solve()
+            return
+        
+        if np.all(z_n_c_n <= OPTIMALITY_TOL):
+            self._dual_simplex()
+            return
+        
+        flipped = self.flipped.copy()
+        
+        self._set_row(0, np.zeros(len(cost)))
+        self._dual_simplex()
+        
+        # columns complemented by the dual phase change the sign of their cost
+        cost[:len(flipped)] *= np.where(flipped != self.flipped, -1.0, 1.0)
+        self._set_row(0, cost)
+        
+        if self.status == "Optimal":
+            self._simplex()
+            
+            
+    def _solve(self):
+        
+        # dual simplex from slack basis, no artificials
+        if self.method == 'dual':
+            self._warm_solve()
+            return
+        
+        # if initial bfs solve in 1 phase
+        if not self.two_phase:
+            self._simplex()
+            return
+
+        # save objective for 2nd phase
+        obj = self._row(0).copy()
+        flipped = self.flipped.copy()
+        
+        # if no initial bfs then add artificials.
+        self._add_artificials()
+        
+        # 1st Phase
+        self.phase_one = True
+        self._simplex()
+        self.phase_one = False
+        
+        if self.status in STOP_STATUSES:
+            return
+        
+        self.phase_one_infeasible = np.any(self.x_b[self.artificials[self.basics]] > FEASIBILITY_TOL)
+    
+        # remove artificials and set initial objective
+        self.remove_artificials()
+        
+        # columns complemented in 1st phase change the sign of their cost
+        obj[:len(flipped)] *= np.where(flipped != self.flipped, -1.0, 1.0)
+        
+        # remove inconsistency
+        # if we can not remove inconsistency we return infeasible
+        if not self.remove_inconsistency(obj):
+            self.status = "infeasible"
+            return
+        
+        # 2nd Phase
+        self._simplex()        
+
+
+class BasisStore():
+
+    def __init__(self, max_size=128):
+        """
+        Keeps optimal bases of solved problems keyed by their structure
+        (sense, constraint senses and coefficients), rhs and objective
+        are not part of the key.
+
+        Parameters: max_size: int -> bases kept, least recently used dropped first
+
+        Returns: None
+        """
+        self.max_size = max_size
+        self.bases = OrderedDict()
+        
+        
+    def key(self, lp):
+        """
+        Hashes the structure of lp. Dense coefficients are hashed in column
+        blocks, a memory-mapped tableau is never read as a whole and gets
+        the key of the same tableau in memory.
+
+        Parameters: lp: LpProblem
+
+        Returns: str
+        """
+        n = len(lp.objective)
+        A = lp.tableau[1:, :n]
+        
+        # key of the uncomplemented columns
+        signs = np.ones(n)
+        
+        if lp.flipped is not None and np.any(lp.flipped):
+            signs[:len(lp.flipped)] = lp._flip_signs()
+        
+        digest = hashlib.sha1()
+        digest.update(','.join([lp.sense] + list(lp.const_senses)).encode())
+        
+        if sp.issparse(A):
+            A = sp.csc_matrix(A.dot(sp.diags(signs)))
+            A.sort_indices()
+            for part in (A.data, A.indices, A.indptr):
+                digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            block = memmap_block(A.shape[0])
+            
+            for start in range(0, n, block):
+                columns = np.asarray(A[:, start:start+block], dtype=float) * signs[start:start+block]
+                digest.update(np.ascontiguousarray(columns).tobytes())
+            
+        return digest.hexdigest()
+    
+    
+    def load(self, lp):
+        if lp.transposed:
+            return None
+        
+        key = self.key(lp)
+        
+        if key not in self.bases:
+            return None
+        
+        self.bases.move_to_end(key)
+        return self.bases[key]
+    
+    
+    def save(self, lp):
+        if lp.transposed or lp.status != "Optimal":
+            return
+        
+        self.bases[self.key(lp)] = (list(lp.basics), list(lp.nonbasics), lp.flipped.copy())
+        
+        while len(self.bases) > self.max_size:
+            self.bases.popitem(last=False)
+
+
+class LpBatch():
+
+    def __init__(self, sense='max', max_iterations=None):
+        """
+        Initializes a batch of K lp problems with the same shape.
+        All problems are stacked into one (K, m+1, cols) tableau and
+        pricing, ratio test and pivots run for every problem at once.
+
+        Parameters: sense: str -> could be ['max', 'min']
+                    max_iterations: int -> pivots per phase, default 50 * (m + n)
+
+        Returns: None
+        """
+        self.sense = sense
+        self.max_iterations = max_iterations
+        self.iterations = 0
+
+
+    def objective(self, objs):
+        """
+        Set objective parameters.
+
+        Parameters: objs: list[list[float]] or np.ndarray((K, n))
+
+        Returns: None
+        """
+
+        self.objs = np.array(objs, dtype=float)
+        self.K, self.n = self.objs.shape
+
+
+    def constraints(self, constraints):
+        """
+        Set constraint parameters.
+
+        Parameters: constraints: np.ndarray((K, m, n))
+
+        Returns: None
+        """
+
+        self.A = np.array(constraints, dtype=float)
+        self.m = self.A.shape[1]
+
+
+    def constraint_senses(self, senses):
+        """
+        Set constraint senses, shared by all problems or one list per problem.
+
+        Parameters: senses: list[str] len: m or list[list[str]] shape: (K, m)
+
+        Returns: None
+        """
+
+        self.const_senses = np.broadcast_to(np.array(senses), (self.K, self.m)).copy()
+
+
+    def rhs(self, rhs):
+        """
+        Set right hand side values for constraints.
+        Rows with negative rhs are multiplied by -1 and their senses flipped.
+
+        Parameters: rhs: np.ndarray((K, m))
+
+        Return: None
+        """
+
+        self.RHS = np.array(rhs, dtype=float)
+
+        negative = self.RHS < 0
+
+        self.A[negative] *= -1
+        self.RHS[negative] *= -1
+
+        less = self.const_senses == '<='
+        greater = self.const_senses == '>='
+        self.const_senses[negative & less] = '>='
+        self.const_senses[negative & greater] = '<='
+
+
+    def _tableau_format(self):
+        """
+        Builds (K, m+1, n + m + m + 1) tableau: [A S R b].
+        Every row gets a slack/surplus column S (0 for '==') and an artificial
+        column R, artificials are only basic for '>=' and '==' rows.
+
+        Parameters: None
+
+        Return: None
+        """
+
+        K, m, n = self.K, self.m, self.n
+
+        self.cols = n + 2 * m
+        self.tableau = np.zeros((K, m + 1, self.cols + 1))
+
+        slack = np.where(self.const_senses == '<=', 1.0, np.where(self.const_senses == '>=', -1.0, 0.0))
+        rows = np.arange(m)
+
+        self.tableau[:, 1:, :n] = self.A
+        self.tableau[:, 1 + rows, n + rows] = slack
+        self.tableau[:, 1 + rows, n + m + rows] = 1
+        self.tableau[:, 1:, -1] = self.RHS
+
+        self.basics = np.where(self.const_senses == '<=', n + rows, n + m + rows)
+
+        # artificial columns never enter
+        self.allowed = np.ones((K, self.cols), dtype=bool)
+        self.allowed[:, n + m:] = False
+
+        self.status = np.full(K, 'Unsolved', dtype=object)
+
+
+    def _set_objective(self, c):
+        """
+        Writes reduced costs c - c_b * B_inv * A and -Z into row 0.
+
+        Parameters: c: np.ndarray((K, cols))
+
+        Returns: None
+        """
+
+        c_b = np.take_along_axis(c, self.basics, axis=1)
+
+        self.tableau[:, 0, :-1] = c - np.einsum('km,kmj->kj', c_b, self.tableau[:, 1:, :-1])
+        self.tableau[:, 0, -1] = -np.einsum('km,km->k', c_b, self.tableau[:, 1:, -1])
+
+
+    def _pivot(self, idx, pivot_row, pivot_col):
+        """
+        Pivots tableaus idx on (pivot_row, pivot_col) at once.
+
+        Parameters: idx: np.ndarray(int) -> problems to pivot
+                    pivot_row: np.ndarray(int) -> constraint row, 0 based
+                    pivot_col: np.ndarray(int)
+
+        Returns: None
+        """
+
+        T = self.tableau[idx]
+        k = np.arange(len(idx))
+
+        col = T[k, :, pivot_col]
+        row = T[k, pivot_row + 1, :] / col[k, pivot_row + 1][:, np.newaxis]
+
+        T -= col[:, :, np.newaxis] * row[:, np.newaxis, :]
+        T[k, pivot_row + 1, :] = row
+
+        self.tableau[idx] = T
+        self.basics[idx, pivot_row] = pivot_col
+
+
+    def _simplex(self, running):
+        """
+        Applys tableau simplex to every running problem until all of them
+        are optimal or unbounded.
+
+        Parameters: running: np.ndarray(bool) -> problems taking part in this phase
+
+        Returns: np.ndarray(bool) -> problems found unbounded
+        """
+
+        unbounded = np.zeros(self.K, dtype=bool)
+        limit = self.max_iterations or 50 * (self.m + self.n)
+
+        for _ in range(limit):
+            reduced = np.where(self.allowed, self.tableau[:, 0, :-1], -np.inf)
+
+            # find entering variable
+            pivot_col = np.argmax(reduced, axis=1)
+            running = running & (reduced[np.arange(self.K), pivot_col] > OPTIMALITY_TOL)
+
+            if not np.any(running):
+                break
+
+            idx = np.flatnonzero(running)
+
+            alpha = self.tableau[idx, 1:, pivot_col[idx]]
+            x_b = self.tableau[idx, 1:, -1]
+
+            # rhs / pivot_col
+            positive = alpha > PIVOT_TOL
+            theta = np.where(positive, x_b / np.where(positive, alpha, 1), np.inf)
+
+            no_limit = ~np.any(positive, axis=1)
+            unbounded[idx[no_limit]] = True
+            running[idx[no_limit]] = False
+
+            keep = ~no_limit
+
+            if np.any(keep):
+                # find leaving variable
+                pivot_row = np.argmin(theta[keep], axis=1)
+                self._pivot(idx[keep], pivot_row, pivot_col[idx[keep]])
+
+            self.iterations += 1
+        else:
+            self.status[running] = 'IterationLimit'
+
+        return unbounded
+
+
+    def _remove_artificials(self, feasible):
+        """
+        Pivots artificials still basic at zero level out of the basis.
+        Rows without a nonzero structural entry are redundant and keep them.
+
+        Parameters: feasible: np.ndarray(bool)
+
+        Returns: None
+        """
+
+        first_artificial = self.n + self.m
+
+        for i in range(self.m):
+            idx = np.flatnonzero(feasible & (self.basics[:, i] >= first_artificial))
+
+            if len(idx) == 0:
+                continue
+
+            entries = np.abs(self.tableau[idx, i + 1, :first_artificial])
+            pivot_col = np.argmax(entries, axis=1)
+
+            nonzero = entries[np.arange(len(idx)), pivot_col] > PIVOT_TOL
+
+            if np.any(nonzero):
+                self._pivot(idx[nonzero], np.full(np.count_nonzero(nonzero), i), pivot_col[nonzero])
+
+
+    def solve(self):
+        """
+        Solves all problems with two phase tableau simplex.
+        Sets status, Z and solution for every problem.
+
+        Parameters: None
+
+        Returns: None
+        """
+
+        self._tableau_format()
+
+        K, m, n = self.K, self.m, self.n
+        first_artificial = n + m
+
+        # 1st Phase, maximize -sum of artificials
+        c = np.zeros((K, self.cols))
+        c[:, first_artificial:] = -1
+        self._set_objective(c)
+
+        needs_phase_one = np.any(self.basics >= first_artificial, axis=1)
+        self._simplex(needs_phase_one.copy())
+
+        infeasible = -self.tableau[:, 0, -1] < -1e-9
+        self.status[infeasible] = 'infeasible'
+
+        feasible = self.status == 'Unsolved'
+        self._remove_artificials(feasible)
+
+        # 2nd Phase
+        c = np.zeros((K, self.cols))
+        c[:, :n] = self.objs if self.sense == 'max' else -self.objs
+        self._set_objective(c)
+
+        unbounded = self._simplex(feasible.copy())
+
+        self.status[feasible & unbounded] = 'Unbounded'
+        self.status[self.status == 'Unsolved'] = 'Optimal'
+
+        self.Z = -self.tableau[:, 0, -1] if self.sense == 'max' else self.tableau[:, 0, -1]
+
+        values = np.zeros((K, self.cols))
+        np.put_along_axis(values, self.basics, self.tableau[:, 1:, -1], axis=1)
+
+        self.solution = values[:, :n + m]
+
+        optimal = self.status == 'Optimal'
+        self.Z = np.where(optimal, self.Z, np.nan)
+
+
+def solve_many(objectives, constraints, senses, rhs, sense='max'):
+    """
+    Solves K lp problems with the same shape in one vectorized batch.
+
+    Parameters: objectives: np.ndarray((K, n))
+                constraints: np.ndarray((K, m, n))
+                senses: list[str] len: m or np.ndarray((K, m))
+                rhs: np.ndarray((K, m))
+                sense: str -> could be ['max', 'min']
+
+    Returns: LpBatch -> status, Z and solution arrays of length K
+    """
+
+    batch = LpBatch(sense=sense)
+    batch.objective(objectives)
+    batch.constraints(constraints)
+    batch.constraint_senses(senses)
+    batch.rhs(rhs)
+    batch.solve()
+
+    return batch
+
+
+def scenario_branches(scenarios, count):
+    """
+    Splits scenarios into at most count branches of consecutive scenarios,
+    neighbours of a parametric sweep stay in the same branch.
+
+    Parameters: scenarios: list
+                count: int
+
+    Returns: list[list]
+    """
+
+    count = max(1, min(count, len(scenarios)))
+
+    return [list(scenarios[branch[0]:branch[-1] + 1]) for branch in np.array_split(np.arange(len(scenarios)), count)
+            if len(branch)]
+
+
+def parametric(base, direction, start, stop, steps):
+    """
+    Gets base + t * direction for steps values of t from start to stop,
+    rhs or objective vectors of a parametric sweep.
+
+    Parameters: base: list[float]
+                direction: list[float]
+                start: float
+                stop: float
+                steps: int
+
+    Returns: list[list[float]]
+    """
+
+    base, direction = np.array(base, dtype=float), np.array(direction, dtype=float)
+
+    return [list(base + t * direction) for t in np.linspace(start, stop, steps)]
+
+
+def _sweep_branch(lp, scenarios, chain, time_limit):
+    return lp.sweep(scenarios, chain, time_limit)
+
+
+def sweep(lp, scenarios, workers=1, chain=False, time_limit=None):
+    """
+    Solves scenarios of a solved LpProblem with LpProblem.sweep. With more
+    than one worker they are split by scenario_branches and the branches
+    run in worker processes, each on a copy of lp starting from its optimal
+    basis.
+
+    Parameters: lp: LpProblem -> solved to 'Optimal'
+                scenarios: list[dict] -> {'rhs': list[float], 'objective': list[float]}
+                workers: int
+                chain: bool -> see LpProblem.sweep
+                time_limit: float -> seconds for the whole sweep, branches run side by side
+                            and each stops there
+
+    Returns: list[dict] -> LpProblem.sweep results in scenario order
+    """
+
+    branches = scenario_branches(scenarios, workers)
+
+    if len(branches) < 2:
+        return lp.sweep(scenarios, chain, time_limit)
+
+    # LU factors of scipy, progress and on_phase callbacks are not picklable
+    base = copy.copy(lp)
+    base.factor = None
+    base.progress = None
+    base.on_phase = None
+
+    with ProcessPoolExecutor(max_workers=len(branches)) as pool:
+        results = pool.map(_sweep_branch, [base] * len(branches), branches, [chain] * len(branches),
+                           [time_limit] * len(branches))
+
+        return [result for branch in results for result in branch]
@@ -0,0 +1,37 @@
+import numpy as np
+
+# bytes of a memory-mapped tableau read at once
+MEMMAP_BLOCK_SIZE = 2 ** 24
+
+
+def memmap_block(length):
+    """
+    Gets how many columns (or rows) of `length` floats make a memmap block.
+
+    Returns: int
+    """
+
+    return max(1, MEMMAP_BLOCK_SIZE // (8 * length))
+
+
+def transposed_dot(A, v):
+    """
+    Computes A.T * v. A memory-mapped A is read in column blocks
+    of MEMMAP_BLOCK_SIZE bytes, never as a whole.
+
+    Parameters: A: constraint block of tableau
+                v: np.ndarray(m)
+
+    Returns: np.ndarray
+    """
+
+    if not isinstance(A, np.memmap):
+        return A.T.dot(v)
+
+    product = np.empty(A.shape[1])
+    block = memmap_block(A.shape[0])
+
+    for start in range(0, A.shape[1], block):
+        product[start:start+block] = A[:, start:start+block].T.dot(v)
+
+    return product
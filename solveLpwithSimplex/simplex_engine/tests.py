@@ -0,0 +1,526 @@
+import io
+import itertools
+import os
+import unittest
+from unittest import mock
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+from .assignment import solve_assignment, solve_assignments
+from .benchmark import (BEALE, badly_scaled_lp, degenerate_lp, random_covering_lp, random_lp, random_redundant_lp,
+                        random_sparse_lp, random_transportation, transportation_lp)
+from .presolve import presolve
+from .readers import read_model
+from .solver import BasisStore, LpProblem, _CycleDetector, parametric, scenario_branches, solve_many, sweep
+from .transportation import solve_transportation
+
+CORPUS = os.path.join(os.path.dirname(__file__), 'corpus')
+
+# the problem of the corpus' wyndor.mps
+WYNDOR = ([3, 5], [[1, 0], [0, 2], [3, 2]], ['<='] * 3, [4, 12, 18])
+
+# max -x s.t. 5x == 16, -4x <= -7, optimum -3.2 with no nonbasic column left
+SINGLE_COLUMN = ([-1], [[5], [-4]], ['==', '<='], [16, -7])
+
+
+def build(problem, sense='max', lower=None, upper=None, **kwargs):
+    """
+    Builds an engine LpProblem of a benchmark problem, ready to solve.
+
+    Parameters: problem: tuple -> (obj, constraints, senses, rhs)
+                sense: str -> could be ['max', 'min']
+                lower: list[float] -> variable lower bounds
+                upper: list[float] -> variable upper bounds
+                kwargs: LpProblem arguments
+
+    Returns: LpProblem
+    """
+
+    obj, constraints, senses, rhs = problem
+
+    lp = LpProblem(sense, **kwargs)
+    lp.objective(list(obj))
+    lp.constraints(constraints if sp.issparse(constraints) else [list(row) for row in constraints])
+    lp.constraint_senses(list(senses))
+
+    if lower is not None or upper is not None:
+        lp.bounds(lower, upper)
+
+    lp.rhs(list(rhs))
+    lp._tableau_format()
+
+    return lp
+
+
+def solved(problem, sense='max', lower=None, upper=None, **kwargs):
+    lp = build(problem, sense, lower, upper, **kwargs)
+    lp.solve()
+
+    return lp
+
+
+def reference(problem, sense='max', lower=None, upper=None):
+    """
+    Solves a benchmark problem with scipy's HiGHS.
+
+    Returns: scipy.optimize.OptimizeResult, fun is the optimum in the problem's sense
+    """
+
+    obj, constraints, senses, rhs = problem
+    A = constraints.toarray() if sp.issparse(constraints) else np.array(constraints, dtype=float)
+    rhs = np.array(rhs, dtype=float)
+    signs = np.array([-1.0 if sense == '>=' else 1.0 for sense in senses])
+    equal = np.array([sense in ('=', '==') for sense in senses])
+
+    n = A.shape[1]
+    lower = [0.0] * n if lower is None else lower
+    upper = [None] * n if upper is None else upper
+    cost = -np.array(obj, dtype=float) if sense == 'max' else np.array(obj, dtype=float)
+
+    result = linprog(cost,
+                     A_ub=(A * signs[:, np.newaxis])[~equal] if np.any(~equal) else None,
+                     b_ub=(rhs * signs)[~equal] if np.any(~equal) else None,
+                     A_eq=A[equal] if np.any(equal) else None,
+                     b_eq=rhs[equal] if np.any(equal) else None,
+                     bounds=list(zip(lower, upper)), method='highs')
+
+    if result.status == 0 and sense == 'max':
+        result.fun = -result.fun
+
+    return result
+
+
+class EngineTestCase(unittest.TestCase):
+
+    def assertOptimal(self, lp, problem, sense='max', lower=None, upper=None):
+        """
+        Checks lp reached the HiGHS optimum of problem with a feasible solution.
+        """
+
+        expected = reference(problem, sense, lower, upper)
+
+        self.assertEqual(lp.status, 'Optimal')
+        self.assertAlmostEqual(lp.Z, expected.fun, delta=1e-6 * max(1.0, abs(expected.fun)))
+
+        obj, constraints, senses, rhs = problem
+        A = constraints.toarray() if sp.issparse(constraints) else np.array(constraints, dtype=float)
+        x = np.array(lp.solution[:A.shape[1]], dtype=float)
+        activity = A.dot(x)
+        tolerance = 1e-6 * max(1.0, np.abs(rhs).max())
+
+        for row, (value, row_sense, bound) in enumerate(zip(activity, senses, rhs)):
+            if row_sense == '<=':
+                self.assertLessEqual(value, bound + tolerance, 'row {}'.format(row))
+            elif row_sense == '>=':
+                self.assertGreaterEqual(value, bound - tolerance, 'row {}'.format(row))
+            else:
+                self.assertAlmostEqual(value, bound, delta=tolerance, msg='row {}'.format(row))
+
+        self.assertAlmostEqual(float(np.dot(obj, x)), expected.fun, delta=1e-6 * max(1.0, abs(expected.fun)))
+
+
+class KnownOptimaTests(EngineTestCase):
+
+    def test_wyndor(self):
+        lp = solved(WYNDOR)
+
+        self.assertEqual(lp.status, 'Optimal')
+        self.assertAlmostEqual(lp.Z, 36.0)
+        np.testing.assert_allclose(lp.solution[:2], [2.0, 6.0])
+        np.testing.assert_allclose(lp.duals, [0.0, 1.5, 1.0], atol=1e-9)
+
+    def test_min_problem(self):
+        problem = random_covering_lp(8, 6, seed=1)
+
+        self.assertOptimal(solved(problem, 'min', method='dual'), problem, 'min')
+
+        # find_dual solves the transposed problem, only Z is that of the original one
+        lp = solved(problem, 'min', method='primal')
+        self.assertTrue(lp.transposed)
+        self.assertAlmostEqual(lp.Z, reference(problem, 'min').fun)
+
+    def test_infeasible(self):
+        lp = solved(([1, 1], [[1, 1], [1, 1]], ['<=', '>='], [1, 2]))
+
+        self.assertEqual(lp.status, 'infeasible')
+
+    def test_unbounded(self):
+        lp = solved(([1, 1], [[1, -1]], ['<='], [1]))
+
+        self.assertEqual(lp.status, 'Unbounded')
+
+    def test_variable_order_past_ten_columns(self):
+        # x10 and x11 must not sort before x2
+        n = 12
+        obj = [float(j + 1) for j in range(n)]
+        problem = (obj, np.eye(n).tolist(), ['<='] * n, [float(j) for j in range(n)])
+        lp = solved(problem)
+
+        np.testing.assert_allclose(lp.solution[:n], range(n))
+
+
+class FactorizationTests(EngineTestCase):
+
+    def test_factorizations(self):
+        problem = random_lp(20, 30, seed=2)
+
+        for factorization, refactor_every in (('explicit', None), ('lu', None), ('lu', 3)):
+            with self.subTest(factorization=factorization, refactor_every=refactor_every):
+                lp = solved(problem, factorization=factorization, refactor_every=refactor_every)
+                self.assertOptimal(lp, problem)
+
+
+class StorageTests(EngineTestCase):
+
+    def test_storages(self):
+        problem = random_sparse_lp(30, 40, 0.1, seed=3)
+
+        for storage in ('dense', 'sparse', 'memmap', 'auto'):
+            with self.subTest(storage=storage):
+                self.assertOptimal(solved(problem, storage=storage), problem)
+
+    def test_memmap_blocks(self):
+        # a few columns per block, so unscaling and basis keys go through several blocks
+        problem = random_lp(12, 20, seed=4)
+
+        with mock.patch('simplex_engine.storage.MEMMAP_BLOCK_SIZE', 8 * 13 * 3):
+            dense = solved(problem, storage='dense', scaling='geometric')
+            memmap = solved(problem, storage='memmap', scaling='geometric')
+
+            self.assertOptimal(memmap, problem)
+            np.testing.assert_allclose(memmap.solution, dense.solution, atol=1e-9)
+            self.assertEqual(BasisStore().key(memmap), BasisStore().key(dense))
+
+
+class PricingTests(EngineTestCase):
+
+    def test_pricing_rules(self):
+        problem = random_lp(15, 25, seed=5)
+
+        for pricing in ('dantzig', 'partial', 'multiple', 'devex', 'steepest'):
+            with self.subTest(pricing=pricing):
+                self.assertOptimal(solved(problem, pricing=pricing), problem)
+
+    def test_without_nonbasics(self):
+        # every column is basic once the artificials leave, nothing is left to price
+        for pricing in ('dantzig', 'partial', 'multiple', 'devex', 'steepest'):
+            with self.subTest(pricing=pricing):
+                lp = solved(SINGLE_COLUMN, pricing=pricing)
+
+                self.assertEqual(lp.status, 'Optimal')
+                self.assertAlmostEqual(lp.Z, -3.2)
+
+
+class BoundsTests(EngineTestCase):
+
+    def test_upper_bounds(self):
+        problem = random_lp(10, 15, seed=6)
+        upper = [float(u) for u in np.random.RandomState(6).randint(1, 10, size=15)]
+
+        self.assertOptimal(solved(problem, upper=upper), problem, upper=upper)
+
+    def test_lower_and_free_bounds(self):
+        problem = ([2, 3, -1], [[1, 1, 1], [1, -1, 0], [0, 1, 2]], ['<=', '>=', '<='], [10, -2, 8])
+        lower, upper = [1, -2, -3], [None, 4, 5]
+
+        self.assertOptimal(solved(problem, lower=lower, upper=upper), problem, lower=lower, upper=upper)
+
+
+class WarmStartTests(EngineTestCase):
+
+    def test_resolve(self):
+        obj, constraints, senses, rhs = random_lp(10, 12, seed=17)
+        lp = solved((obj, constraints, senses, rhs))
+
+        rhs = list(np.array(rhs) * 1.1)
+        lp.resolve(rhs=rhs)
+        self.assertOptimal(lp, (obj, constraints, senses, rhs))
+
+        obj = list(np.array(obj)[::-1])
+        lp.resolve(objective=obj)
+        self.assertOptimal(lp, (obj, constraints, senses, rhs))
+
+    def test_basis_store(self):
+        obj, constraints, senses, rhs = random_lp(10, 12, seed=17)
+        problem = (obj, constraints, senses, list(np.array(rhs) * 1.1))
+        store = BasisStore()
+
+        build((obj, constraints, senses, rhs)).solve(warm_start=store)
+        lp = build(problem)
+        lp.solve(warm_start=store)
+
+        self.assertOptimal(lp, problem)
+        self.assertEqual(lp.pivots, 0)
+
+
+class DualSimplexTests(EngineTestCase):
+
+    def test_dual_method(self):
+        problem = random_covering_lp(12, 10, seed=7)
+
+        self.assertOptimal(solved(problem, 'min', method='dual'), problem, 'min')
+
+    def test_dual_method_with_bounds(self):
+        problem = random_covering_lp(6, 8, seed=8)
+        upper = [20.0] * 8
+
+        self.assertOptimal(solved(problem, 'min', upper=upper, method='dual'), problem, 'min', upper=upper)
+
+
+class PresolveTests(EngineTestCase):
+
+    def test_presolve_keeps_the_optimum(self):
+        problem = random_redundant_lp(16, 12, seed=9)
+        lp = solved(problem, presolve=True)
+
+        self.assertOptimal(lp, problem)
+        self.assertEqual(len(lp.solution), 12)
+
+    def test_singleton_rows(self):
+        reduction = presolve(*WYNDOR)
+
+        self.assertEqual(reduction.status, 'Reduced')
+        self.assertEqual(reduction.stats['singleton rows']['rows'], 2)
+
+    def test_without_constraints(self):
+        reduction = presolve([3, -2], [], [], [], lower=[0, 1], upper=[4, 5])
+
+        self.assertEqual(reduction.status, 'Optimal')
+        np.testing.assert_allclose(reduction.postsolve([]), [4, 1])
+        self.assertAlmostEqual(reduction.objective_value(reduction.postsolve([])), 10.0)
+
+
+class ScalingTests(EngineTestCase):
+
+    def test_badly_scaled(self):
+        problem = badly_scaled_lp(10, 12, magnitude=3, seed=10)
+
+        for scaling in ('geometric', 'equilibration'):
+            with self.subTest(scaling=scaling):
+                lp = solved(problem, scaling=scaling)
+                expected = reference(problem)
+
+                self.assertEqual(lp.status, 'Optimal')
+                self.assertAlmostEqual(lp.Z / expected.fun, 1.0, places=6)
+
+    def test_scaled_duals(self):
+        lp = solved(WYNDOR, scaling='geometric')
+
+        np.testing.assert_allclose(lp.duals, [0.0, 1.5, 1.0], atol=1e-9)
+
+
+class AlwaysCycling(_CycleDetector):
+
+    def __init__(self, enabled=True):
+        super().__init__(enabled)
+        self.cycling = True
+
+    def pivot(self, basics, degenerate):
+        pass
+
+
+class AntiCyclingTests(EngineTestCase):
+
+    def test_beale(self):
+        lp = solved(BEALE, anti_cycling=True)
+
+        self.assertEqual(lp.status, 'Optimal')
+        self.assertAlmostEqual(lp.Z, 0.05)
+
+    def test_degenerate(self):
+        problem = degenerate_lp(12, 10, seed=11)
+
+        self.assertOptimal(solved(problem), problem)
+
+    def test_bland_without_nonbasics(self):
+        lp = solved(SINGLE_COLUMN, pricing='bland')
+
+        self.assertAlmostEqual(lp.Z, -3.2)
+
+        # the fallback prices with Bland's rule from the first iteration on
+        with mock.patch('simplex_engine.solver._CycleDetector', AlwaysCycling):
+            lp = solved(SINGLE_COLUMN)
+
+        self.assertEqual(lp.status, 'Optimal')
+        self.assertAlmostEqual(lp.Z, -3.2)
+
+
+class SensitivityTests(EngineTestCase):
+
+    def test_wyndor_ranges(self):
+        analysis = solved(WYNDOR).sensitivity()
+
+        np.testing.assert_allclose(analysis['duals'], [0.0, 1.5, 1.0], atol=1e-9)
+        np.testing.assert_allclose(analysis['reduced_costs'], [0.0, 0.0], atol=1e-9)
+        np.testing.assert_allclose(analysis['rhs_ranges'][1], (6.0, 18.0))
+        np.testing.assert_allclose(analysis['objective_ranges'][0], (0.0, 7.5))
+
+
+class SweepTests(EngineTestCase):
+
+    def test_scenarios_match_cold_solves(self):
+        obj, constraints, senses, rhs = random_lp(8, 10, seed=12)
+        scenarios = [{'rhs': list(np.array(rhs) * scale)} for scale in (0.5, 0.8, 1.2)]
+        scenarios.append({'objective': list(np.array(obj)[::-1])})
+
+        lp = solved((obj, constraints, senses, rhs))
+
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                results = sweep(lp, scenarios, workers)
+                self.assertEqual(len(results), len(scenarios))
+
+                for scenario, result in zip(scenarios, results):
+                    problem = (scenario.get('objective', obj), constraints, senses, scenario.get('rhs', rhs))
+                    self.assertEqual(result['status'], 'Optimal')
+                    self.assertAlmostEqual(result['Z'], reference(problem).fun, places=6)
+
+    def test_parametric_chain(self):
+        obj, constraints, senses, rhs = WYNDOR
+        lp = solved(WYNDOR)
+
+        results = lp.sweep([{'rhs': vector} for vector in parametric(rhs, [0, 1, 1], 0, 6, 4)], chain=True)
+
+        self.assertEqual([result['Z'] for result in results], [36.0, 41.0, 46.0, 51.0])
+
+    def test_time_limit(self):
+        lp = solved(WYNDOR)
+        results = lp.sweep([{'rhs': [4, 12 + k, 18]} for k in range(3)], time_limit=0)
+
+        self.assertEqual([result['status'] for result in results], ['TimeLimit'] * 3)
+        self.assertIsNone(lp.time_limit)
+        self.assertEqual(lp.sweep([{'rhs': [4, 13, 18]}], time_limit=5)[0]['status'], 'Optimal')
+
+    def test_branches_keep_order(self):
+        branches = scenario_branches(list(range(10)), 3)
+
+        self.assertEqual([item for branch in branches for item in branch], list(range(10)))
+        self.assertEqual(len(branches), 3)
+        self.assertEqual(scenario_branches([1], 4), [[1]])
+
+
+class BatchTests(EngineTestCase):
+
+    def test_solve_many(self):
+        problems = [random_lp(5, 6, seed=seed) for seed in range(4)]
+        batch = solve_many(np.array([p[0] for p in problems]), np.array([p[1] for p in problems]),
+                           ['<='] * 5, np.array([p[3] for p in problems]))
+
+        for k, problem in enumerate(problems):
+            self.assertEqual(batch.status[k], 'Optimal')
+            self.assertAlmostEqual(batch.Z[k], reference(problem).fun, places=6)
+
+
+class TransportationTests(unittest.TestCase):
+
+    def test_balanced(self):
+        problem = solve_transportation([[4, 6, 9], [5, 3, 8]], [30, 20], [15, 25, 10])
+
+        self.assertEqual(problem.status, 'Optimal')
+        self.assertAlmostEqual(problem.Z, 240.0)
+        np.testing.assert_allclose(problem.allocation.sum(axis=1), [30, 20])
+        np.testing.assert_allclose(problem.allocation.sum(axis=0), [15, 25, 10])
+
+    def test_matches_the_lp(self):
+        costs, supply, demand = random_transportation(6, 8, seed=13)
+
+        for initial in ('vogel', 'least-cost', 'northwest'):
+            with self.subTest(initial=initial):
+                problem = solve_transportation(costs, supply, demand, initial=initial)
+                expected = reference(transportation_lp(costs, supply, demand), 'min')
+
+                self.assertEqual(problem.status, 'Optimal')
+                self.assertAlmostEqual(problem.Z, expected.fun, places=6)
+
+    def test_max(self):
+        costs, supply, demand = random_transportation(4, 5, seed=14)
+        problem = solve_transportation(costs, supply, demand, sense='max')
+
+        # demand is met exactly, a max problem would ship past it
+        obj, rows, senses, rhs = transportation_lp(costs, supply, demand)
+        expected = reference((obj, rows, ['<='] * 4 + ['=='] * 5, rhs), 'max')
+
+        self.assertAlmostEqual(problem.Z, expected.fun, places=6)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            solve_transportation([[1, 2]], [1, 2], [1, 2])
+
+
+class AssignmentTests(unittest.TestCase):
+
+    @staticmethod
+    def brute_force(costs, sense='min'):
+        costs = np.array(costs, dtype=float)
+
+        if costs.shape[0] > costs.shape[1]:
+            costs = costs.T
+
+        values = [costs[range(len(costs)), list(columns)].sum()
+                  for columns in itertools.permutations(range(costs.shape[1]), costs.shape[0])]
+
+        return min(values) if sense == 'min' else max(values)
+
+    def test_square(self):
+        problem = solve_assignment([[9, 2, 7], [6, 4, 3], [5, 8, 1]])
+
+        self.assertEqual(problem.status, 'Optimal')
+        self.assertEqual(list(problem.assignment), [1, 0, 2])
+        self.assertAlmostEqual(problem.Z, 9.0)
+
+    def test_random_shapes(self):
+        rng = np.random.RandomState(15)
+
+        for shape, sense in (((5, 5), 'min'), ((4, 6), 'min'), ((6, 4), 'max')):
+            with self.subTest(shape=shape, sense=sense):
+                costs = rng.randint(1, 50, size=shape)
+                problem = solve_assignment(costs, sense)
+
+                self.assertAlmostEqual(problem.Z, self.brute_force(costs, sense))
+                self.assertEqual(len(set(int(j) for j in problem.assignment if j >= 0)), min(shape))
+
+    def test_batch(self):
+        costs = np.random.RandomState(16).randint(1, 50, size=(6, 4, 4))
+        batch = solve_assignments(costs)
+
+        for k in range(len(costs)):
+            self.assertEqual(batch.status[k], 'Optimal')
+            self.assertAlmostEqual(batch.Z[k], self.brute_force(costs[k]))
+
+
+class ReaderTests(unittest.TestCase):
+
+    def test_corpus(self):
+        optima = {'wyndor': 36.0, 'diet': 92.5, 'product': 1075.0, 'trnsport': 153.675, 'kleemin5': 1e8}
+
+        for name, optimum in optima.items():
+            with self.subTest(name=name):
+                model = read_model(os.path.join(CORPUS, name + '.mps'))
+                lp = model.lp_problem()
+                lp.solve()
+
+                self.assertEqual(lp.status, 'Optimal')
+                self.assertAlmostEqual(model.objective_value(lp.solution[:model.shape[1]]), optimum, places=6)
+
+    def test_infeasible_corpus(self):
+        lp = read_model(os.path.join(CORPUS, 'infeas.mps')).lp_problem()
+        lp.solve()
+
+        self.assertEqual(lp.status, 'infeasible')
+
+    def test_lp_format(self):
+        model = read_model(io.BytesIO(b'Maximize\n obj: 3 x + 5 y\nSubject To\n c1: x <= 4\n c2: 2 y <= 12\n'
+                                      b' c3: 3 x + 2 y <= 18\nEnd\n'), 'lp')
+
+        self.assertEqual(model.shape, (3, 2))
+        self.assertEqual(model.column_names, ['x', 'y'])
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            read_model(os.path.join(CORPUS, 'wyndor.mps'), 'xls')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,539 @@
+import time
+
+import numpy as np
+
+# a cell enters the basis when its reduced cost is below -OPTIMALITY_TOL
+OPTIMALITY_TOL = 1e-9
+
+# supply and demand totals closer than this are balanced
+BALANCE_TOL = 1e-9
+
+# reduced costs are priced in this many blocks of rows
+PRICING_BLOCKS = 8
+
+INITIAL_RULES = ('vogel', 'least-cost', 'northwest')
+
+
+class TransportationProblem():
+    """
+    Transportation problem on the S x D cost grid: ship supply[i] from every
+    source to meet demand[j] at every destination at the least total cost.
+
+    An initial basis of S + D - 1 cells is built by Vogel's approximation,
+    least cost or the northwest corner rule, then MODI (u-v) iterations
+    move flow around stepping-stone cycles of the basis tree until no cell
+    has a negative reduced cost c_ij - u_i - v_j. Degenerate bases keep
+    their zero cells, so the basis is always a spanning tree.
+    """
+
+    def __init__(self, costs, supply, demand, sense='min', initial='vogel', max_iterations=None):
+        """
+        Parameters: costs: list[list[float]] or np.ndarray((S, D))
+                    supply: list[float] len: S
+                    demand: list[float] len: D
+                    sense: str -> could be ['min', 'max'], 'max' maximizes profit
+                    initial: str -> could be ['vogel', 'least-cost', 'northwest']
+                    max_iterations: int -> MODI pivots, default 10 * (S + D),
+                                    status is 'IterationLimit' when reached
+
+        Returns: None
+        """
+
+        self.costs = np.array(costs, dtype=float)
+        self.supply = np.array(supply, dtype=float)
+        self.demand = np.array(demand, dtype=float)
+
+        if self.costs.ndim != 2 or self.costs.shape != (len(self.supply), len(self.demand)):
+            raise ValueError("costs should have a row per supply and a column per demand")
+
+        if not np.all(np.isfinite(self.costs)):
+            raise ValueError("costs should be finite")
+
+        if np.any(self.supply < 0) or np.any(self.demand < 0):
+            raise ValueError("supply and demand should not be negative")
+
+        if initial not in INITIAL_RULES:
+            raise ValueError("initial should be one of {}".format(', '.join(INITIAL_RULES)))
+
+        self.sense = sense
+        self.initial = initial
+        self.max_iterations = max_iterations
+        self.iterations = 0
+        self.dummy = None
+        self.status = "Unsolved"
+
+
+    def solve(self):
+        """
+        Balances the problem, builds the initial basis and runs MODI.
+
+        Parameters: None
+
+        Returns: TransportationProblem -> status, Z, allocation (S x D),
+                 u and v (duals of supply and demand rows), initial_Z
+                 (cost of the initial basis), dummy ('supply' or 'demand'
+                 when one was added to balance)
+        """
+
+        start = time.perf_counter()
+
+        C, supply, demand = self._balance()
+        S, D = C.shape
+
+        # max problems minimize the negated profits
+        if self.sense == 'max':
+            C = -C
+
+        self.x = np.zeros((S, D))
+        self.basic = np.zeros((S, D), dtype=bool)
+
+        for i, j, amount in INITIAL[self.initial](C, supply, demand):
+            self.x[i, j] = amount
+            self.basic[i, j] = True
+
+        S0, D0 = self.costs.shape
+        self.initial_Z = float(np.sum(self.x[:S0, :D0] * self.costs))
+
+        self._modi(C)
+
+        self.allocation = self.x[:S0, :D0]
+        self.Z = float(np.sum(self.allocation * self.costs))
+        self.u, self.v = self.u[:S0], self.v[:D0]
+
+        if self.sense == 'max':
+            self.u, self.v = -self.u, -self.v
+
+        self.solution_time = time.perf_counter() - start
+
+        return self
+
+
+    def _balance(self):
+        """
+        Adds a dummy destination for surplus supply or a dummy source for
+        unmet demand, both at zero cost.
+
+        Parameters: None
+
+        Returns: (np.ndarray, np.ndarray, np.ndarray) -> costs, supply, demand
+        """
+
+        gap = self.supply.sum() - self.demand.sum()
+
+        if gap > BALANCE_TOL * max(1.0, self.supply.sum()):
+            self.dummy = 'demand'
+            return (np.hstack([self.costs, np.zeros((len(self.supply), 1))]),
+                    self.supply, np.append(self.demand, gap))
+
+        if gap < -BALANCE_TOL * max(1.0, self.demand.sum()):
+            self.dummy = 'supply'
+            return (np.vstack([self.costs, np.zeros((1, len(self.demand)))]),
+                    np.append(self.supply, -gap), self.demand)
+
+        return self.costs, self.supply, self.demand
+
+
+    def _modi(self, C):
+        """
+        MODI iterations on the basis in x and basic. Reduced costs are priced
+        a block of rows at a time, the entering cell is the most negative one
+        of the first block that has one. The flow around its cycle in the
+        basis tree moves by the smallest flow on the cells that decrease.
+
+        Parameters: C: np.ndarray((S, D)) -> balanced costs to minimize
+
+        Returns: None
+        """
+
+        S, D = C.shape
+        limit = self.max_iterations if self.max_iterations is not None else 10 * (S + D)
+        tree = _BasisTree(C, np.argwhere(self.basic))
+        self.u, self.v = tree.u, tree.v
+
+        block = max(1, -(-S // PRICING_BLOCKS))
+        blocks = -(-S // block)
+        current = 0
+
+        while True:
+            # blocks without a negative reduced cost are skipped, a full round without one is optimal
+            for _ in range(blocks):
+                rows = slice(current * block, min(S, (current + 1) * block))
+                reduced = C[rows] - self.u[rows, np.newaxis] - self.v
+                cell = int(np.argmin(reduced))
+
+                if reduced.flat[cell] < -OPTIMALITY_TOL:
+                    break
+
+                current = (current + 1) % blocks
+            else:
+                self.status = "Optimal"
+                return
+
+            if self.iterations >= limit:
+                self.status = "IterationLimit"
+                return
+
+            i, j = rows.start + cell // D, cell % D
+
+            # cells of the cycle alternate between losing and gaining flow, starting next to (i, j)
+            cycle = tree.path(i, j)
+            losing, gaining = cycle[0::2], cycle[1::2]
+
+            amounts = [self.x[r, c] for r, c in losing]
+            leaving = int(np.argmin(amounts))
+            theta = amounts[leaving]
+
+            for r, c in losing:
+                self.x[r, c] -= theta
+            for r, c in gaining:
+                self.x[r, c] += theta
+
+            r, c = losing[leaving]
+            self.x[r, c] = 0
+            self.x[i, j] = theta
+            self.basic[r, c] = False
+            self.basic[i, j] = True
+
+            tree.pivot((i, j), (r, c), reduced.flat[cell])
+            self.iterations += 1
+
+
+class _BasisTree():
+    """
+    Basis cells as a spanning tree of S row and D column nodes rooted at
+    row 0, columns are numbered after the rows. Potentials u and v satisfy
+    u_i + v_j = c_ij on every basic cell with u_0 = 0. A pivot only
+    re-roots and shifts the subtree cut off by the leaving cell.
+    """
+
+    def __init__(self, C, cells):
+        S, D = C.shape
+        self.S = S
+        self.C = C
+        self.adjacent = [set() for _ in range(S + D)]
+
+        for i, j in cells:
+            self.adjacent[i].add(S + j)
+            self.adjacent[S + j].add(i)
+
+        self.parent = [-1] * (S + D)
+        self.depth = [0] * (S + D)
+        self.u, self.v = np.zeros(S), np.zeros(D)
+
+        potential = np.zeros(S + D)
+        self.parent[0] = 0
+
+        for node in self._walk(0):
+            other = self.parent[node]
+            if node != 0:
+                potential[node] = self._cost(node, other) - potential[other]
+
+        self.u[:], self.v[:] = potential[:S], potential[S:]
+
+
+    def _cost(self, a, b):
+        # cost of the cell joining a row node and a column node
+        return self.C[a, b - self.S] if a < self.S else self.C[b, a - self.S]
+
+
+    def _walk(self, start):
+        """
+        Visits the nodes reachable from start, whose parent is already set,
+        setting parent and depth of every other node on the way.
+
+        Returns: list[int] -> visited nodes, start first
+        """
+
+        queue = [start]
+        parent, depth = self.parent, self.depth
+
+        for node in queue:
+            for other in self.adjacent[node]:
+                if other == parent[node]:
+                    continue
+
+                parent[other] = node
+                depth[other] = depth[node] + 1
+                queue.append(other)
+
+        return queue
+
+
+    def path(self, i, j):
+        """
+        Gets the basic cells on the tree path from column j to row i,
+        the stepping-stone cycle of entering cell (i, j) without it.
+
+        Parameters: i: int
+                    j: int
+
+        Returns: list[(int, int)]
+        """
+
+        S = self.S
+        a, b = S + j, i
+        head, tail = [], []
+
+        # climb from the deeper end until both meet at their common ancestor
+        while a != b:
+            if self.depth[a] >= self.depth[b]:
+                head.append((a, self.parent[a]))
+                a = self.parent[a]
+            else:
+                tail.append((self.parent[b], b))
+                b = self.parent[b]
+
+        edges = head + tail[::-1]
+
+        return [(p, q - S) if p < S else (q, p - S) for p, q in edges]
+
+
+    def pivot(self, entering, leaving, reduced):
+        """
+        Replaces the leaving cell with the entering one. The subtree below
+        the leaving cell hangs from the entering cell afterwards and its
+        potentials shift so that u_i + v_j = c_ij holds on the entering cell.
+
+        Parameters: entering: (int, int)
+                    leaving: (int, int)
+                    reduced: float -> c_ij - u_i - v_j of the entering cell
+
+        Returns: None
+        """
+
+        S = self.S
+        p, q = leaving[0], S + leaving[1]
+        child = p if self.parent[p] == q else q
+
+        self.adjacent[p].discard(q)
+        self.adjacent[q].discard(p)
+
+        # the entering end below the leaving cell, its ancestor at the child's depth is child
+        a, b = entering[0], S + entering[1]
+        inside, outside = (a, b) if self._below(a, child) else (b, a)
+
+        self.parent[inside] = outside
+        self.depth[inside] = self.depth[outside] + 1
+        nodes = np.array(self._walk(inside))
+
+        self.adjacent[a].add(b)
+        self.adjacent[b].add(a)
+
+        rows, columns = nodes[nodes < S], nodes[nodes >= S] - S
+        shift = reduced if inside < S else -reduced
+
+        self.u[rows] += shift
+        self.v[columns] -= shift
+
+
+    def _below(self, node, ancestor):
+        while self.depth[node] > self.depth[ancestor]:
+            node = self.parent[node]
+
+        return node == ancestor
+
+
+def _vogel(C, supply, demand):
+    """
+    Vogel's approximation. The line (row or column) with the largest gap
+    between its two cheapest open cells ships as much as it can to its
+    cheapest cell. Only the lines whose cheapest cells were closed get
+    a new penalty.
+
+    Parameters: C: np.ndarray((S, D))
+                supply: np.ndarray(S)
+                demand: np.ndarray(D)
+
+    Returns: list[(int, int, float)] -> S + D - 1 basic cells and their flow
+    """
+
+    rows, columns = _Lines(C, supply), _Lines(C.T, demand)
+    cells = []
+
+    if rows.left > 1 and columns.left > 1:
+        rows.penalties(np.arange(rows.left), columns.open)
+        columns.penalties(np.arange(columns.left), rows.open)
+
+    while rows.left > 1 and columns.left > 1:
+        i, j = int(np.argmax(rows.penalty)), int(np.argmax(columns.penalty))
+
+        if rows.penalty[i] >= columns.penalty[j]:
+            j = rows.cheapest(i)
+        else:
+            i = columns.cheapest(j)
+
+        cells.append(_ship(i, j, rows, columns))
+
+        if rows.left == 1 or columns.left == 1:
+            break
+
+        if rows.open[i]:
+            rows.penalties(rows.crossing(j), columns.open)
+        else:
+            columns.penalties(columns.crossing(i), rows.open)
+
+    return cells + _last_line(C, rows, columns)
+
+
+def _least_cost(C, supply, demand):
+    """
+    Least cost rule, cells are filled in increasing cost order.
+
+    Parameters: same as _vogel
+
+    Returns: list[(int, int, float)]
+    """
+
+    S, D = C.shape
+    rows, columns = _Lines(C, supply), _Lines(C.T, demand)
+    cells = []
+
+    for cell in np.argsort(C, axis=None, kind='stable'):
+        if rows.left == 1 or columns.left == 1:
+            break
+
+        i, j = divmod(int(cell), D)
+
+        if rows.open[i] and columns.open[j]:
+            cells.append(_ship(i, j, rows, columns))
+
+    return cells + _last_line(C, rows, columns)
+
+
+def _northwest(C, supply, demand):
+    """
+    Northwest corner rule, ignores costs.
+
+    Parameters: same as _vogel
+
+    Returns: list[(int, int, float)]
+    """
+
+    rows, columns = _Lines(C, supply), _Lines(C.T, demand)
+    cells = []
+    i = j = 0
+
+    while rows.left > 1 and columns.left > 1:
+        cells.append(_ship(i, j, rows, columns))
+
+        if rows.open[i]:
+            j += 1
+        else:
+            i += 1
+
+    return cells + _last_line(C, rows, columns)
+
+
+INITIAL = {'vogel': _vogel, 'least-cost': _least_cost, 'northwest': _northwest}
+
+
+class _Lines():
+    """
+    Remaining amounts of the rows (or columns) of the cost grid during an
+    initial rule. For Vogel's penalties every line keeps its cells in cost
+    order and pointers to its two cheapest open cells, pointers only move
+    forward as crossing lines close.
+    """
+
+    def __init__(self, C, amounts):
+        self.C = C
+        self.amounts = amounts.copy()
+        self.open = np.ones(len(amounts), dtype=bool)
+        self.left = len(amounts)
+
+
+    def close(self, k):
+        self.open[k] = False
+        self.left -= 1
+
+        if hasattr(self, 'penalty'):
+            self.penalty[k] = -1
+
+
+    def cheapest(self, k):
+        return int(self.order[k, self.first[k]])
+
+
+    def crossing(self, k):
+        """
+        Gets the open lines whose two cheapest open cells include crossing line k.
+        """
+
+        lines = np.flatnonzero(self.open)
+
+        return lines[(self.order[lines, self.first[lines]] == k) | (self.order[lines, self.second[lines]] == k)]
+
+
+    def penalties(self, lines, crossing_open):
+        """
+        Updates the gap between the two cheapest open cells of lines.
+
+        Parameters: lines: np.ndarray -> line indexes
+                    crossing_open: np.ndarray -> open lines of the other direction
+
+        Returns: None
+        """
+
+        if not hasattr(self, 'penalty'):
+            self.order = np.argsort(self.C, axis=1, kind='stable')
+            self.first = np.zeros(len(self.C), dtype=int)
+            self.second = np.ones(len(self.C), dtype=int)
+            self.penalty = np.full(len(self.C), -1.0)
+
+        for pointer in (self.first, self.second):
+            if pointer is self.second:
+                self.second[lines] = np.maximum(self.second[lines], self.first[lines] + 1)
+
+            stale = lines
+
+            # two crossing lines are open whenever penalties are asked for, pointers stay in the grid
+            while len(stale):
+                stale = stale[~crossing_open[self.order[stale, pointer[stale]]]]
+                pointer[stale] += 1
+
+        cheapest = self.C[lines, self.order[lines, self.first[lines]]]
+        self.penalty[lines] = self.C[lines, self.order[lines, self.second[lines]]] - cheapest
+
+
+def _ship(i, j, rows, columns):
+    """
+    Ships min(supply_i, demand_j) on cell (i, j) and closes one line, the row
+    when both run out, so the column stays open for a zero flow basic cell.
+    """
+
+    amount = min(rows.amounts[i], columns.amounts[j])
+    rows.amounts[i] -= amount
+    columns.amounts[j] -= amount
+
+    if rows.amounts[i] == 0:
+        rows.close(i)
+    else:
+        columns.close(j)
+
+    return i, j, amount
+
+
+def _last_line(C, rows, columns):
+    """
+    Ships along the only open row or column, it crosses every open line of
+    the other direction and its amount matches theirs once balanced.
+    """
+
+    if rows.left == 1:
+        i = int(np.flatnonzero(rows.open)[0])
+        return [(i, int(j), columns.amounts[j]) for j in np.flatnonzero(columns.open)]
+
+    j = int(np.flatnonzero(columns.open)[0])
+    return [(int(i), j, rows.amounts[i]) for i in np.flatnonzero(rows.open)]
+
+
+def solve_transportation(costs, supply, demand, sense='min', initial='vogel', max_iterations=None):
+    """
+    Solves a transportation problem.
+
+    Parameters: same as TransportationProblem
+
+    Returns: TransportationProblem
+    """
+
+    return TransportationProblem(costs, supply, demand, sense, initial, max_iterations).solve()
@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'solveLpwithSimplex.settings')
 
 application = get_asgi_application()
+
+# job workers start with the server, so jobs queued or left running before
+# a restart are picked up without waiting for the next POST /api/jobs/
+from simplex.utils import jobs  # noqa: E402
+
+jobs.get_runner()
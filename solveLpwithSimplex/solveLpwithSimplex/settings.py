@@ -29,6 +29,84 @@ ALLOWED_HOSTS = []
 
 CRISPY_TEMPLATE_PACK = 'bootstrap4'
 
+# Solver process pool, 0 workers solves in the request thread
+SIMPLEX_SOLVER_WORKERS = 2
+
+# Jobs waiting for a free worker before requests get 503
+SIMPLEX_SOLVER_QUEUE_SIZE = 8
+
+# Seconds a request waits for its solution
+SIMPLEX_SOLVER_TIMEOUT = 30
+
+# Retry-After seconds sent with 503
+SIMPLEX_SOLVER_RETRY_AFTER = 5
+
+# Solution cache backend: 'local', 'django' or None
+SIMPLEX_SOLUTION_CACHE = 'local'
+
+# Entries kept by the 'local' backend
+SIMPLEX_SOLUTION_CACHE_SIZE = 1024
+
+# Seconds a cached solution is reused
+SIMPLEX_SOLUTION_CACHE_TTL = 3600
+
+# CACHES alias used by the 'django' backend
+SIMPLEX_SOLUTION_CACHE_ALIAS = 'default'
+
+# Reduce problems with the engine presolve before PuLP
+SIMPLEX_PRESOLVE = True
+
+# Solves running at once per event loop in the async views
+SIMPLEX_ASYNC_CONCURRENCY = 32
+
+# Seconds an async request waits for a free slot before 503
+SIMPLEX_ASYNC_QUEUE_TIMEOUT = 10
+
+# Background job threads per web process, 0 leaves jobs to `manage.py run_solve_jobs`
+SIMPLEX_JOB_WORKERS = 1
+
+# Seconds an idle job worker waits before looking at the queue again
+SIMPLEX_JOB_POLL_INTERVAL = 2
+
+# Seconds between progress writes of a running job
+SIMPLEX_JOB_PROGRESS_INTERVAL = 0.5
+
+# Seconds a job may run before it ends with TimeLimit
+SIMPLEX_JOB_TIME_LIMIT = 600
+
+# Seconds a running job keeps its worker without a heartbeat, then it is queued again
+SIMPLEX_JOB_LEASE = 60
+
+# Claims of a job before a worker that stops while solving it fails the job
+SIMPLEX_JOB_MAX_ATTEMPTS = 2
+
+# Store solved problems and their solutions for /api/problems/
+SIMPLEX_HISTORY = True
+
+# Largest MPS or LP file accepted by /api/import/, in bytes
+SIMPLEX_IMPORT_MAX_SIZE = 256 * 1024 * 1024
+
+# Most scenarios of one /api/scenarios/ request
+SIMPLEX_SCENARIO_MAX = 10000
+
+# Most supplies or demands of one /api/transportation/ request
+SIMPLEX_TRANSPORTATION_MAX = 1000
+
+# Most workers or jobs of one /api/assignment/ matrix
+SIMPLEX_ASSIGNMENT_MAX = 2000
+
+# Most matrices of one /api/assignment/ batch
+SIMPLEX_ASSIGNMENT_BATCH_MAX = 10000
+
+# Serve request and solver phase histograms at /metrics for Prometheus
+SIMPLEX_METRICS = False
+
+# Bearer token /metrics asks for when set, the bearer_token of the Prometheus scrape config
+SIMPLEX_METRICS_TOKEN = None
+
+# Largest JSON request body, in bytes, a 1000 x 1000 cost matrix is about 20 MB
+DATA_UPLOAD_MAX_MEMORY_SIZE = 64 * 1024 * 1024
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -44,6 +122,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'simplex.middleware.MetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',